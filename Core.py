@@ -18,10 +18,13 @@ import os
 output_viewer_dir = os.path.dirname(__file__)
 
 
+from ui_compiler import compileUi
+
 ui_file = os.path.join(output_viewer_dir, "output_viewerUI.ui")
 py_ui_file = os.path.join(output_viewer_dir, "output_viewerUI.py")
 
-os.system("pyuic4 -x %s -o %s" % (ui_file, py_ui_file))
+# The layout is only compiled if the .ui file changed
+compileUi(ui_file, py_ui_file)
 
 # OpenCascade Libraries
 from OCC.Display.backend import load_backend
@@ -31,19 +34,27 @@ used_backend = load_backend()
 from OCC.Display.qtDisplay import qtViewer3d
 
 # PyQt Library
-from PyQt4 import QtCore, QtGui, uic
+from PyQt4 import QtCore, QtGui
 
 # Internal Modules
 from occ_modules.shape_properties import ShapeManager, shape_colorlist, shape_colordictionary
+from occ_modules.shape_registry import ShapeRegistry, uniqueShapes
+from occ_modules.shape_translator import shutdownTranslator
 from occ_modules.qt_display import customQtViewer3d
 
 from tecplot_modules.tecplot_display import TecPlotWindow
 
 from data_structure.case_model import CaseModel
 from data_structure.case_node import CaseNode
+from data_structure.case_files import findCaseOutputs, findCaseNames
+from data_structure.case_watcher import CaseWatcher
+from data_structure.load_profiler import LoadProfiler, fileSize, span_export_filters
+from data_structure.case_session import caseEntry, groupEntry, writeSession, readSession, existingOutputs, \
+    staleOutputs, applyCaseState, session_file_filter
 
 from bladepro_modules.inputfile_writer import InputWriterWindow
 from settings.preferences import PreferencesBladePy
+from settings.settings_snapshot import dct
 
 # Misc import
 import logging
@@ -53,9 +64,6 @@ import functools
 
 import output_viewerUI
 
-# This dictionary works because depending on OS, e.g. the register might save False as false, crashing the program
-dct = {"true": True, "false": False, True: True, False: False}
-
 class BladePyCore(QtGui.QMainWindow, output_viewerUI.Ui_MainWindow):
     """
     This is the key Class that wraps all the other packages and modules of BladePy.
@@ -99,8 +107,21 @@ class BladePyCore(QtGui.QMainWindow, output_viewerUI.Ui_MainWindow):
         ## This attribute is one that is used by the program to tell whether the user is managing a shape or sub-shape
         self.selectionMode = "something" # change this stuff modificacao
 
-        ## This attribute is a list that contains all shapes loaded in the program
-        self.master_shape_list = []
+        ## This attribute is a registry that contains the shapes of every loaded case, keyed by case node
+        self.shape_registry = ShapeRegistry()
+
+        ## Memory in MB for the meshes of loaded cases. Set by the preferences. 0 means no limit
+        self.default_mesh_budget = 0
+
+        ## This attribute watches the outputs of the loaded cases, so modified outputs are reloaded
+        self.case_watcher = CaseWatcher(self)
+        self.case_watcher.outputChanged.connect(self._reloadCaseOutput)
+
+        ## This attribute records the time spent in each phase of loading cases
+        self.load_profiler = LoadProfiler()
+
+        # The worker processes that translate CAD files are shut down with the application
+        QtGui.QApplication.instance().aboutToQuit.connect(shutdownTranslator)
 
         self.list_settings = []
         self.setupUi(self)
@@ -120,6 +141,7 @@ class BladePyCore(QtGui.QMainWindow, output_viewerUI.Ui_MainWindow):
 
         ## This attribute is the model object that is the intermediary between the tree view and the case node
         self.model = CaseModel(self.rootNode, self)
+        self.model.setCaseLoader(self.addCase)
         self.ui_case_treeview.setModel(self.model)
         self._dataMapper = QtGui.QDataWidgetMapper()
 
@@ -130,6 +152,7 @@ class BladePyCore(QtGui.QMainWindow, output_viewerUI.Ui_MainWindow):
         self.canva = customQtViewer3d(self)
         self.setCentralWidget(self.canva)
         self.canva.InitDriver()
+        self.canva.pointPicked.connect(self._pickSubShape)
 
         ## This attribute is OCCViewer.Viewer3d(self.GetHandle()), used to manage the 3D graphics.
         self.display = self.canva._display
@@ -216,24 +239,22 @@ class BladePyCore(QtGui.QMainWindow, output_viewerUI.Ui_MainWindow):
 
         #
         if pressed_btn.text() == "Flat lines":
-            self.display.SetModeShaded()
-            self.display.Context.DefaultDrawer().GetObject().SetFaceBoundaryDraw(True)
+            self.ShapeManager.setShadedDrawMode(True)
             self.display.View.EnableDepthTest(False)
 
-            for h_shape in self.master_shape_list:
-                self.display.Context.SetColor(h_shape, self.display.Context.Color(h_shape))  # Not Optimum Solution
-
         if pressed_btn.text() == "Shaded":
-            self.display.SetModeShaded()
-            self.display.Context.DefaultDrawer().GetObject().SetFaceBoundaryDraw(False)
-            self.display.View.Redraw()
-
-            for h_shape in self.master_shape_list:
-                self.display.Context.SetColor(h_shape, self.display.Context.Color(h_shape))  # Not Optimum Solution
+            self.ShapeManager.setShadedDrawMode(False)
 
         if pressed_btn.text() == "Wireframe":
             self.display.SetModeWireFrame()
 
+        # Toggles the full wheel of the selected case using the number of blades set in the Input Writer
+        if pressed_btn.text() == "Full wheel":
+            if self.case_node is not None and self.case_node.wheelInstances():
+                self.ShapeManager.setFullWheel(0)
+            else:
+                self.ShapeManager.setFullWheel(self.InputWriterWidget.ui_read_cftgeo_nblades_spn.value())
+
     def toolbarFileButtonPressedGroup(self, pressed_btn):
         """
         Method group that wrap all functions for "file" toolbar.
@@ -247,6 +268,16 @@ class BladePyCore(QtGui.QMainWindow, output_viewerUI.Ui_MainWindow):
             self.InputWriterWidget.raise_()
         if pressed_btn.text() == "Open BladePro Case":
             self.openCase()
+        if pressed_btn.text() == "Open Case Directory":
+            self.openCaseDirectory()
+        if pressed_btn.text() == "Save Session":
+            self.saveSession()
+        if pressed_btn.text() == "Open Session":
+            self.openSession()
+        if pressed_btn.text() == "Export Mesh":
+            self.exportMesh()
+        if pressed_btn.text() == "Export Load Timing":
+            self.exportLoadTiming()
 
     def toolbarTecplotButtonPressedGroup(self, pressed_btn):
         """
@@ -301,6 +332,7 @@ class BladePyCore(QtGui.QMainWindow, output_viewerUI.Ui_MainWindow):
         if pressed_btn.text() == "Exit":
             self.InputWriterWidget.close()
             self.close()
+            shutdownTranslator()
             QtCore.QCoreApplication.exit()
             sys.exit()
 
@@ -318,7 +350,7 @@ class BladePyCore(QtGui.QMainWindow, output_viewerUI.Ui_MainWindow):
         # First triggers a GUI FileDialog.
         selected_files = QtGui.QFileDialog.getOpenFileNames(self, 'Open file',
                                                             self.InputWriterWidget.ui_working_path_edit.text(),
-                                                            "(*.dat *.igs *.iges *.rtzt);; All Files(*.*)")
+                                                            "(*.dat *.igs *.iges *.stp *.step *.rtzt);; All Files(*.*)")
 
         # Case the user gives up opening a BladePro case
 
@@ -348,84 +380,133 @@ class BladePyCore(QtGui.QMainWindow, output_viewerUI.Ui_MainWindow):
 
 
 
-    def addCase(self)-> object:
-
+    def openCaseDirectory(self):
         """
-        Method that adds a Case in Output Viewer.
-
-        This will be triggered by the Output Viewer when opening an existing case or when Run BladePro button
-        is clicked in in the Input Writer GUI. This method will read files related to the working case. Currently, the
-        addCase method supports three outputs from BladePro.
+        Registers all cases of a directory as a group in the tree view, without loading them.
 
-        \arg IGS 3D Curves;
-        \arg IGS Surfaces;
-        \arg Tecplots 2D.
+        The cases are found by their file names only. Their outputs are parsed and their shapes loaded when the group
+        is expanded, through data_structure.case_model.CaseModel.fetchMore(), so directories with many historical
+        cases are registered at once.
 
         @return None
 
         """
+        directory = QtGui.QFileDialog.getExistingDirectory(self, 'Open case directory',
+                                                           self.InputWriterWidget.ui_working_path_edit.text())
 
-        to_be_loaded_shape_list = []
+        if not directory:
+            return
 
+        directory = str(directory)
+        case_names = findCaseNames(directory)
 
-        igs_surf_exists = False
-        igs_3d_cur_exists = False
-        igs_2d_cur_exists = False
-        tecplot_exists = False
+        if not case_names:
+            msg = QtGui.QMessageBox()
+            msg.setIcon(QtGui.QMessageBox.Information)
 
-        self.PreferencesManager.list_settings[1].beginGroup("outputs_settings")
+            msg.setText("No BladePro Outputs in this directory")
+            msg.setWindowTitle("No Output")
 
-        igs_surf_check_state = dct[self.PreferencesManager.list_settings[1].value("default_igs_surf_check_state")]
-        igs_cur_3d_check_state = dct[self.PreferencesManager.list_settings[1].value("default_igs_3d_cur_check_state")]
-        igs_cur_2d_check_state = dct[self.PreferencesManager.list_settings[1].value("default_igs_2d_cur_check_state")]
-        tecplot_2d_check_state = dct[self.PreferencesManager.list_settings[1].value("default_tecplot_check_state")]
+            msg.exec_()
+            return
 
-        igs_surf_exception = self.PreferencesManager.list_settings[1].value("default_igs_surf_exception")
-        igs_3d_cur_exception = self.PreferencesManager.list_settings[1].value("default_igs_3d_cur_exception")
-        igs_2d_cur_exception = self.PreferencesManager.list_settings[1].value("default_igs_2d_cur_exception")
+        self.model.appendGroup(os.path.basename(os.path.normpath(directory)), directory, case_names)
 
-        self.PreferencesManager.list_settings[1].endGroup()
+    def addCase(self, working_path=None, case_name=None, parent=None, case_outputs=None)-> object:
 
-        # Gets the name of the adding case in a field in Input Writer Widget
-        to_add_case_name = self.InputWriterWidget.ui_case_name_edit.text()
+        """
+        Method that adds a Case in Output Viewer.
+
+        This will be triggered by the Output Viewer when opening an existing case or when Run BladePro button
+        is clicked in in the Input Writer GUI. This method will read files related to the working case. Currently, the
+        addCase method supports three outputs from BladePro and a reference geometry.
+
+        \arg IGS 3D Curves;
+        \arg IGS Surfaces;
+        \arg Tecplots 2D;
+        \arg STEP reference geometry with the same case name.
+
+        Cases of groups are added by CaseModel.fetchMore() when the group is expanded. They are added quietly: the
+        selection is not changed and missing outputs are not reported.
 
-        if tecplot_2d_check_state:
-            # Gets the -possible- tecplot output of BladePro
-            tecplot_output_file_path = os.path.join(self.InputWriterWidget.ui_working_path_edit.text(),
-                                          self.InputWriterWidget.ui_case_name_edit.text()) + ".2d.tec.dat"
+        @param working_path [str] Directory of the case. None uses the working path field of the Input Writer
+        @param case_name [str] Name of the case. None uses the case name field of the Input Writer
+        @param parent [QtCore.QModelIndex] Index of the group of the case. None adds it at the top level
+        @param case_outputs [dict] Output files to be loaded, by output type, e.g. when restoring a session. None looks
+        for the outputs of the case whose display is enabled in the preferences
+        @return [CaseNode] The added case node, or None if the case has no outputs
+
+        """
+        if working_path is None:
+            working_path = self.InputWriterWidget.ui_working_path_edit.text()
 
-            # bool of existence of a tecplot output for the adding case
-            tecplot_exists = os.path.isfile(tecplot_output_file_path)
+        # Gets the name of the adding case in a field in Input Writer Widget
+        if case_name is None:
+            case_name = self.InputWriterWidget.ui_case_name_edit.text()
 
-        # same as tecplot output for igs surf output
-        if igs_surf_check_state:
-            igs_surf_output_file_path = os.path.join(self.InputWriterWidget.ui_working_path_edit.text(),
-                                    self.InputWriterWidget.ui_case_name_edit.text()) + ".surf.igs"
+        # Every phase of the loading is timed, the phases of the case are shown in the status bar
+        with self.load_profiler.span("addCase", case_name):
+            added_case_node = self._loadCase(working_path, case_name, parent, case_outputs)
 
-            igs_surf_exists = os.path.isfile(igs_surf_output_file_path)
+        if added_case_node is not None and parent is None:
+            self.statusbar.showMessage(self.load_profiler.caseSummary(case_name), 10000)
 
-            # gives an extra chance of opening a .igs file by eliminating .surf of the name
-            if not igs_surf_exists:
-                igs_surf_output_file_path = os.path.join(self.InputWriterWidget.ui_working_path_edit.text(),
-                                        self.InputWriterWidget.ui_case_name_edit.text()) + ".igs"
-                igs_surf_exists = os.path.isfile(igs_surf_output_file_path)
+        return added_case_node
 
-        if igs_cur_3d_check_state:
-            # same as tecplot output for igs 3d curves output
-            igs_3d_cur_output_file_path = os.path.join(self.InputWriterWidget.ui_working_path_edit.text(),
-                                      self.InputWriterWidget.ui_case_name_edit.text()) + ".cur.igs"
+    def _loadCase(self, working_path, to_add_case_name, parent, case_outputs):
+        """
+        Loads the outputs of a case and adds it to the model, recording a timing span for each phase. See addCase().
 
-            igs_3d_cur_exists = os.path.isfile(igs_3d_cur_output_file_path)
+        @param working_path [str] Directory of the case
+        @param to_add_case_name [str] Name of the case
+        @param parent [QtCore.QModelIndex] Index of the group of the case. None adds it at the top level
+        @param case_outputs [dict] Output files to be loaded, by output type. None looks for the outputs of the case
+        @return [CaseNode] The added case node, or None if the case has no outputs
 
-        if igs_cur_2d_check_state:
-            # same as tecplot output for igs 3d curves output
-            igs_2d_cur_output_file_path = os.path.join(self.InputWriterWidget.ui_working_path_edit.text(),
-                                      self.InputWriterWidget.ui_case_name_edit.text()) + ".mpth.igs"
+        """
+        to_be_loaded_shape_list = []
 
-            igs_2d_cur_exists = os.path.isfile(igs_2d_cur_output_file_path)
+        with self.load_profiler.span("preferences", to_add_case_name):
+            settings = self.PreferencesManager.settings_snapshot
+            with settings.inGroup("outputs_settings"):
+                igs_surf_check_state = settings.boolValue("default_igs_surf_check_state")
+                igs_cur_3d_check_state = settings.boolValue("default_igs_3d_cur_check_state")
+                igs_cur_2d_check_state = settings.boolValue("default_igs_2d_cur_check_state")
+                tecplot_2d_check_state = settings.boolValue("default_tecplot_check_state")
+                step_ref_check_state = settings.boolValue("default_step_ref_check_state", True)
+
+        # Looks for the -possible- outputs of BladePro for the adding case whose display is enabled. The .surf.igs
+        # surface output has an extra chance of being found as .igs.
+        check_states = [["tecplot", tecplot_2d_check_state],
+                        ["igs_surf", igs_surf_check_state],
+                        ["igs_3d_cur", igs_cur_3d_check_state],
+                        ["igs_2d_cur", igs_cur_2d_check_state],
+                        ["step_ref", step_ref_check_state]]
+
+        with self.load_profiler.span("probe", to_add_case_name):
+            if case_outputs is None:
+                case_outputs = findCaseOutputs(working_path, to_add_case_name,
+                                               [output_type for output_type, check_state in check_states
+                                                if check_state])
+
+        # bool of existence of each output for the adding case
+        tecplot_exists = "tecplot" in case_outputs
+        igs_surf_exists = "igs_surf" in case_outputs
+        igs_3d_cur_exists = "igs_3d_cur" in case_outputs
+        igs_2d_cur_exists = "igs_2d_cur" in case_outputs
+        step_ref_exists = "step_ref" in case_outputs
+
+        tecplot_output_file_path = case_outputs.get("tecplot")
+        igs_surf_output_file_path = case_outputs.get("igs_surf")
+        igs_3d_cur_output_file_path = case_outputs.get("igs_3d_cur")
+        igs_2d_cur_output_file_path = case_outputs.get("igs_2d_cur")
+        step_ref_output_file_path = case_outputs.get("step_ref")
 
         # if not a single file is found for the adding case, displays a message and returns
-        if not any([tecplot_exists, igs_surf_exists, igs_3d_cur_exists, igs_2d_cur_exists]):
+        if not any([tecplot_exists, igs_surf_exists, igs_3d_cur_exists, igs_2d_cur_exists, step_ref_exists]):
+            if parent is not None:
+                return None
+
             msg = QtGui.QMessageBox()
             msg.setIcon(QtGui.QMessageBox.Information)
 
@@ -433,119 +514,511 @@ class BladePyCore(QtGui.QMainWindow, output_viewerUI.Ui_MainWindow):
             msg.setWindowTitle("No Output")
 
             msg.exec_()
-            return
+            return None
         # starts loading CAD files
+        with self.load_profiler.span("shapes", to_add_case_name) as shapes_span:
 
-        # Mistake-prevention of user filling of exception list
-        permited_characters_except_list = [" ", ",", "/"]
-        for permited_character in permited_characters_except_list:
-            igs_surf_exception = igs_surf_exception.replace(permited_character, ";")
-            igs_3d_cur_exception = igs_3d_cur_exception.replace(permited_character, ";")
-            igs_2d_cur_exception = igs_2d_cur_exception.replace(permited_character, ";")
+            # appending all igs files to one list to be loaded by iges_reader
+            if igs_surf_exists:
+                to_be_loaded_shape_list.append(self._shapeCase("igs_surf", igs_surf_output_file_path))
 
-        igs_surf_exception = igs_surf_exception.split(";")
-        igs_3d_cur_exception = igs_3d_cur_exception.split(";")
-        igs_2d_cur_exception = igs_2d_cur_exception.split(";")
+            if igs_3d_cur_exists:
+                to_be_loaded_shape_list.append(self._shapeCase("igs_3d_cur", igs_3d_cur_output_file_path))
 
-        # appending all igs files to one list to be loaded by iges_reader
-        if igs_surf_exists:
-            to_be_loaded_shape_list.append([igs_surf_output_file_path, igs_surf_exception])
+            if igs_2d_cur_exists:
+                to_be_loaded_shape_list.append(self._shapeCase("igs_2d_cur", igs_2d_cur_output_file_path))
 
-        if igs_3d_cur_exists:
-            to_be_loaded_shape_list.append([igs_3d_cur_output_file_path, igs_3d_cur_exception])
+            if step_ref_exists:
+                to_be_loaded_shape_list.append(self._shapeCase("step_ref", step_ref_output_file_path))
 
-        if igs_2d_cur_exists:
-            to_be_loaded_shape_list.append([igs_2d_cur_output_file_path, igs_2d_cur_exception])
+            shapes_span["bytes"] = sum(fileSize(shape_case[0]) for shape_case in to_be_loaded_shape_list)
 
-        # Calling the method loading a shape
-        loaded_h_ais_shape, loaded_subshape_names = self.ShapeManager.loadShape(to_be_loaded_shape_list)
+            # Calling the method loading a shape. Damaged files are reported instead of being loaded as empty
+            try:
+                loaded_h_ais_shape, loaded_subshape_names, loaded_topods_shape = \
+                    self.ShapeManager.loadShape(to_be_loaded_shape_list)
+            except IOError as error:
+                if parent is None:
+                    QtGui.QMessageBox.warning(self, "Open Case", "The case could not be loaded:\n%s" % error)
+                else:
+                    self.statusbar.showMessage("%s could not be loaded: %s" % (to_add_case_name, error), 10000)
+                return None
 
         # end of IGS shape loading routine
         loaded_tecplot_plotlines_list = []
 
         # start of tecplot output loading. If the adding case does have this output type
         if tecplot_exists:
+            with self.load_profiler.span("tecplot", to_add_case_name, fileSize(tecplot_output_file_path)):
+                loaded_tecplot_plotlines_list = self._loadTecplot(tecplot_output_file_path)
 
-            # calls a method of Tecplot Widget for loading the csv file.
-            self.TecplotViewerWidget.openTecplot(tecplot_output_file_path)
+        # Creates a Case Node from datastructure module with the loaded shape and loaded tecplot
+        with self.load_profiler.span("case_node", to_add_case_name):
+            added_case_node = self.model.appendCase(to_add_case_name, loaded_h_ais_shape, loaded_subshape_names,
+                                                    loaded_tecplot_plotlines_list, loaded_topods_shape,
+                                                    QtCore.QModelIndex() if parent is None else parent)
+
+            added_case_node.setCaseOutputs(case_outputs)
+            self.case_watcher.watchCase(added_case_node, working_path, to_add_case_name,
+                                        [output_type for output_type, check_state in check_states if check_state])
+
+            # Groups the sub-shapes of the case, so the case is transformed as a single object
+            self.ShapeManager.groupCaseShapes(added_case_node)
+            self.shape_registry.register(added_case_node, loaded_h_ais_shape)
+            self.ShapeManager.updateMeshMemory(added_case_node)
+
+        # Cases of groups are loaded while the group is expanded, the user selection is kept
+        if parent is not None:
+            with self.load_profiler.span("mesh_budget", to_add_case_name):
+                self.ShapeManager.enforceMeshBudget()
+            return added_case_node
+
+        with self.load_profiler.span("selection", to_add_case_name):
+            # The model already has the new row, it only becomes the current one. The Case Node is mapped to the
+            # fields in the GUI by _setSelection()
+            self.ui_case_treeview.setCurrentIndex(self.model.nodeIndex(added_case_node))
+
+            # Enabling Buttons after loading file:
+
+            self.selectionMode = "shape"
+
+            # Raise the screen with loaded outputs
+            self.show()
+            self.raise_()
+            self._setSelection(self.ui_case_treeview.currentIndex(), old=None)
 
-            # fetches the attributes loaded in the Tecplot Widget
-            loaded_tecplot_blade_plotlines = self.TecplotViewerWidget.tecplot_blade_plotlines
-            loaded_tecplot_stream_plotlines = self.TecplotViewerWidget.tecplot_stream_plotlines
-            loaded_tecplot_mean_plotlines = self.TecplotViewerWidget.tecplot_mean_plotlines
-            loaded_tecplot_profile_plotlines = self.TecplotViewerWidget.tecplot_profile_plotlines
-            loaded_tecplot_thickness_plotlines = self.TecplotViewerWidget.tecplot_thickness_plotlines
+        # Loading the case may exceed the mesh memory budget, the meshes of hidden shapes of older cases are dropped
+        with self.load_profiler.span("mesh_budget", to_add_case_name):
+            self.ShapeManager.enforceMeshBudget()
 
-            # Group all Tcplots in a single list with all lists
-            loaded_tecplot_plotlines_list.append(loaded_tecplot_blade_plotlines)
-            loaded_tecplot_plotlines_list.append(loaded_tecplot_stream_plotlines)
-            loaded_tecplot_plotlines_list.append(loaded_tecplot_profile_plotlines)
-            loaded_tecplot_plotlines_list.append(loaded_tecplot_mean_plotlines)
-            loaded_tecplot_plotlines_list.append(loaded_tecplot_thickness_plotlines)
+        return added_case_node
 
-            # Glitch is expected for the line below. If so, just put a try/except.
-            try:
-                loaded_tecplot_meanbeta_plotlines = self.TecplotViewerWidget.tecplot_meanbeta_plotlines
-                loaded_tecplot_plotlines_list.append(loaded_tecplot_meanbeta_plotlines)
-            except AttributeError:
-                pass
+    def _displayedRows(self, case_node):
+        """
+        Returns the rows of the sub-shapes of a case that are displayed in the viewer.
 
-        # Creates a Case Node from datastructure module with the loaded shape and loaded tecplot
+        @param case_node [CaseNode] The case
+        @return [list] The rows
+        """
+        return [row for row, h_ais_shape in enumerate(case_node.shapeHAIS())
+                if h_ais_shape is not None and self.display.Context.IsDisplayed(h_ais_shape)]
 
-        CaseNode(to_add_case_name, loaded_h_ais_shape, loaded_subshape_names, loaded_tecplot_plotlines_list,
-                 self.rootNode)
+    def saveSession(self):
+        """
+        Saves the loaded cases and their display state to a session file, see data_structure.case_session.
 
-        # Updates the model for the tree view and sets it.
-        self.model = CaseModel(self.rootNode)
-        self.ui_case_treeview.setModel(self.model)
-        self.ui_case_treeview.setCurrentIndex(self.model.index(self.model.rowCount(
-            self.ui_case_treeview.rootIndex()) - 1, 0, self.ui_case_treeview.rootIndex()))
+        @return None
 
-        # Maps the Case Node to fields in the GUI
-        self._setMapper()
+        """
+        if self.model.rowCount(self.ui_case_treeview.rootIndex()) == 0:
+            print("Action not feasible")
+            return
 
-        # Enabling Buttons after loading file:
+        session_path = QtGui.QFileDialog.getSaveFileName(self, 'Save session',
+                                                         self.InputWriterWidget.ui_working_path_edit.text(),
+                                                         session_file_filter)
 
-        self.selectionMode = "shape"
+        if not session_path:
+            return
+
+        session_path = str(session_path)
+        if not session_path.endswith(".bps"):
+            session_path += ".bps"
+
+        case_entries = []
+        group_entries = []
+
+        for row in range(0, self.rootNode.childCount()):
+            node = self.rootNode.child(row)
+
+            if node.isGroup():
+                group_case_entries = [caseEntry(node.child(group_row), self._displayedRows(node.child(group_row)))
+                                      for group_row in range(0, node.childCount())]
+                group_entries.append(groupEntry(node, group_case_entries))
+            else:
+                case_entries.append(caseEntry(node, self._displayedRows(node)))
+
+        try:
+            writeSession(session_path, case_entries, group_entries)
+        except (IOError, OSError) as error:
+            QtGui.QMessageBox.warning(self, "Save Session", "The session could not be saved:\n%s" % error)
+
+    def openSession(self):
+        """
+        Restores the cases of a session file with the display state they had when it was saved.
+
+        The cases are loaded from the recorded output files, without looking for outputs, and their shapes and tecplots
+        are read from the caches when the files did not change. The outputs changed after the session was saved are
+        reported, as the cases may not look as they did. The cases of groups that were not loaded are left to be
+        loaded when the group is expanded.
+
+        @return None
+
+        """
+        session_path = QtGui.QFileDialog.getOpenFileName(self, 'Open session',
+                                                         self.InputWriterWidget.ui_working_path_edit.text(),
+                                                         session_file_filter)
+
+        if not session_path:
+            return
+
+        try:
+            session = readSession(str(session_path))
+        except (IOError, OSError, ValueError) as error:
+            QtGui.QMessageBox.warning(self, "Open Session", "The session could not be opened:\n%s" % error)
+            return
+
+        restored_cases = []
+        missing_case_names = []
+        changed_outputs = []
+
+        for case_entry in session["cases"]:
+            restored_cases.append(self._restoreCase(case_entry, QtCore.QModelIndex(), missing_case_names,
+                                                    changed_outputs))
+
+        for group_entry in session["groups"]:
+            group_node = self.model.appendGroup(group_entry["name"], group_entry["working_path"],
+                                                group_entry["case_names"])
+
+            for case_entry in group_entry["cases"]:
+                group_node.removePendingCaseName(case_entry["name"])
+                restored_cases.append(self._restoreCase(case_entry, self.model.nodeIndex(group_node),
+                                                        missing_case_names, changed_outputs))
+
+        # The tecplot modes are restored by the same toggles used by the user, which act on the selected case
+        for case_node, state in [restored_case for restored_case in restored_cases if restored_case is not None]:
+            self.ui_case_treeview.setCurrentIndex(self.model.nodeIndex(case_node))
+            self._setSelection(self.ui_case_treeview.currentIndex(), old=None)
+            self._restoreTecplotState(case_node, state)
+
+        self.ShapeManager.enforceMeshBudget()
 
-        # Raise the screen with loaded outputs
         self.show()
         self.raise_()
+
+        session_messages = []
+
+        if missing_case_names:
+            session_messages.append("The outputs of these cases were not found:\n%s" % "\n".join(missing_case_names))
+
+        if changed_outputs:
+            session_messages.append("These outputs changed after the session was saved:\n%s" %
+                                    "\n".join(changed_outputs))
+
+        if session_messages:
+            QtGui.QMessageBox.information(self, "Open Session", "\n\n".join(session_messages))
+
+    def _restoreCase(self, case_entry, parent, missing_case_names, changed_outputs):
+        """
+        Loads a case of a session and sets its recorded display state.
+
+        @param case_entry [dict] Session entry of the case
+        @param parent [QtCore.QModelIndex] Index of the group of the case, invalid for top level cases
+        @param missing_case_names [list] List where the name of the case is appended if its outputs are missing
+        @param changed_outputs [list] List where the names of the outputs modified after the session was saved are
+        appended
+        @return [tuple] The case node and its recorded state, or None if the case could not be loaded
+        """
+        case_outputs = existingOutputs(case_entry)
+
+        if not case_outputs:
+            missing_case_names.append(case_entry["name"])
+            return None
+
+        changed_outputs.extend(os.path.basename(output_path) for output_path in staleOutputs(case_entry))
+
+        working_path = os.path.dirname(list(case_outputs.values())[0])
+        case_node = self.addCase(working_path, case_entry["name"], parent=parent, case_outputs=case_outputs)
+
+        if case_node is None:
+            missing_case_names.append(case_entry["name"])
+            return None
+
+        applyCaseState(case_node, case_entry["state"])
+        self.model.invalidateNode(case_node)
+        self.ShapeManager.restoreCaseDisplay(case_node, case_entry["state"]["displayed_rows"])
+
+        return case_node, case_entry["state"]
+
+    def _restoreTecplotState(self, case_node, state):
+        """
+        Sets the tecplot modes of the selected case to the ones recorded in a session.
+
+        @param case_node [CaseNode] The selected case
+        @param state [dict] The recorded state of the case
+        @return None
+        """
+        if not case_node.tecplotLists():
+            return
+
+        if state["tecplot_mode"] != case_node.tecplotMode():
+            self.TecplotViewerWidget.setNeutral()
+
+        if state["tecplot_meanline_visibility"] != case_node.tecplotMeanLinesVisibility():
+            self.TecplotViewerWidget.toggleMeanLines()
+
+        if state["tecplot_bladeprofile_visibility"] != case_node.tecplotBladeProfilesVisibility():
+            self.TecplotViewerWidget.toggleBladeProfiles()
+
+        # Hidden last, as the other toggles only change visible lines
+        if state["tecplot_visibility"] != case_node.tecplotVisibility():
+            self.TecplotViewerWidget.setVisibility()
+
+    def _shapeCase(self, output_type, output_file_path):
+        """
+        Creates the entry of a shape output for ShapeManager.loadShape(), with the display exceptions and the merging
+        of curves set in the preferences.
+
+        @param output_type [str] Type of the output, as in data_structure.case_files.case_output_suffixes
+        @param output_file_path [str] Path of the output
+        @return [list] Path, list of exceptions and whether the curves are merged
+        """
+        # STEP reference geometries are always displayed completely
+        if output_type == "step_ref":
+            return [output_file_path, []]
+
+        settings = self.PreferencesManager.settings_snapshot
+        with settings.inGroup("outputs_settings"):
+            exception = settings.value("default_%s_exception" % output_type)
+            merge_curves_check_state = settings.boolValue("default_merge_curves_check_state", False)
+
+        # Mistake-prevention of user filling of exception list
+        permited_characters_except_list = [" ", ",", "/"]
+        for permited_character in permited_characters_except_list:
+            exception = exception.replace(permited_character, ";")
+
+        if output_type == "igs_surf":
+            return [output_file_path, exception.split(";")]
+
+        return [output_file_path, exception.split(";"), merge_curves_check_state]
+
+    def _loadTecplot(self, tecplot_output_file_path):
+        """
+        Plots a tecplot output in the Tecplot Widget.
+
+        @param tecplot_output_file_path [str] Path of the tecplot output
+        @return [list] The lists of plotted lines, in the order kept by CaseNode
+        """
+        loaded_tecplot_plotlines_list = []
+
+        # calls a method of Tecplot Widget for loading the csv file.
+        self.TecplotViewerWidget.openTecplot(tecplot_output_file_path)
+
+        # fetches the attributes loaded in the Tecplot Widget
+        loaded_tecplot_blade_plotlines = self.TecplotViewerWidget.tecplot_blade_plotlines
+        loaded_tecplot_stream_plotlines = self.TecplotViewerWidget.tecplot_stream_plotlines
+        loaded_tecplot_mean_plotlines = self.TecplotViewerWidget.tecplot_mean_plotlines
+        loaded_tecplot_profile_plotlines = self.TecplotViewerWidget.tecplot_profile_plotlines
+        loaded_tecplot_thickness_plotlines = self.TecplotViewerWidget.tecplot_thickness_plotlines
+
+        # Group all Tcplots in a single list with all lists
+        loaded_tecplot_plotlines_list.append(loaded_tecplot_blade_plotlines)
+        loaded_tecplot_plotlines_list.append(loaded_tecplot_stream_plotlines)
+        loaded_tecplot_plotlines_list.append(loaded_tecplot_profile_plotlines)
+        loaded_tecplot_plotlines_list.append(loaded_tecplot_mean_plotlines)
+        loaded_tecplot_plotlines_list.append(loaded_tecplot_thickness_plotlines)
+
+        # Glitch is expected for the line below. If so, just put a try/except.
+        try:
+            loaded_tecplot_meanbeta_plotlines = self.TecplotViewerWidget.tecplot_meanbeta_plotlines
+            loaded_tecplot_plotlines_list.append(loaded_tecplot_meanbeta_plotlines)
+        except AttributeError:
+            pass
+
+        return loaded_tecplot_plotlines_list
+
+    def _reloadCaseOutput(self, case_node, output_type, output_file_path):
+        """
+        Reloads an output of a case that was modified or created, e.g. by a new BladePro run. Called by the case
+        watcher.
+
+        Only the modified output is read again. The display state of the case is kept.
+
+        @param case_node [CaseNode] The case
+        @param output_type [str] Type of the output, as in data_structure.case_files.case_output_suffixes
+        @param output_file_path [str] Path of the output
+        @return None
+        """
+        if output_type == "tecplot":
+            if not self._reloadTecplot(case_node, output_file_path):
+                return
+        else:
+            # A damaged file keeps the shapes loaded before, until it is written again
+            try:
+                self.ShapeManager.reloadShapeFile(case_node, self._shapeCase(output_type, output_file_path))
+            except IOError as error:
+                self.statusbar.showMessage("%s could not be reloaded: %s" % (os.path.basename(output_file_path),
+                                                                             error), 10000)
+                return
+            self.ShapeManager.enforceMeshBudget()
+
+        # An output created after the case was loaded, e.g. by a BladePro run still going, becomes part of the case
+        case_outputs = case_node.caseOutputs()
+        if output_type not in case_outputs:
+            case_outputs[output_type] = output_file_path
+            case_node.setCaseOutputs(case_outputs)
+
+        # The sub-shape list and the selected shapes of the selected case are refreshed
+        if case_node is self.case_node:
+            self._setSelection(self.ui_case_treeview.currentIndex(), old=None)
+
+        self.statusbar.showMessage("%s reloaded" % os.path.basename(output_file_path), 5000)
+
+    def _reloadTecplot(self, case_node, tecplot_output_file_path):
+        """
+        Plots again the tecplot output of a case, keeping its tecplot modes.
+
+        @param case_node [CaseNode] The case
+        @param tecplot_output_file_path [str] Path of the tecplot output
+        @return [bool] False if the file could not be read, the tecplot plotted before is then kept
+        """
+        state = {"tecplot_mode": case_node.tecplotMode(),
+                 "tecplot_visibility": case_node.tecplotVisibility(),
+                 "tecplot_meanline_visibility": case_node.tecplotMeanLinesVisibility(),
+                 "tecplot_bladeprofile_visibility": case_node.tecplotBladeProfilesVisibility()}
+
+        # A malformed file, e.g. still being written, keeps the tecplot plotted before, until it is written again.
+        # The file is read before anything is plotted, so a failure leaves no new lines
+        try:
+            tecplot_lists = self._loadTecplot(tecplot_output_file_path)
+        except (IOError, ValueError, IndexError, KeyError) as error:
+            self.statusbar.showMessage("%s could not be reloaded: %s" % (os.path.basename(tecplot_output_file_path),
+                                                                         error), 10000)
+            return False
+
+        for lines in case_node.tecplotLists():
+            for line in lines:
+                line.remove()
+
+        case_node.setTecplotLists(tecplot_lists)
+
+        # The modes are set again by the toggles, which act on the selected case
+        selected_index = self.ui_case_treeview.currentIndex()
+
+        self.ui_case_treeview.setCurrentIndex(self.model.nodeIndex(case_node))
         self._setSelection(self.ui_case_treeview.currentIndex(), old=None)
+        self._restoreTecplotState(case_node, state)
+
+        if selected_index.isValid():
+            self.ui_case_treeview.setCurrentIndex(selected_index)
+            self._setSelection(selected_index, old=None)
+
+        self.TecplotViewerWidget._canvas_1.draw()
+        self.TecplotViewerWidget._canvas_2.draw()
+
+        return True
+
+    def exportLoadTiming(self):
+        """
+        Exports the timing spans of the loaded cases, see data_structure.load_profiler, to JSON or to a Chrome trace.
+
+        @return None
+
+        """
+        if not self.load_profiler.spans():
+            print("Action not feasible")
+            return
+
+        file_path, selected_filter = QtGui.QFileDialog.getSaveFileNameAndFilter(
+            self, "Export Load Timing", self.InputWriterWidget.ui_working_path_edit.text(),
+            ";;".join([span_export_filters["chrome"], span_export_filters["json"]]))
+
+        if not file_path:
+            return
+
+        try:
+            if str(selected_filter) == span_export_filters["chrome"]:
+                self.load_profiler.writeChromeTrace(str(file_path))
+            else:
+                self.load_profiler.writeJSON(str(file_path))
+        except (IOError, OSError) as error:
+            QtGui.QMessageBox.warning(self, "Export Load Timing", "The timing could not be exported:\n%s" % error)
+            return
+
+        self.statusbar.showMessage("%d timing spans written" % len(self.load_profiler.spans()), 5000)
+
+    def exportMesh(self):
+        """
+        Exports the triangulation of the selected case to a STL, PLY or glTF file.
+
+        The triangles are the ones already computed for the display, so the case is not meshed again. They are
+        collected here and written by occ_modules.mesh_export.MeshExportThread, so the GUI is not frozen while large
+        cases are written. The user chooses whether the sub-shapes go to a single file or to one file each.
+
+        @return None
+
+        """
+        if self.case_node is None or self.case_node.isGroup() or \
+                self.model.rowCount(self.ui_case_treeview.rootIndex()) == 0:
+            print("Action not feasible")
+            return
+
+        # Only imported when a mesh is exported, so it does not delay the start up
+        from occ_modules.mesh_export import collectMeshes, MeshExportThread, mesh_export_formats
+
+        meshes = collectMeshes(self.display.Context, self.case_node)
+
+        if not meshes:
+            QtGui.QMessageBox.information(self, "Export Mesh",
+                                          "The case has no tessellated surfaces. Display it in shaded mode first.")
+            return
+
+        filters = ["%s (*%s)" % (export_format, extension) for export_format, extension in
+                   sorted(mesh_export_formats.items())]
+
+        file_path, selected_filter = QtGui.QFileDialog.getSaveFileNameAndFilter(
+            self, "Export Mesh", os.path.join(self.InputWriterWidget.ui_working_path_edit.text(),
+                                              self.case_node.name()), ";;".join(filters))
+
+        if not file_path:
+            return
+
+        export_format = str(selected_filter).split(" ")[0]
+
+        merged = QtGui.QMessageBox.question(self, "Export Mesh", "Write all sub-shapes to a single file?",
+                                            QtGui.QMessageBox.Yes | QtGui.QMessageBox.No,
+                                            QtGui.QMessageBox.Yes) == QtGui.QMessageBox.Yes
+
+        file_path = str(file_path)
+        case_name = os.path.splitext(os.path.basename(file_path))[0]
+
+        # The thread is kept as attribute, otherwise it would be garbage collected while running
+        self._mesh_export_thread = MeshExportThread(meshes, os.path.dirname(file_path), case_name, export_format,
+                                                    merged, self)
+        self._mesh_export_thread.exportFinished.connect(
+            lambda written_files: self.statusbar.showMessage("%d mesh file(s) written" % len(written_files), 5000))
+        self._mesh_export_thread.exportFailed.connect(
+            lambda error: QtGui.QMessageBox.warning(self, "Export Mesh", "Mesh export failed: %s" % error))
+        self._mesh_export_thread.start()
 
     def deleteCase(self):
         """
         Method for deleting loaded cases in model tree view.
 
-        It deletes the interactive AIS Shape, the tecplots from Display and data structure.
+        It deletes the interactive AIS Shape, the tecplots from Display and data structure. Deleting a group deletes
+        all its loaded cases.
 
         @return None
 
         """
-        # Firstly, removes all lines in a nested loop
-
         # Verify if there is anything to delete. If not, return function
-        if self.model.rowCount(self.ui_case_treeview.rootIndex()) == 0:
+        if self.model.rowCount(self.ui_case_treeview.rootIndex()) == 0 or self.case_node is None:
             return
 
-        for n in range(0, len(self.case_node.tecplotLists())):
-            for line in self.case_node.tecplotLists()[n]:
-                line.remove()
+        if self.case_node.isGroup():
+            for row in range(0, self.case_node.childCount()):
+                self._removeCaseOutputs(self.case_node.child(row))
+        else:
+            self._removeCaseOutputs(self.case_node)
 
         # Updates canvas
         self.TecplotViewerWidget._canvas_1.draw()
         self.TecplotViewerWidget._canvas_2.draw()
-        self.current_h_ais_shape = self.case_node.shapeHAIS()
 
-        for i in range(0, len(self.current_h_ais_shape)):
-            self.display.Context.Remove(self.current_h_ais_shape[i])
-
-        # Remove the node from data structure.
-        self.case_node.parent().removeChild(self.case_node.row())
-
-        # Re-sets model and re-applies it to the tree view list
-        self.model = CaseModel(self.rootNode)
-        self.ui_case_treeview.setModel(self.model)
+        # Remove the node from data structure, notifying the tree view of the removed row.
+        self.model.removeRows(self.case_node.row(), 1, self.ui_case_treeview.currentIndex().parent())
+        self.case_node = None
+        self.current_h_ais_shape = None
         self.ui_subcase_list.clear()
 
         # The code is used to make the last item of the list selected.
@@ -559,6 +1032,31 @@ class BladePyCore(QtGui.QMainWindow, output_viewerUI.Ui_MainWindow):
         except IndexError:
             pass
 
+    def _removeCaseOutputs(self, case_node):
+        """
+        Removes the tecplots and the AIS Shapes of a case from the displays and from the shape registry.
+
+        The canvas of the tecplots is not redrawn, so several cases can be removed with a single redraw.
+
+        @param case_node [CaseNode] The case
+        @return None
+
+        """
+        # Firstly, removes all lines in a nested loop
+        for n in range(0, len(case_node.tecplotLists())):
+            for line in case_node.tecplotLists()[n]:
+                line.remove()
+
+        # Sub-shapes that were never displayed do not have an AIS Shape to be removed. Merged curves are removed once.
+        for h_ais_shape in uniqueShapes(case_node.shapeHAIS()):
+            self.display.Context.Remove(h_ais_shape)
+
+        for h_instance in case_node.wheelInstances():
+            self.display.Context.Remove(h_instance)
+
+        self.shape_registry.unregister(case_node)
+        self.case_watcher.unwatchCase(case_node)
+
     def setZoomFactor( self ):
         """
         Sets the zoom factor for shape viewing.
@@ -603,19 +1101,62 @@ class BladePyCore(QtGui.QMainWindow, output_viewerUI.Ui_MainWindow):
         # Gets the shape of the current case
         self.current_h_ais_shape = self.case_node.shapeHAIS()
 
-        sub_shape = []
-        # Gets the subshape selected in TreeWidget in the current case shape
-        for i in range(0, len(self.ui_subcase_list.selectedIndexes())):
-            sub_shape.append(self.current_h_ais_shape[self.ui_subcase_list.selectedIndexes()[i].row()])
+        # Gets the subshape selected in TreeWidget in the current case shape. Sub-shapes not built yet are skipped and
+        # curves merged in one compound give the compound once.
+        sub_shape = uniqueShapes(self.current_h_ais_shape[index.row()]
+                                 for index in self.ui_subcase_list.selectedIndexes())
 
         # Sets that the current working shape handle is the list of sub_shapes
         self.current_h_ais_shape = sub_shape
 
-        self.display.Context.ClearSelected()
-
         # When subshapes are clicked in the TreeWidget, they are highlighted for identification.
-        for i in range(0, len(self.current_h_ais_shape)):
-            self.display.Context.AddOrRemoveSelected(self.current_h_ais_shape[i])
+        self.selectShapes(self.current_h_ais_shape)
+
+    def selectShapes(self, h_ais_shapes):
+        """
+        Sets the selection of the viewer to a group of AIS Shapes, replacing the previous selection.
+
+        The selection is cleared and every shape is added with the viewer update suppressed, so the highlight of a
+        case with hundreds of sub-shapes costs a single redraw at the end.
+
+        @param h_ais_shapes [list] Handles of the AIS Shapes to be selected. None entries are ignored
+        @return None
+
+        """
+        context = self.display.Context
+
+        context.ClearSelected(False)
+
+        for h_ais_shape in h_ais_shapes:
+            if h_ais_shape is not None:
+                context.AddOrRemoveSelected(h_ais_shape, False)
+
+        context.UpdateCurrentViewer()
+
+    def _pickSubShape(self, x, y):
+        """
+        Slot of clicks in the viewer. Selects in the tree view and in the sub-shape list the sub-shape under the mouse.
+
+        The viewer does not select on clicks itself, see occ_modules.qt_display.customQtViewer3d.mouseReleaseEvent(),
+        the sub-shape is highlighted here. A click on empty space clears the highlight.
+
+        @param x [int] Horizontal position of the click in pixels
+        @param y [int] Vertical position of the click in pixels
+        @return None
+
+        """
+        picked_case_node, picked_row = self.ShapeManager.pickSubShape(x, y)
+
+        if picked_case_node is None:
+            self.selectShapes([])
+            return
+
+        if picked_case_node is not self.case_node:
+            self.ui_case_treeview.setCurrentIndex(self.model.nodeIndex(picked_case_node))
+            self._setSelection(self.ui_case_treeview.currentIndex(), old=None)
+
+        self.ui_subcase_list.setCurrentRow(picked_row)
+        self._surfaceChanged()
 
     def _setSelection( self, current, old=None ):
         """
@@ -640,18 +1181,24 @@ class BladePyCore(QtGui.QMainWindow, output_viewerUI.Ui_MainWindow):
         except AttributeError:
             pass
 
-        self.current_h_ais_shape = self.case_node.shapeHAIS()
-        self.ui_subcase_list.clear()
+        # A group has no shapes nor properties of its own, only its cases have
+        if self.case_node.isGroup():
+            self.current_h_ais_shape = []
+            self.ui_subcase_list.clear()
+            self.selectShapes([])
+            self._removeMapper()
+            return
 
-        for i in range(0, len(self.current_h_ais_shape)):
-            self.ui_subcase_list.addItem(self.case_node._supshape_names[i])
+        self.shape_registry.touch(self.case_node)
 
-        self.display.Context.ClearSelected()
+        # Only the sub-shapes that were already built are the working shape. The others are built on display.
+        self.current_h_ais_shape = uniqueShapes(self.case_node.shapeHAIS())
+        self.ui_subcase_list.clear()
 
-        for i in range(0, len(self.current_h_ais_shape)):
-            self.display.Context.AddOrRemoveSelected(self.current_h_ais_shape[i])
+        for i in range(0, len(self.case_node._supshape_names)):
+            self.ui_subcase_list.addItem(self.case_node._supshape_names[i])
 
-        self.display.Context.UpdateCurrentViewer()
+        self.selectShapes(self.current_h_ais_shape)
 
         # if cause for syncing buttons to selected case
         if self.case_node.tecplotIsVisible():
@@ -759,9 +1306,11 @@ class BladePyCore(QtGui.QMainWindow, output_viewerUI.Ui_MainWindow):
         view_actions_1 = [QtGui.QAction(QtGui.QIcon(os.path.join(output_viewer_dir, "icons/views/fitall_view.svg")),
                                         "Fit all", self),
                           QtGui.QAction(QtGui.QIcon(os.path.join(output_viewer_dir, "icons/views/iso_view.svg")),
-                                        "Axonometric", self)]
+                                        "Axonometric", self),
+                          QtGui.QAction(QtGui.QIcon(os.path.join(output_viewer_dir, "icons/views/fullwheel_view.svg")),
+                                        "Full wheel", self)]
 
-        view_shortcut_1 = ["", "0"]
+        view_shortcut_1 = ["", "0", "W"]
         view_actions_1 = zip(view_actions_1, view_shortcut_1)
 
         view_actions_2 = [QtGui.QAction(QtGui.QIcon(os.path.join(output_viewer_dir, "icons/views/front_view.svg")),
@@ -795,9 +1344,19 @@ class BladePyCore(QtGui.QMainWindow, output_viewerUI.Ui_MainWindow):
         file_actions = [QtGui.QAction(QtGui.QIcon(os.path.join(output_viewer_dir, "icons/basic/Document-new.svg")),
                                       "Create New Case", self),
                         QtGui.QAction(QtGui.QIcon(os.path.join(output_viewer_dir, "icons/basic/Document-open.svg")),
-                                      "Open BladePro Case", self)]
-
-        file_shortcut = ["Ctrl+N", "Ctrl+O"]
+                                      "Open BladePro Case", self),
+                        QtGui.QAction(QtGui.QIcon(os.path.join(output_viewer_dir, "icons/basic/Document-open.svg")),
+                                      "Open Case Directory", self),
+                        QtGui.QAction(QtGui.QIcon(os.path.join(output_viewer_dir, "icons/basic/Document-open.svg")),
+                                      "Open Session", self),
+                        QtGui.QAction(QtGui.QIcon(os.path.join(output_viewer_dir, "icons/basic/Document-export.svg")),
+                                      "Save Session", self),
+                        QtGui.QAction(QtGui.QIcon(os.path.join(output_viewer_dir, "icons/basic/Document-export.svg")),
+                                      "Export Mesh", self),
+                        QtGui.QAction(QtGui.QIcon(os.path.join(output_viewer_dir, "icons/basic/Document-export.svg")),
+                                      "Export Load Timing", self)]
+
+        file_shortcut = ["Ctrl+N", "Ctrl+O", "Ctrl+Shift+O", "Ctrl+Shift+R", "Ctrl+S", "Ctrl+E", ""]
         file_actions = zip(file_actions, file_shortcut)
         self._setAction(self.ui_file_menu_, self.ui_file_toolbar, file_actions, True)
         self.ui_file_toolbar.actionTriggered[QtGui.QAction].connect(self.toolbarFileButtonPressedGroup)
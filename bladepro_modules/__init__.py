@@ -6,6 +6,9 @@ Package that contains the files that relates to the direct usage of BladePro C++
 \arg \c inputfile_writer File File that contains the class InputWriterWindow for adding functions to the BladePy
 InputWriter function-less layout created in Qt Designer for the Blade Inputfile writer.
 
+\arg \c directory_scanner File that contains the class DirectoryScanner, for finding the cases of a directory in the
+background.
+
 This package folder also contains sample outputs that can be read by Output Viewer Widget. The package also contains
 folders for graphical purposes such icons and images.
 
@@ -0,0 +1,199 @@
+"""
+@package bladepro_modules.directory_scanner
+
+File that contains the class DirectoryScanner, which finds the BladePro cases of a directory in the background.
+
+The working path of the Input Writer lists the cases it contains while the user types it. Listing a directory of a
+network share with many files takes seconds, so the scan runs in a worker thread and only starts once the path was not
+changed for debounce_interval. The case names of each scanned directory are cached with the modification time of the
+directory, and the directory shown is watched, so a directory is only scanned again when its files change.
+
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt4 import QtCore
+
+from data_structure.case_files import caseNameOf
+
+## Suffixes of files listed as cases by the Input Writer, besides the outputs of data_structure.case_files. IGES files
+# of other tools are listed, as they can be opened in the Output Viewer, even if a case is not looked for in them
+listed_suffixes = (".iges",)
+
+
+def scanCaseNames(directory):
+    """
+    Finds the names of the cases that have at least one recognized output, or a file with one of listed_suffixes, in
+    a directory.
+
+    Unlike data_structure.case_files.findCaseNames(), the entries are read with os.scandir(), which does not query
+    each file, and the names are returned unsorted.
+
+    @param directory [str] Directory to be scanned
+    @return [set] Set of case names
+    @exception OSError The directory cannot be read
+    """
+    case_names = set()
+
+    for entry in os.scandir(directory):
+        case_name = caseNameOf(entry.name)
+
+        if not case_name and entry.name.endswith(listed_suffixes):
+            case_name = entry.name[:entry.name.index('.')]
+
+        if case_name:
+            case_names.add(case_name)
+
+    return case_names
+
+
+class DirectoryScanner(QtCore.QObject):
+    """
+    Class that scans directories for BladePro cases in a worker thread.
+
+    scan() asks for the cases of a directory. Only the last asked directory is reported, by caseNamesFound, so the
+    results of paths typed in the meantime are cached but not shown.
+
+    """
+
+    ## Signal emitted with the directory and the sorted list of its case names. The list is empty if the directory
+    # does not exist.
+    caseNamesFound = QtCore.pyqtSignal(str, list)
+
+    # Signal emitted by the worker thread with the directory, its modification time and its case names
+    _scanned = QtCore.pyqtSignal(str, object, object)
+
+    def __init__(self, parent=None):
+        """
+        The constructor of the class.
+
+        @param parent [QtCore.QObject] Parent object of the scanner
+        """
+        super(DirectoryScanner, self).__init__(parent)
+
+        ## Time in milliseconds that the directory must stay the same before it is scanned
+        self.debounce_interval = 300
+
+        # Dictionary of directory to (modification time, set of case names). Written by the GUI thread only.
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+
+        # Last asked directory. Scans of other directories waiting for the worker are skipped.
+        self._requested_directory = None
+
+        # Worker thread, created by the first scan and dropped by shutdown()
+        self._executor = None
+        self._scanned.connect(self._scanFinished)
+
+        self._debounce_timer = QtCore.QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.timeout.connect(self._startScan)
+
+        self._directory_watcher = QtCore.QFileSystemWatcher(self)
+        self._directory_watcher.directoryChanged.connect(self._directoryChanged)
+
+    def scan(self, directory, delay=None):
+        """
+        Asks for the case names of a directory. They are reported by caseNamesFound.
+
+        @param directory [str] Directory to be scanned
+        @param delay [int] Time in milliseconds to wait for another directory before scanning. None uses
+        debounce_interval
+        @return None
+        """
+        # An empty path has no cases, it is not the current directory
+        if not str(directory):
+            self._requested_directory = None
+            self._debounce_timer.stop()
+            self.caseNamesFound.emit("", [])
+            return
+
+        self._requested_directory = os.path.abspath(str(directory))
+        self._debounce_timer.start(self.debounce_interval if delay is None else delay)
+
+    def invalidate(self, directory):
+        """
+        Drops the cached case names of a directory, e.g. after BladePro wrote new outputs in it.
+
+        @param directory [str] The directory
+        @return None
+        """
+        with self._cache_lock:
+            self._cache.pop(os.path.abspath(str(directory)), None)
+
+    def shutdown(self):
+        """
+        Stops the worker thread, e.g. when the window that shows the cases is closed. A scan already running is left
+        to finish, its result is not reported. A later scan starts a new worker.
+
+        @return None
+        """
+        self._requested_directory = None
+        self._debounce_timer.stop()
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _startScan(self):
+        directory = self._requested_directory
+
+        # Only the shown directory is watched
+        for watched_directory in self._directory_watcher.directories():
+            if watched_directory != directory:
+                self._directory_watcher.removePath(watched_directory)
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+
+        self._executor.submit(self._scanDirectory, directory)
+
+    def _scanDirectory(self, directory):
+        # Runs in the worker thread. Nothing is reported for directories the user already typed past.
+        if directory != self._requested_directory:
+            return
+
+        try:
+            directory_mtime = os.stat(directory).st_mtime
+        except OSError:
+            self._scanned.emit(directory, None, set())
+            return
+
+        with self._cache_lock:
+            cached = self._cache.get(directory)
+
+        if cached is not None and cached[0] == directory_mtime:
+            self._scanned.emit(directory, directory_mtime, cached[1])
+            return
+
+        try:
+            case_names = scanCaseNames(directory)
+        except OSError:
+            self._scanned.emit(directory, None, set())
+            return
+
+        self._scanned.emit(directory, directory_mtime, case_names)
+
+    def _scanFinished(self, directory, directory_mtime, case_names):
+        directory = str(directory)
+
+        if directory_mtime is not None:
+            with self._cache_lock:
+                self._cache[directory] = (directory_mtime, case_names)
+
+        if directory != self._requested_directory:
+            return
+
+        if directory_mtime is not None and directory not in self._directory_watcher.directories():
+            self._directory_watcher.addPath(directory)
+
+        self.caseNamesFound.emit(directory, sorted(case_names))
+
+    def _directoryChanged(self, path):
+        # The modification time of directories of network shares may not change, so the cache is dropped
+        self.invalidate(path)
+
+        if os.path.abspath(str(path)) == self._requested_directory:
+            self.scan(path)
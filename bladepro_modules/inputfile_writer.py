@@ -7,9 +7,6 @@ and calling the C++ code to run with the generated input file.
 
 """
 from PyQt4 import QtGui, QtCore
-import matplotlib.image as mpimg
-import matplotlib.pyplot as plt
-import matplotlib as mpl
 import functools
 
 import os
@@ -18,12 +15,17 @@ import sys
 input_writer_dir = os.path.dirname(__file__)
 
 
+from ui_compiler import compileUi
+
 ui_file = os.path.join(input_writer_dir, "inputfile_writerUI.ui")
 py_ui_file = os.path.join(input_writer_dir, "inputfile_writerUI.py")
 
-os.system("pyuic4 -x %s -o %s" % (ui_file, py_ui_file))
+# The layout is only compiled if the .ui file changed
+compileUi(ui_file, py_ui_file)
 
 from bladepro_modules import inputfile_writerUI
+from bladepro_modules.directory_scanner import DirectoryScanner
+from settings.settings_snapshot import SettingsSnapshot, mainSettings, dct
 
 class InputWriterWindow(QtGui.QMainWindow, inputfile_writerUI.Ui_MainWindow):
     """
@@ -62,6 +64,7 @@ class InputWriterWindow(QtGui.QMainWindow, inputfile_writerUI.Ui_MainWindow):
         # Consolidates both settings list in one.
         self.list_settings.append(self.last_settings)
         self.list_settings.extend(self.user_settings)
+        self.settings_snapshots = [SettingsSnapshot(settings) for settings in self.list_settings]
 
         # Define the instance variable for the setting names list. This is used to save/retrieve user renamed settings.
         self.settings_names = QtCore.QSettings("BladePy", "BladePy\InputWriter\SettingsNames")
@@ -89,6 +92,10 @@ class InputWriterWindow(QtGui.QMainWindow, inputfile_writerUI.Ui_MainWindow):
         QtCore.QObject.connect(self.ui_modify_streams_opt_combo, QtCore.SIGNAL("currentIndexChanged(int)"),
                                self.modifyStreamsValidator)
 
+        # Finds the cases of the working path in the background while it is typed
+        self.directory_scanner = DirectoryScanner(self)
+        self.directory_scanner.caseNamesFound.connect(self._showExistantOutputs)
+
         # Signal connections
         # Find path button
         self.ui_read_find_btn.clicked.connect(self.readOptionsFind)
@@ -127,29 +134,35 @@ class InputWriterWindow(QtGui.QMainWindow, inputfile_writerUI.Ui_MainWindow):
 
         self.ui_modify_te_help_btn.setIcon(icon)
 
-    def _fillExistantOutputs(self):
-        self.ui_case_name_existent_list.clear()
-        working_path = self.ui_working_path_edit.text()
+    def closeEvent(self, event):
+        """
+        Stops the directory scanner when the window is closed, so its worker thread does not outlive the window.
 
-        try:
-            list_dir = os.listdir(working_path)
-        except FileNotFoundError:
-            return
+        @param event [QtGui.QCloseEvent] The close event
+        @return None
+        """
+        self.directory_scanner.shutdown()
 
-        output_recognized = [".2d.tec.dat", ".surf.igs", ".cur.igs", ".mpth.igs", ".iges", ".igs"]
-        list_supported = []
-        list_not_supported = []
+        super(InputWriterWindow, self).closeEvent(event)
 
+    def _fillExistantOutputs(self):
+        """
+        Asks for the cases of the working path, which are listed by _showExistantOutputs() once scanned.
 
-        for item in list_dir:
-            if any(iterator in item for iterator in output_recognized):
-                if item[:item.index('.')] not in list_supported:
-                    self.ui_case_name_existent_list.addItem(item[:item.index('.')])
+        @return None
+        """
+        self.directory_scanner.scan(self.ui_working_path_edit.text())
 
-                list_supported.append(item[:item.index('.')])
-            else:
-                list_not_supported.append(item)
-                # self.ui_case_name_existent_not_supported_edit.addItem(item)
+    def _showExistantOutputs(self, directory, case_names):
+        """
+        Lists the cases of the working path found by the directory scanner.
+
+        @param directory [str] The scanned directory
+        @param case_names [list] Sorted list of the case names
+        @return None
+        """
+        self.ui_case_name_existent_list.clear()
+        self.ui_case_name_existent_list.addItems(case_names)
 
     def selectPath(self):
         """
@@ -260,7 +273,7 @@ class InputWriterWindow(QtGui.QMainWindow, inputfile_writerUI.Ui_MainWindow):
         working_path = self.ui_working_path_edit.text()
 
         QtCore.QCoreApplication.processEvents()
-        bladepro_version = self.op_viewer.PreferencesManager.list_settings[1].value("bladepro_settings/default_bladebro_version")
+        bladepro_version = mainSettings().value("bladepro_settings/default_bladebro_version")
         print("%s Running" % bladepro_version)
 
         bladepro_command = bladepro_version + " " + os.path.join(working_path, case_name)
@@ -269,7 +282,10 @@ class InputWriterWindow(QtGui.QMainWindow, inputfile_writerUI.Ui_MainWindow):
         status_message = "Last Status: %s was run for generating %s outputs" % (bladepro_version, case_name)
 
         self.ui_application_status_lbl.setText(status_message)
-        self._fillExistantOutputs()
+
+        # The new outputs are listed at once
+        self.directory_scanner.invalidate(working_path)
+        self.directory_scanner.scan(working_path, delay=0)
 
     def openSelectedCases(self):
         """
@@ -455,6 +471,11 @@ class InputWriterWindow(QtGui.QMainWindow, inputfile_writerUI.Ui_MainWindow):
         @returns None
         """
 
+        # matplotlib is only imported when the help is shown, so it does not delay the start up
+        import matplotlib as mpl
+        import matplotlib.image as mpimg
+        import matplotlib.pyplot as plt
+
         # Remove toolbar from matplotlib
         mpl.rcParams['toolbar'] = 'None'
 
@@ -1269,153 +1290,133 @@ class InputWriterWindow(QtGui.QMainWindow, inputfile_writerUI.Ui_MainWindow):
 
         """
 
-        # For some reason, when checkbox isChecked is saved to the user settings, it saves as lowercase letters.
-        # A simple solution was to create a simple dictionary
-        dct = {"true": True, "false": False, True: True, False: False}
-
         # The set sums 1, as the first item in python lists is 0 and 0 is reserved for last user settings.
         setting += 1
 
+        # The values are read from the in-memory copy of the setting, refreshed every time it is saved
+        settings = self.settings_snapshots[setting]
+
         # if statement In case the user tries to load settings no previously defined.
-        if self.list_settings[setting].value("read_panel/ibl_file") is None:
+        if settings.value("read_panel/ibl_file") is None:
             QtGui.QMessageBox.about(self, "Warning", "No Setting previously defined for this item")
             return
 
-        # Begin group/end group. Means, e. g. that value("ibl_file") value is stored actually  in
-        # value("read_panel/ibl_file")
+        # Groups. Means, e. g. that value("ibl_file") value is stored actually  in value("read_panel/ibl_file"). The
+        # groups are closed at the end of their with block, also when a missing value raises
 
         try:
-            self.list_settings[setting].beginGroup("read_panel")
-
-            self.ui_read_ibl_iblfile_edit.setText(self.list_settings[setting].value("ibl_file"))
-            self.ui_read_ibl_fpfile_edit.setText(self.list_settings[setting].value("fp_file"))
-
-            self.ui_read_cftgeo_rbtn.setChecked(dct[self.list_settings[setting].value("cft_option")])
-            self.ui_read_cftgeo_cftfile_edit.setText(self.list_settings[setting].value("cft_file"))
-            self.ui_read_cftgeo_nblades_spn.setValue(int(self.list_settings[setting].value("cft_nblades")))
-            self.ui_read_cftgeo_angle_dspn.setValue(float(self.list_settings[setting].value("cft_angle")))
-
-            self.ui_working_path_edit.setText(self.list_settings[setting].value("working_path"))
-            self.ui_case_name_edit.setText(self.list_settings[setting].value("case_name"))
-
-            self.list_settings[setting].endGroup()
-
-            self.list_settings[setting].beginGroup("modify_panel")
-
-            self.list_settings[setting].beginGroup("scale")
-            self.ui_modify_scale_chk.setChecked(dct[self.list_settings[setting].value("checkbox")])
-            self.ui_modify_scale_xsc_dspn.setValue(float(self.list_settings[setting].value("xsc_value")))
-            self.ui_modify_scale_ysc_dspn.setValue(float(self.list_settings[setting].value("ysc_value")))
-            self.ui_modify_scale_zsc_dspn.setValue(float(self.list_settings[setting].value("zsc_value")))
-            self.ui_modify_scale_xc_dspn.setValue(float(self.list_settings[setting].value("xc_value")))
-            self.ui_modify_scale_yc_dspn.setValue(float(self.list_settings[setting].value("yc_value")))
-            self.ui_modify_scale_zc_dspn.setValue(float(self.list_settings[setting].value("zc_value")))
-            self.list_settings[setting].endGroup()
-
-            self.list_settings[setting].beginGroup("te")
-            self.ui_modify_te_chk.setChecked(dct[self.list_settings[setting].value("checkbox")])
-            self.ui_modify_te_rbtn.setChecked(dct[self.list_settings[setting].value("te_option")])
-            self.ui_modify_te_ibl_rbtn.setChecked(dct[self.list_settings[setting].value("te_ibl_option")])
-            self.ui_modify_te_d_dspn.setValue(float(self.list_settings[setting].value("d_value")))
-            self.ui_modify_te_zref_dspn.setValue(float(self.list_settings[setting].value("z-ref_value")))
-            self.ui_modify_te_gamma_dspn.setValue(float(self.list_settings[setting].value("gamma_value")))
-
-            self.ui_modify_te_round_chk.setChecked(dct[self.list_settings[setting].value("round_checkbox")])
-            self.ui_modify_te_round_dpsn.setValue(float(self.list_settings[setting].value("round_value")))
+            with settings.inGroup("read_panel"):
+                self.ui_read_ibl_iblfile_edit.setText(settings.value("ibl_file"))
+                self.ui_read_ibl_fpfile_edit.setText(settings.value("fp_file"))
+
+                self.ui_read_cftgeo_rbtn.setChecked(dct[settings.value("cft_option")])
+                self.ui_read_cftgeo_cftfile_edit.setText(settings.value("cft_file"))
+                self.ui_read_cftgeo_nblades_spn.setValue(int(settings.value("cft_nblades")))
+                self.ui_read_cftgeo_angle_dspn.setValue(float(settings.value("cft_angle")))
+
+                self.ui_working_path_edit.setText(settings.value("working_path"))
+                self.ui_case_name_edit.setText(settings.value("case_name"))
+
+            with settings.inGroup("modify_panel"):
+                with settings.inGroup("scale"):
+                    self.ui_modify_scale_chk.setChecked(dct[settings.value("checkbox")])
+                    self.ui_modify_scale_xsc_dspn.setValue(float(settings.value("xsc_value")))
+                    self.ui_modify_scale_ysc_dspn.setValue(float(settings.value("ysc_value")))
+                    self.ui_modify_scale_zsc_dspn.setValue(float(settings.value("zsc_value")))
+                    self.ui_modify_scale_xc_dspn.setValue(float(settings.value("xc_value")))
+                    self.ui_modify_scale_yc_dspn.setValue(float(settings.value("yc_value")))
+                    self.ui_modify_scale_zc_dspn.setValue(float(settings.value("zc_value")))
+
+                with settings.inGroup("te"):
+                    self.ui_modify_te_chk.setChecked(dct[settings.value("checkbox")])
+                    self.ui_modify_te_rbtn.setChecked(dct[settings.value("te_option")])
+                    self.ui_modify_te_ibl_rbtn.setChecked(dct[settings.value("te_ibl_option")])
+                    self.ui_modify_te_d_dspn.setValue(float(settings.value("d_value")))
+                    self.ui_modify_te_zref_dspn.setValue(float(settings.value("z-ref_value")))
+                    self.ui_modify_te_gamma_dspn.setValue(float(settings.value("gamma_value")))
+
+                    self.ui_modify_te_round_chk.setChecked(dct[settings.value("round_checkbox")])
+                    self.ui_modify_te_round_dpsn.setValue(float(settings.value("round_value")))
+
+                self.ui_modify_streams_chk.setChecked(dct[settings.value("streams/checkbox")])
+                self.ui_modify_streams_opt_combo.setCurrentIndex(int(settings.value("streams/opt_combo")))
+                self.ui_modify_streams_input_combo.setEditText(settings.value("streams/input"))
 
-            self.list_settings[setting].endGroup()
-
-            self.ui_modify_streams_chk.setChecked(dct[self.list_settings[setting].value("streams/checkbox")])
-            self.ui_modify_streams_opt_combo.setCurrentIndex(int(self.list_settings[setting].value("streams/opt_combo")))
-            self.ui_modify_streams_input_combo.setEditText(self.list_settings[setting].value("streams/input"))
-
-            try:
-                self.ui_modify_streams_input_combo.addItems(self.list_settings[setting].value("streams/inputlist"))
-            except TypeError:
-                pass
-
-            self.list_settings[setting].endGroup()
+                try:
+                    self.ui_modify_streams_input_combo.addItems(settings.value("streams/inputlist"))
+                except TypeError:
+                    pass
 
-            self.list_settings[setting].beginGroup("output_panel")
-            self.ui_output_igs_surf_chk.setChecked(dct[self.list_settings[setting].value("igs_surf/checkbox")])
-            self.ui_output_igs_surf_opt_combo.setCurrentIndex(int(self.list_settings[setting].value("igs_surf/opt_combo")))
+            with settings.inGroup("output_panel"):
+                self.ui_output_igs_surf_chk.setChecked(dct[settings.value("igs_surf/checkbox")])
+                self.ui_output_igs_surf_opt_combo.setCurrentIndex(int(settings.value("igs_surf/opt_combo")))
 
-            self.ui_output_igs_surf_rail_combo.clear()
-            try:
-                self.ui_output_igs_surf_rail_combo.addItems(self.list_settings[setting].value("igs_surf/rail_combo"))
-            except TypeError:
-                pass
-            self.ui_output_heighv_chk.setChecked(dct[self.list_settings[setting].value("heighv/checkbox")])
-            self.ui_output_heighv_hvar_spn.setValue(int(self.list_settings[setting].value("heighv/hvar_value")))
+                self.ui_output_igs_surf_rail_combo.clear()
+                try:
+                    self.ui_output_igs_surf_rail_combo.addItems(settings.value("igs_surf/rail_combo"))
+                except TypeError:
+                    pass
+                self.ui_output_heighv_chk.setChecked(dct[settings.value("heighv/checkbox")])
+                self.ui_output_heighv_hvar_spn.setValue(int(settings.value("heighv/hvar_value")))
 
-            self.ui_output_igs_cur_3d_chk.setChecked(dct[self.list_settings[setting].value("igs_cur_3d/checkbox")])
-            self.ui_output_igs_cur_3d_opt_combo.setCurrentIndex(
-                int(self.list_settings[setting].value("igs_cur_3d/opt_combo")))
+                self.ui_output_igs_cur_3d_chk.setChecked(dct[settings.value("igs_cur_3d/checkbox")])
+                self.ui_output_igs_cur_3d_opt_combo.setCurrentIndex(
+                    int(settings.value("igs_cur_3d/opt_combo")))
 
-            self.ui_output_igs_cur_2d_chk.setChecked(dct[self.list_settings[setting].value("igs_cur_2d/checkbox")])
-            self.ui_output_igs_cur_2d_opt_combo.setCurrentIndex(
-                int(self.list_settings[setting].value("igs_cur_2d/opt_combo")))
+                self.ui_output_igs_cur_2d_chk.setChecked(dct[settings.value("igs_cur_2d/checkbox")])
+                self.ui_output_igs_cur_2d_opt_combo.setCurrentIndex(
+                    int(settings.value("igs_cur_2d/opt_combo")))
 
-            self.ui_output_cft_chk.setChecked(dct[self.list_settings[setting].value("cft/checkbox")])
-            self.ui_output_cft_nsect_spn.setValue(int(self.list_settings[setting].value("cft/nsect")))
-            self.ui_output_cft_angle_dspn.setValue(float(self.list_settings[setting].value("cft/angle")))
+                self.ui_output_cft_chk.setChecked(dct[settings.value("cft/checkbox")])
+                self.ui_output_cft_nsect_spn.setValue(int(settings.value("cft/nsect")))
+                self.ui_output_cft_angle_dspn.setValue(float(settings.value("cft/angle")))
 
-            self.ui_output_rtzt_chk.setChecked(dct[self.list_settings[setting].value("rtzt/checkbox")])
-            self.ui_output_rtzt_npoints_spn.setValue(int(self.list_settings[setting].value("rtzt/npoints")))
-            self.ui_output_rtzt_thickness_dpsn.setValue(float(self.list_settings[setting].value("rtzt/thickness")))
+                self.ui_output_rtzt_chk.setChecked(dct[settings.value("rtzt/checkbox")])
+                self.ui_output_rtzt_npoints_spn.setValue(int(settings.value("rtzt/npoints")))
+                self.ui_output_rtzt_thickness_dpsn.setValue(float(settings.value("rtzt/thickness")))
 
-            self.ui_output_streamc_chk.setChecked(dct[self.list_settings[setting].value("streamc/checkbox")])
-            self.ui_output_streamc_npoints_spn.setValue(int(self.list_settings[setting].value("streamc/npoints")))
-            self.ui_output_streamc_extension_dspn.setValue(float(self.list_settings[setting].value("streamc/extension")))
+                self.ui_output_streamc_chk.setChecked(dct[settings.value("streamc/checkbox")])
+                self.ui_output_streamc_npoints_spn.setValue(int(settings.value("streamc/npoints")))
+                self.ui_output_streamc_extension_dspn.setValue(float(settings.value("streamc/extension")))
 
-            self.ui_output_igs_pnts2cur_chk.setChecked(dct[self.list_settings[setting].value("igs_pnts2cur/checkbox")])
-            self.ui_output_igs_pnts2cur_file_edit.setText(self.list_settings[setting].value("igs_pnts2cur/file"))
+                self.ui_output_igs_pnts2cur_chk.setChecked(dct[settings.value("igs_pnts2cur/checkbox")])
+                self.ui_output_igs_pnts2cur_file_edit.setText(settings.value("igs_pnts2cur/file"))
 
-            self.ui_output_igs_pnts2pnts_chk.setChecked(dct[self.list_settings[setting].value("igs_pnts2pnts/checkbox")])
-            self.ui_output_igs_pnts2pnts_file_edit.setText(self.list_settings[setting].value("igs_pnts2pnts/file"))
+                self.ui_output_igs_pnts2pnts_chk.setChecked(dct[settings.value("igs_pnts2pnts/checkbox")])
+                self.ui_output_igs_pnts2pnts_file_edit.setText(settings.value("igs_pnts2pnts/file"))
 
-            self.ui_output_mappnts_chk.setChecked(dct[self.list_settings[setting].value("mappnts/checkbox")])
-            self.ui_output_mappnts_pointsfile_edit.setText(self.list_settings[setting].value("mappnts/pointsfile"))
-            self.ui_output_mappnts_streamcurvefile_edit.setText(
-                self.list_settings[setting].value("mappnts/streamcurvefile"))
+                self.ui_output_mappnts_chk.setChecked(dct[settings.value("mappnts/checkbox")])
+                self.ui_output_mappnts_pointsfile_edit.setText(settings.value("mappnts/pointsfile"))
+                self.ui_output_mappnts_streamcurvefile_edit.setText(
+                    settings.value("mappnts/streamcurvefile"))
 
-            self.ui_output_stackcur_chk.setChecked(dct[self.list_settings[setting].value("stackcur/checkbox")])
-            self.ui_output_stackcur_stackpos_dspn.setValue(float(self.list_settings[setting].value("stackcur/stackpos")))
-            self.ui_output_stackcur_opt_combo.setCurrentIndex(int(self.list_settings[setting].value("stackcur/opt_combo")))
+                self.ui_output_stackcur_chk.setChecked(dct[settings.value("stackcur/checkbox")])
+                self.ui_output_stackcur_stackpos_dspn.setValue(float(settings.value("stackcur/stackpos")))
+                self.ui_output_stackcur_opt_combo.setCurrentIndex(int(settings.value("stackcur/opt_combo")))
 
-            self.ui_output_tecur_chk.setChecked(dct[self.list_settings[setting].value("te-cur/checkbox")])
-            self.ui_output_tecur_npoints_spn.setValue(int(self.list_settings[setting].value("te-cur/npoints")))
+                self.ui_output_tecur_chk.setChecked(dct[settings.value("te-cur/checkbox")])
+                self.ui_output_tecur_npoints_spn.setValue(int(settings.value("te-cur/npoints")))
 
-            self.ui_output_lecur_chk.setChecked(dct[self.list_settings[setting].value("le-cur/checkbox")])
-            self.ui_output_lecur_npoints_spn.setValue(int(self.list_settings[setting].value("le-cur/npoints")))
+                self.ui_output_lecur_chk.setChecked(dct[settings.value("le-cur/checkbox")])
+                self.ui_output_lecur_npoints_spn.setValue(int(settings.value("le-cur/npoints")))
 
-            self.ui_output_camberangles_chk.setChecked(dct[self.list_settings[setting].value("camberangles/checkbox")])
-            self.ui_output_camberangles_opt_combo.setCurrentIndex(int(self.list_settings[setting].value("camberangles/"
+                self.ui_output_camberangles_chk.setChecked(dct[settings.value("camberangles/checkbox")])
+                self.ui_output_camberangles_opt_combo.setCurrentIndex(int(settings.value("camberangles/"
                                                                                                         "opt_combo")))
 
-            self.ui_output_tecplot_2d_chk.setChecked(dct[self.list_settings[setting].value("tecplot_2d/checkbox")])
-            self.ui_output_tecplot_3d_chk.setChecked(dct[self.list_settings[setting].value("tecplot_3d/checkbox")])
-            self.ui_output_tecplot_streams_chk.setChecked(
-                dct[self.list_settings[setting].value("tecplot_streams/checkbox")])
+                self.ui_output_tecplot_2d_chk.setChecked(dct[settings.value("tecplot_2d/checkbox")])
+                self.ui_output_tecplot_3d_chk.setChecked(dct[settings.value("tecplot_3d/checkbox")])
+                self.ui_output_tecplot_streams_chk.setChecked(
+                    dct[settings.value("tecplot_streams/checkbox")])
 
-            self.ui_output_sweepangle_chk.setChecked(dct[self.list_settings[setting].value("sweepangle/checkbox")])
-            self.ui_output_autogrid_chk.setChecked(dct[self.list_settings[setting].value("autogrid/checkbox")])
-            self.ui_output_tepos_chk.setChecked(dct[self.list_settings[setting].value("tepos/checkbox")])
-
-            self.list_settings[setting].endGroup()
+                self.ui_output_sweepangle_chk.setChecked(dct[settings.value("sweepangle/checkbox")])
+                self.ui_output_autogrid_chk.setChecked(dct[settings.value("autogrid/checkbox")])
+                self.ui_output_tepos_chk.setChecked(dct[settings.value("tepos/checkbox")])
 
         except KeyError:
             message_error = "The pre-defined settings probably accepted a new member. Redefine this setting"
             QtGui.QMessageBox.about(self, "Warning", message_error)
 
-        finally:
-            # Clean-up tasks. Closes all possible opened groups
-
-            while self.list_settings[setting].group() is not "":
-                self.list_settings[setting].endGroup()
-                print(self.list_settings[setting].group())
-
-
         self.generateInput()
 
     def quickListFunction(self):
@@ -1566,6 +1567,8 @@ class InputWriterWindow(QtGui.QMainWindow, inputfile_writerUI.Ui_MainWindow):
         self.list_settings[setting].setValue("tepos/checkbox", self.ui_output_tepos_chk.isChecked())
         self.list_settings[setting].endGroup()
 
+        self.settings_snapshots[setting].refresh()
+
     def _setGUIMenus(self):
         """
         This function setups the GUI menu.
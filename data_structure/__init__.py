@@ -1,6 +1,6 @@
 """@package data_structure
 
-Package that contains the two files that coordinates the structure of data in BladePy.
+Package that contains the files that coordinates the structure of data in BladePy.
 
 \arg \c data_structure.case_node File that contains the class data_structure.case_node.CaseNode. Every data of each case
 will be stored in a Node. When modifying any display characteristic, the data will be retrieved and saved from and to
@@ -11,4 +11,18 @@ QtCore.QAbstractItemModel. It defines the standard interface that item models mu
 with other components in the model/view architecture. The functioning principle of this class can be a bit
 complex and further search on how this works is highly recommended
 
+\arg \c data_structure.case_files File that contains the functions for finding the output files of BladePro cases.
+
+\arg \c data_structure.case_session File that contains the functions for saving and reading sessions, the loaded cases
+with their display state.
+
+\arg \c data_structure.case_watcher File that contains the class data_structure.case_watcher.CaseWatcher, which watches
+the outputs of the loaded cases so modified outputs are loaded again.
+
+\arg \c data_structure.case_summary File that contains the functions for summarizing the cases of a directory tree as
+JSON without the GUI, e.g. for regression checks of BladePro outputs.
+
+\arg \c data_structure.load_profiler File that contains the class data_structure.load_profiler.LoadProfiler, which
+records timing spans of the phases of loading cases.
+
 """
\ No newline at end of file
@@ -0,0 +1,100 @@
+"""@package data_structure.case_files
+
+File that contains the functions for finding the output files of BladePro cases.
+
+A BladePro case is identified by its case name, which is the name of its output files up to the first dot. The
+functions here are the single place where the output file names are defined, so Core.BladePyCore.addCase() and the
+tools that run without the GUI find the same files.
+
+"""
+
+import os
+
+## Suffixes of the BladePro outputs displayed by BladePy for each output type. "step_ref" is not a BladePro output,
+# but a reference geometry delivered in STEP with the same case name. When more than one suffix is given for
+# a type, the first existing file is used, e.g. a .igs surface file is used if there is no .surf.igs file.
+case_output_suffixes = {"tecplot": [".2d.tec.dat"],
+                        "igs_surf": [".surf.igs", ".igs"],
+                        "igs_3d_cur": [".cur.igs"],
+                        "igs_2d_cur": [".mpth.igs"],
+                        "step_ref": [".stp", ".step"]}
+
+
+def findCaseOutputs(working_path, case_name, output_types=None):
+    """
+    Finds the existing output files of a case.
+
+    @param working_path [str] Directory of the case
+    @param case_name [str] Name of the case
+    @param output_types [list] Output types to look for, keys of case_output_suffixes. None looks for all of them
+    @return [dict] Dictionary of output type to file path. Types without an existing file are not included
+    """
+    if output_types is None:
+        output_types = case_output_suffixes.keys()
+
+    case_outputs = {}
+
+    for output_type in output_types:
+        for suffix in case_output_suffixes[output_type]:
+            output_file_path = os.path.join(working_path, case_name) + suffix
+
+            if os.path.isfile(output_file_path):
+                case_outputs[output_type] = output_file_path
+                break
+
+    return case_outputs
+
+
+def caseOutputCandidates(working_path, case_name, output_types=None):
+    """
+    Lists the paths where the output files of a case would be, whether they exist or not.
+
+    @param working_path [str] Directory of the case
+    @param case_name [str] Name of the case
+    @param output_types [list] Output types, keys of case_output_suffixes. None lists all of them
+    @return [dict] Dictionary of output type to the list of its possible paths, in the order findCaseOutputs() tries
+    them
+    """
+    if output_types is None:
+        output_types = case_output_suffixes.keys()
+
+    return dict((output_type, [os.path.join(working_path, case_name) + suffix
+                               for suffix in case_output_suffixes[output_type]])
+                for output_type in output_types)
+
+
+def caseNameOf(file_name):
+    """
+    Returns the case name of a BladePro output file.
+
+    @param file_name [str] Name of the file, without directory
+    @return [str] The case name, or None if the file is not a recognized output
+    """
+    for suffixes in case_output_suffixes.values():
+        for suffix in suffixes:
+            if file_name.endswith(suffix) and '.' in file_name:
+                return file_name[:file_name.index('.')]
+
+    return None
+
+
+def findCaseNames(directory):
+    """
+    Finds the names of the cases that have at least one recognized output in a directory.
+
+    @param directory [str] Directory to be scanned
+    @return [list] Sorted list of case names
+    """
+    case_names = set()
+
+    try:
+        list_dir = os.listdir(directory)
+    except OSError:
+        return []
+
+    for file_name in list_dir:
+        case_name = caseNameOf(file_name)
+        if case_name:
+            case_names.add(case_name)
+
+    return sorted(case_names)
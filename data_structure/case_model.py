@@ -3,8 +3,11 @@
 File that contains the class CaseModel that creates a model for the Case treeview list.
 
 """
+import weakref
+
 from PyQt4 import QtCore, QtGui
 from occ_modules.shape_properties import shape_colorlist, shape_colordictionary, shape_colordictionaryhex
+from data_structure.case_node import CaseNode, CaseGroupNode
 
 class CaseModel(QtCore.QAbstractItemModel):
     """
@@ -15,15 +18,187 @@ class CaseModel(QtCore.QAbstractItemModel):
     supposed to be instantiated directly. Instead, you should subclass it to create new models. This model will be
     the one used by a a data_structure.case_node.CaseNode object.
 
+    Cases are added by appendCase() and deleted by removeRows(), which notify the views of the inserted and removed
+    rows. The model is created once, so views, selections and mappers bound to it are kept when cases come and go.
+
+    Cases can be grouped, e.g. by working directory, with appendGroup(). A group only knows the names of its cases
+    until the user expands it. Then the view asks for its rows through canFetchMore() and fetchMore(), which load
+    fetch_batch_size cases at a time by the case loader set with setCaseLoader().
+
     When subclassing QAbstractItemModel, at the very least you must implement index(), parent(), rowCount(),
     columnCount(), and data(). These functions are used in all read-only models, and form the basis of editable
     models. More info: http://doc.qt.io/qt-5/qabstractitemmodel.html#details
 
+    The views call data() for every visible cell at each repaint, so the values shown for a node are read once into a
+    tuple and kept until the node changes, and the color icons are created once for each color. The tuple of a node is
+    dropped by setData(), by every dataChanged signal of its row and by invalidateNode(), which must be called when a
+    node is modified without going through the model.
+
     """
 
+    ## Number of cases of a group loaded by each fetchMore()
+    fetch_batch_size = 10
+
+    ## Decoration icons of the cases, by index of occ_modules.shape_properties.shape_colorlist
+    _color_icons = {}
+
     def __init__(self, root, parent=None):
         super(CaseModel, self).__init__(parent)
         self._rootNode = root
+        self._case_loader = None
+
+        # Groups whose cases are being loaded by fetchMore()
+        self._fetching_groups = set()
+
+        # Removed nodes are dropped from the cache with them
+        self._display_cache = weakref.WeakKeyDictionary()
+        self._group_icon = None
+
+        self.dataChanged.connect(self._dataChangedInvalidate)
+
+    def invalidateNode(self, node):
+        """
+        Drops the cached display values of a node, so they are read again from it at the next repaint.
+
+        @param node [CaseNode] The modified node
+        @return None
+        """
+        self._display_cache.pop(node, None)
+
+    def _dataChangedInvalidate(self, top_left, bottom_right):
+        """
+        Drops the cached display values of the rows of a dataChanged signal.
+        """
+        for index in (top_left, bottom_right):
+            if index.isValid():
+                self.invalidateNode(index.internalPointer())
+
+        if top_left.isValid() and bottom_right.isValid() and top_left.parent() == bottom_right.parent():
+            parent_node = self.getNode(top_left.parent())
+
+            for row in range(top_left.row() + 1, bottom_right.row()):
+                self.invalidateNode(parent_node.child(row))
+
+    def _displayData(self, node):
+        """
+        Returns the values shown for a node, by column, reading them from the node only if they are not cached.
+
+        @param node [CaseNode] The node
+        @return [tuple] The values of the columns
+        """
+        display_data = self._display_cache.get(node)
+
+        if display_data is not None:
+            return display_data
+
+        if node.isGroup():
+            display_data = (node.name(),
+                            "%d/%d cases" % (node.childCount(), node.caseCount()))
+        else:
+            transformation = node.shapeTransformation()
+
+            display_data = (node.name(),
+                            node.tecplotMode() if node.tecplotIsVisible() else "hidden",
+                            None,
+                            node.shapeQuality(),
+                            node.shapeTransparency(),
+                            node.shapeColor(),
+                            transformation[0],
+                            transformation[1],
+                            transformation[2],
+                            transformation[3],
+                            transformation[4])
+
+        self._display_cache[node] = display_data
+
+        return display_data
+
+    def _decorationIcon(self, node):
+        """
+        Returns the icon of a node, a folder for groups and a square of the shape color for cases.
+
+        @param node [CaseNode] The node
+        @return [QtGui.QIcon] The icon
+        """
+        if node.isGroup():
+            if self._group_icon is None:
+                self._group_icon = QtGui.QApplication.style().standardIcon(QtGui.QStyle.SP_DirIcon)
+
+            return self._group_icon
+
+        color = node.shapeColor()
+
+        if color not in self._color_icons:
+            pixmap = QtGui.QPixmap(26, 26)
+            pixmap.fill(shape_colordictionaryhex[shape_colorlist[color]])
+            self._color_icons[color] = QtGui.QIcon(pixmap)
+
+        return self._color_icons[color]
+
+    def setCaseLoader(self, case_loader):
+        """
+        Sets the function that loads the cases of groups when they are expanded.
+
+        @param case_loader [function] Function called as case_loader(working_path, case_name, parent_index). It must
+        add the case through appendCase(), e.g. Core.BladePyCore.addCase
+        @return None
+        """
+        self._case_loader = case_loader
+
+    def hasChildren(self, parent=QtCore.QModelIndex()):
+        """
+        Returns whether the item has children. Groups have children even before their cases are loaded, so the view
+        shows them as expandable.
+        ref: http://pyqt.sourceforge.net/Docs/PyQt4/qabstractitemmodel.html#hasChildren
+
+        """
+        node = self.getNode(parent)
+
+        if node.isGroup():
+            return node.caseCount() > 0
+
+        return node.childCount() > 0
+
+    def canFetchMore(self, parent):
+        """
+        Returns whether there are cases of a group not loaded yet.
+        ref: http://pyqt.sourceforge.net/Docs/PyQt4/qabstractitemmodel.html#canFetchMore
+
+        """
+        node = self.getNode(parent)
+
+        return node.isGroup() and bool(node.pendingCaseNames()) and self._case_loader is not None and \
+            node not in self._fetching_groups
+
+    def fetchMore(self, parent):
+        """
+        Loads the next batch of cases of a group. Each case is inserted in the model by the case loader.
+        ref: http://pyqt.sourceforge.net/Docs/PyQt4/qabstractitemmodel.html#fetchMore
+
+        The case loader processes events while the shapes are read, so the view may ask for more cases of the same group
+        before it returns. Those requests are ignored until the batch is loaded. A case is only taken out of the pending
+        list once it is loaded, so the group keeps counting it meanwhile.
+
+        """
+        node = self.getNode(parent)
+
+        if node in self._fetching_groups:
+            return
+
+        self._fetching_groups.add(node)
+
+        try:
+            for case_name in node.pendingCaseNames()[:self.fetch_batch_size]:
+                try:
+                    self._case_loader(node.workingPath(), case_name, parent)
+                finally:
+                    # Cases without outputs are not added, they are dropped from the group as well
+                    node.removePendingCaseName(case_name)
+
+                # The group column shows how many cases were loaded
+                self.dataChanged.emit(parent.sibling(parent.row(), 0), parent.sibling(parent.row(), 1))
+        finally:
+            self._fetching_groups.discard(node)
 
     def rowCount(self, parent):
         """
@@ -55,51 +230,15 @@ class CaseModel(QtCore.QAbstractItemModel):
 
         node = index.internalPointer()
 
-
         if role == QtCore.Qt.DisplayRole or role == QtCore.Qt.EditRole:
-            if index.column() == 0:
-                return node.name()
-
-            if index.column() == 1:
-                if node.tecplotIsVisible():
-                    return node.tecplotMode()
-                else:
-                    return "hidden"
-
-            if index.column() == 3:
-                return node.shapeQuality()
-
-            if index.column() == 4:
-                return node.shapeTransparency()
-
-            if index.column() == 5:
-                return node.shapeColor()
-
-            if index.column() == 6:
-                return node.shapeTransformation()[0]
-
-            if index.column() == 7:
-                return node.shapeTransformation()[1]
-
-            if index.column() == 8:
-                return node.shapeTransformation()[2]
-
-            if index.column() == 9:
-                return node.shapeTransformation()[3]
-
-            if index.column() == 10:
-                return node.shapeTransformation()[4]
-
-
+            display_data = self._displayData(node)
 
+            if index.column() < len(display_data):
+                return display_data[index.column()]
 
         if role == QtCore.Qt.DecorationRole:
             if index.column() == 0:
-                pixmap = QtGui.QPixmap(26, 26)
-                pixmap.fill(shape_colordictionaryhex[shape_colorlist[node.shapeColor()]])
-                icon = QtGui.QIcon(pixmap)
-                return icon
-
+                return self._decorationIcon(node)
 
     def setData(self, index, value, role=QtCore.Qt.EditRole):
         """
@@ -132,6 +271,7 @@ class CaseModel(QtCore.QAbstractItemModel):
                 if index.column() == 10:
                     node.setShapeTransformation(value, 4)
 
+                self.invalidateNode(node)
                 self.dataChanged.emit(index, index)
                 return True
 
@@ -186,6 +326,18 @@ class CaseModel(QtCore.QAbstractItemModel):
         else:
             return QtCore.QModelIndex()
 
+    def nodeIndex(self, node):
+        """
+        Returns the index of the first column of a node.
+
+        @param node [CaseNode] A node of the model
+        @return [QtCore.QModelIndex] The index. The root node has an invalid index
+        """
+        if node is self._rootNode or node.parent() is None:
+            return QtCore.QModelIndex()
+
+        return self.createIndex(node.row(), 0, node)
+
     def getNode(self, index):
 
         if index.isValid():
@@ -194,6 +346,44 @@ class CaseModel(QtCore.QAbstractItemModel):
                 return node
         return self._rootNode
 
+    def appendGroup(self, name, working_path, case_names, parent=QtCore.QModelIndex()):
+        """
+        Method for creating a group of cases as the last child of a node. The cases are not loaded.
+
+        @param name [str] Name of the group
+        @param working_path [str] Directory of the cases
+        @param case_names [list] Names of the cases of the group
+        @param parent [QtCore.QModelIndex] Index of the parent node. An invalid index is the root node
+        @return [CaseGroupNode] The created group node
+        """
+        parent_node = self.getNode(parent)
+        position = parent_node.childCount()
+
+        self.beginInsertRows(parent, position, position)
+        group_node = CaseGroupNode(name, working_path, case_names, parent_node)
+        self.endInsertRows()
+
+        return group_node
+
+    def appendCase(self, name, shape=None, subshape_names=None, plot_lists=None, topods_shapes=None,
+                   parent=QtCore.QModelIndex()):
+        """
+        Method for creating a CaseNode as the last child of a node, notifying the views of the new row.
+
+        The arguments are the ones of data_structure.case_node.CaseNode.
+
+        @param parent [QtCore.QModelIndex] Index of the parent node. An invalid index is the root node
+        @return [CaseNode] The created case node
+        """
+        parent_node = self.getNode(parent)
+        position = parent_node.childCount()
+
+        self.beginInsertRows(parent, position, position)
+        case_node = CaseNode(name, shape, subshape_names, plot_lists, parent_node, topods_shapes)
+        self.endInsertRows()
+
+        return case_node
+
     def removeRows(self, position, rows, parent=QtCore.QModelIndex()):
         """
         Method for removing rows from the data structure
@@ -208,4 +398,8 @@ class CaseModel(QtCore.QAbstractItemModel):
 
         self.endRemoveRows()
 
+        # The group column shows how many cases are left
+        if parent_node.isGroup():
+            self.dataChanged.emit(parent.sibling(parent.row(), 0), parent.sibling(parent.row(), 1))
+
         return success
\ No newline at end of file
@@ -1,11 +1,13 @@
 """@package data_structure.case_node
 
-File that contains the class CaseNode to structure all data loaded in BladePy.
+File that contains the classes CaseNode and CaseGroupNode to structure all data loaded in BladePy.
 
 """
 
-from PyQt4 import QtCore
 from occ_modules.shape_properties import shape_colorlist
+from occ_modules.subshape_names import subShapeCategory
+from occ_modules.shape_registry import uniqueShapes
+from settings.settings_snapshot import mainSettings
 import configparser
 
 
@@ -19,7 +21,7 @@ class CaseNode(object):
     The model used to represent a CaseNode is an case_model.CaseModel object.
 
     """
-    def __init__(self, name, shape=None, subshape_names=None, plot_lists=None, parent=None):
+    def __init__(self, name, shape=None, subshape_names=None, plot_lists=None, parent=None, topods_shapes=None):
         """
         The constructor of the class.
 
@@ -30,6 +32,7 @@ class CaseNode(object):
         @param plot_lists [list] List of lists of graphics generated by TecplotReader
         @param subshape_names [list] List of strings of sub-shapes names.
         @param parent [CaseNode] Is a CaseNode object itself. It is the parent of the node.
+        @param topods_shapes [list] List of TopoDS_Shape of sub-shapes, used to build the not yet built AIS_Shapes
 
         """
 
@@ -38,7 +41,14 @@ class CaseNode(object):
         self._name = name
         self._tecplot_lists = plot_lists
         self._h_aisshape = shape
+        self._topods_shape = topods_shapes
+        self._wheel_instances = []
+        self._h_aisgroup = None
+        self._location_overrides = set()
+        self._subshape_bvh = None
         self._supshape_names = subshape_names
+        self._subshape_index = None
+        self._case_outputs = {}
         self._parent = parent
         case_count = 0
 
@@ -46,35 +56,30 @@ class CaseNode(object):
             case_count = parent.childCount()
         except AttributeError:
             pass
-        # loading the default settings.
-        list_settings = []
-
-        last_settings = QtCore.QSettings("BladePy", "BladePy\MainApp\LastMainOptions".format(number=1))
-        user_settings = [QtCore.QSettings("BladePy", "BladePy\MainApp\Options{number}".format(number=1))]
-
-        list_settings.append(last_settings)
-        list_settings.extend(user_settings)
-
-        list_settings[1].beginGroup("shapes_settings")
-
-        self._transformation = list_settings[1].value("default_transformation")
-        self._transparency = float(list_settings[1].value("default_shape_transparency"))
-        self._color = (int(list_settings[1].value("default_shape_color")) + case_count) % len(shape_colorlist)
-        self._quality = float(list_settings[1].value("default_shape_quality"))
+        # loading the default settings. They are read from the snapshot shared by the application, so creating a case
+        # does not read the settings file.
+        settings = mainSettings()
+
+        with settings.inGroup("shapes_settings"):
+            default_transformation = settings.value("default_transformation")
+            default_transparency = settings.floatValue("default_shape_transparency")
+            default_color = (settings.intValue("default_shape_color") + case_count) % len(shape_colorlist)
+            default_quality = settings.floatValue("default_shape_quality")
+
+        # The case and each sub-shape get their own transformation list, as the lists are modified in place
+        self._transformation = list(default_transformation)
+        self._transparency = default_transparency
+        self._color = default_color
+        self._quality = default_quality
 
         try:
             for i in self._h_aisshape:
-                self.subshape.append([(list_settings[1].value("default_transformation")),
-                                      float(list_settings[1].value("default_shape_transparency")),
-                                      (int(list_settings[1].value("default_shape_color")) + case_count) % len(
-                                          shape_colorlist),
-                                      float(list_settings[1].value("default_shape_quality"))])
+                self.subshape.append([list(default_transformation), default_transparency, default_color,
+                                      default_quality])
 
         except TypeError:
             pass
 
-        list_settings[1].endGroup()
-
         # if list not empty, tecplot mode is standard
         
         if self._tecplot_lists:  
@@ -105,6 +110,138 @@ class CaseNode(object):
         """
         return self._h_aisshape
 
+    def setSubShapeHAIS(self, index, h_ais_shape):
+        """
+        Method for setting the handle of AIS_Shape of a sub-shape built after the case was loaded
+
+        @param index [int] Index of the sub-shape in the case
+        @param h_ais_shape [Handle_AIS_InteractiveObject] The AIS_shape Handle.
+        @return None
+        """
+        self._h_aisshape[index] = h_ais_shape
+
+    def replaceSubShapes(self, start, count, h_ais_shapes, subshape_names, topods_shapes, subshape_refs):
+        """
+        Method for replacing a range of sub-shapes, e.g. the ones of a reloaded file
+
+        The rows after the range are shifted. The sub-shape name index, the bounding volume hierarchy and the location
+        overrides are reset, so the caller must set the locations of the sub-shapes again.
+
+        @param start [int] Index of the first replaced sub-shape
+        @param count [int] Number of replaced sub-shapes
+        @param h_ais_shapes [list] Handles of the AIS_Shapes of the new sub-shapes, None for not built ones
+        @param subshape_names [list] Names of the new sub-shapes
+        @param topods_shapes [list] TopoDS_Shape of the new sub-shapes
+        @param subshape_refs [list] Properties of the new sub-shapes, in the format of the subshape attribute
+        @return None
+        """
+        self._h_aisshape[start:start + count] = h_ais_shapes
+        self._supshape_names[start:start + count] = subshape_names
+        self._topods_shape[start:start + count] = topods_shapes
+        self.subshape[start:start + count] = subshape_refs
+
+        self._subshape_index = None
+        self._subshape_bvh = None
+        self._location_overrides.clear()
+
+    def subShapeRows(self, key):
+        """
+        Method for finding sub-shapes by name.
+
+        The key can be the name as listed in the GUI ("file - name"), the name as in the file or a category of
+        sub-shapes, e.g. "STREAM" for all stream sub-shapes. See occ_modules.subshape_names.subShapeCategory(). The
+        index is a dictionary built the first time it is needed.
+
+        @param key [str] Name or category of the sub-shapes
+        @return [list] Indexes of the sub-shapes, same as the rows in ui_subcase_list
+        """
+        if self._subshape_index is None:
+            self._subshape_index = {}
+
+            for row, name in enumerate(self._supshape_names or []):
+                name_subshape = name.partition(" - ")[2]
+
+                for index_key in {name, name_subshape, subShapeCategory(name_subshape)}:
+                    self._subshape_index.setdefault(index_key, []).append(row)
+
+        return self._subshape_index.get(key, [])
+
+    def subShapeHAIS(self, key):
+        """
+        Method for retrieving the handles of the already built AIS_Shapes of the sub-shapes found by subShapeRows()
+
+        @param key [str] Name or category of the sub-shapes
+        @return [list] List of Handle_AIS_InteractiveObject. Curves merged in one compound return its handle once
+        """
+        return uniqueShapes(self._h_aisshape[row] for row in self.subShapeRows(key))
+
+    def shapeTopoDS(self):
+        """
+        Method for retrieving the TopoDS_Shape of every sub-shape of the node
+
+        @return [list] List of TopoDS_Shape
+        """
+        return self._topods_shape
+
+    def shapeGroup(self):
+        """
+        Method for retrieving the handle of the parent object that groups the sub-shapes of the case
+
+        @return [Handle_AIS_InteractiveObject] The handle of the AIS_MultipleConnectedInteractive group
+        """
+        return self._h_aisgroup
+
+    def setShapeGroup(self, h_ais_group):
+        """
+        Method for setting the handle of the parent object that groups the sub-shapes of the case
+
+        @param h_ais_group [Handle_AIS_InteractiveObject] The handle of the AIS_MultipleConnectedInteractive group
+        @return None
+        """
+        self._h_aisgroup = h_ais_group
+
+    def locationOverrides(self):
+        """
+        Method for retrieving the indexes of the sub-shapes that have a location of their own inside the case group
+
+        @return [set] Set of sub-shape indexes
+        """
+        return self._location_overrides
+
+    def subShapeBVH(self):
+        """
+        Method for retrieving the bounding volume hierarchy of the built sub-shapes, in the case group coordinates
+
+        @return [ShapeBVH] The hierarchy, or None if it must be (re)built
+        """
+        return self._subshape_bvh
+
+    def setSubShapeBVH(self, subshape_bvh):
+        """
+        Method for setting the bounding volume hierarchy of the built sub-shapes. None marks it to be rebuilt
+
+        @param subshape_bvh [ShapeBVH] The hierarchy
+        @return None
+        """
+        self._subshape_bvh = subshape_bvh
+
+    def wheelInstances(self):
+        """
+        Method for retrieving the handles of the rotated blade instances displayed for the full wheel
+
+        @return [list] List of Handle_AIS_InteractiveObject of AIS_ConnectedInteractive instances
+        """
+        return self._wheel_instances
+
+    def setWheelInstances(self, wheel_instances):
+        """
+        Method for setting the handles of the rotated blade instances displayed for the full wheel
+
+        @param wheel_instances [list] List of Handle_AIS_InteractiveObject of AIS_ConnectedInteractive instances
+        @return None
+        """
+        self._wheel_instances = wheel_instances
+
     def shapeTransformation(self):
         """
         Method for getting the transformation for the shape of this case
@@ -184,6 +321,22 @@ class CaseNode(object):
         """
         return self._tecplot_lists
 
+    def setTecplotLists(self, plot_lists):
+        """
+        Method for setting the tecplot graphics of this case, e.g. when its tecplot output is plotted again
+
+        The tecplot modes are set back to the ones of a just plotted tecplot.
+
+        @param plot_lists [list] List of lists of graphics generated by TecplotReader
+        @return None
+        """
+        self._tecplot_lists = plot_lists
+
+        self._tecplot_mode = "standard" if plot_lists else "None"
+        self._tecplot_visibility = "visible"
+        self._tecplot_meanline_visibility = "visible"
+        self._tecplot_bladeprofile_visibility = "visible"
+
     def tecplotSavedStyleList(self):
         """
         Method for getting the saved tecplot graphics line-styles of this case.
@@ -390,7 +543,7 @@ class CaseNode(object):
         """
         Methods required by model tree view of PyQt. Not necessary to observe this method.
         """
-        if position < 0 or position > len(self._children):
+        if position < 0 or position >= len(self._children):
             return False
 
         child = self._children.pop(position)
@@ -398,6 +551,31 @@ class CaseNode(object):
 
         return True
 
+    def isGroup(self):
+        """
+        Method for telling a group of cases from a case.
+
+        @return [bool] False for a case
+        """
+        return False
+
+    def caseOutputs(self):
+        """
+        Method for getting the output files the case was loaded from
+
+        @return [dict] Dictionary of output type to file path, as in data_structure.case_files.findCaseOutputs()
+        """
+        return self._case_outputs
+
+    def setCaseOutputs(self, case_outputs):
+        """
+        Method for setting the output files the case was loaded from
+
+        @param case_outputs [dict] Dictionary of output type to file path
+        @return None
+        """
+        self._case_outputs = dict(case_outputs)
+
     def name(self):
         """
         Methods required by model tree view of PyQt. Not necessary to observe this method.
@@ -435,3 +613,71 @@ class CaseNode(object):
         if self._parent is not None:
             return self._parent._children.index(self)
 
+
+class CaseGroupNode(CaseNode):
+    """
+    Class for a group of cases, e.g. all cases of a working directory, in the tree view.
+
+    The group is registered with the names of its cases only. The cases are loaded, parsing their outputs and loading
+    their shapes, when the group is expanded in the tree view, see data_structure.case_model.CaseModel.fetchMore().
+
+    """
+    def __init__(self, name, working_path, case_names, parent=None):
+        """
+        The constructor of the class.
+
+        @param name [str] Name of the group shown in the tree view
+        @param working_path [str] Directory of the cases of the group
+        @param case_names [list] Names of the cases of the group, not loaded yet
+        @param parent [CaseNode] Parent node of the group
+        """
+        super(CaseGroupNode, self).__init__(name, parent=parent)
+
+        self._working_path = working_path
+        self._pending_case_names = list(case_names)
+
+    def isGroup(self):
+        """
+        Method for telling a group of cases from a case.
+
+        @return [bool] True for a group
+        """
+        return True
+
+    def workingPath(self):
+        """
+        Method for retrieving the directory of the cases of the group
+
+        @return [str] The directory
+        """
+        return self._working_path
+
+    def caseCount(self):
+        """
+        Method for retrieving the number of cases of the group, loaded or not. Deleted cases are not counted
+
+        @return [int] The number of cases
+        """
+        return self.childCount() + len(self._pending_case_names)
+
+    def pendingCaseNames(self):
+        """
+        Method for retrieving the names of the cases of the group that were not loaded yet
+
+        @return [list] List of case names
+        """
+        return self._pending_case_names
+
+    def removePendingCaseName(self, case_name):
+        """
+        Method for taking a given case out of the pending list, e.g. when it is loaded from a session
+
+        @param case_name [str] Name of the case
+        @return [bool] True if the case was pending
+        """
+        if case_name not in self._pending_case_names:
+            return False
+
+        self._pending_case_names.remove(case_name)
+
+        return True
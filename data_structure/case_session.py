@@ -0,0 +1,191 @@
+"""@package data_structure.case_session
+
+File that contains the functions for saving and reading BladePy sessions.
+
+A session is a JSON file with the cases loaded in the Output Viewer. For each case it records the output files it was
+loaded from, with their size and modification time, and the display state kept in its CaseNode: color, transparency,
+quality and transformation of the case and of each sub-shape, the displayed sub-shapes and the tecplot modes. Groups of
+cases are recorded with the names of their cases and the cases already loaded.
+
+The session does not contain any geometry. The translated shapes and the parsed tecplot outputs are cached by
+occ_modules.shape_reader and tecplot_modules.tecplot_reader, keyed by the same path, size and modification time, so
+restoring a session reads the caches instead of translating and parsing the outputs again. Outputs changed after the
+session was saved are loaded again and reported to the user, see staleOutputs().
+
+"""
+
+import json
+import os
+
+## Version of the session format, increased when it changes incompatibly
+session_version = 1
+
+## File dialog filter of session files
+session_file_filter = "BladePy Session (*.bps)"
+
+
+def _outputEntries(case_outputs):
+    """
+    Records the output files of a case with the size and modification time used as cache keys.
+    """
+    output_entries = {}
+
+    for output_type, output_path in case_outputs.items():
+        try:
+            output_stat = os.stat(output_path)
+        except OSError:
+            continue
+
+        output_entries[output_type] = {"path": os.path.abspath(output_path),
+                                       "size": output_stat.st_size,
+                                       "mtime": output_stat.st_mtime}
+
+    return output_entries
+
+
+def _transformationEntry(transformation):
+    """
+    Records a transformation of CaseNode format, [x, y, z, theta, axis index], as numbers.
+    """
+    return [float(value) for value in transformation[:4]] + [int(transformation[4])]
+
+
+def caseEntry(case_node, displayed_rows):
+    """
+    Creates the session entry of a case.
+
+    @param case_node [CaseNode] The case
+    @param displayed_rows [list] Rows of the sub-shapes of the case displayed in the viewer
+    @return [dict] The entry, as written to the session file
+    """
+    return {"name": case_node.name(),
+            "outputs": _outputEntries(case_node.caseOutputs()),
+            "state": {"color": case_node.shapeColor(),
+                      "transparency": case_node.shapeTransparency(),
+                      "quality": case_node.shapeQuality(),
+                      "transformation": _transformationEntry(case_node.shapeTransformation()),
+                      "subshape": [[_transformationEntry(subshape_ref[0]), float(subshape_ref[1]),
+                                    int(subshape_ref[2]), float(subshape_ref[3])]
+                                   for subshape_ref in case_node.subshape],
+                      "displayed_rows": sorted(displayed_rows),
+                      "tecplot_mode": case_node.tecplotMode(),
+                      "tecplot_visibility": case_node.tecplotVisibility(),
+                      "tecplot_meanline_visibility": case_node.tecplotMeanLinesVisibility(),
+                      "tecplot_bladeprofile_visibility": case_node.tecplotBladeProfilesVisibility()}}
+
+
+def groupEntry(group_node, case_entries):
+    """
+    Creates the session entry of a group of cases.
+
+    @param group_node [CaseGroupNode] The group
+    @param case_entries [list] Entries of the loaded cases of the group, created by caseEntry()
+    @return [dict] The entry, as written to the session file
+    """
+    loaded_case_names = [group_node.child(row).name() for row in range(group_node.childCount())]
+
+    return {"name": group_node.name(),
+            "working_path": group_node.workingPath(),
+            "case_names": loaded_case_names + list(group_node.pendingCaseNames()),
+            "cases": case_entries}
+
+
+def writeSession(session_path, case_entries, group_entries):
+    """
+    Writes a session file.
+
+    @param session_path [str] Path of the session file
+    @param case_entries [list] Entries of the top level cases, created by caseEntry()
+    @param group_entries [list] Entries of the groups, created by groupEntry()
+    @return None
+    """
+    session = {"version": session_version,
+               "cases": case_entries,
+               "groups": group_entries}
+
+    # Written to a temporary file first, so a failure does not destroy a previous session
+    with open(session_path + ".tmp", "w") as session_file:
+        json.dump(session, session_file, indent=1)
+
+    os.replace(session_path + ".tmp", session_path)
+
+
+def readSession(session_path):
+    """
+    Reads a session file.
+
+    @param session_path [str] Path of the session file
+    @return [dict] The session, with the lists "cases" and "groups"
+    @exception ValueError The file is not a session or was written by a newer version
+    """
+    with open(session_path, "r") as session_file:
+        session = json.load(session_file)
+
+    if not isinstance(session, dict) or "cases" not in session:
+        raise ValueError("%s is not a BladePy session" % session_path)
+
+    if session.get("version", 0) > session_version:
+        raise ValueError("%s was saved by a newer version of BladePy" % session_path)
+
+    session.setdefault("groups", [])
+
+    return session
+
+
+def existingOutputs(case_entry):
+    """
+    Returns the output files of a session case that still exist.
+
+    @param case_entry [dict] Entry of the case
+    @return [dict] Dictionary of output type to file path
+    """
+    return dict((output_type, output_entry["path"]) for output_type, output_entry in case_entry["outputs"].items()
+                if os.path.isfile(output_entry["path"]))
+
+
+def staleOutputs(case_entry):
+    """
+    Returns the output files of a session case that were modified after the session was saved, so they are not cached.
+
+    @param case_entry [dict] Entry of the case
+    @return [list] Paths of the modified files
+    """
+    stale_outputs = []
+
+    for output_entry in case_entry["outputs"].values():
+        try:
+            output_stat = os.stat(output_entry["path"])
+        except OSError:
+            continue
+
+        if output_stat.st_size != output_entry["size"] or output_stat.st_mtime != output_entry["mtime"]:
+            stale_outputs.append(output_entry["path"])
+
+    return stale_outputs
+
+
+def applyCaseState(case_node, state):
+    """
+    Sets the display state recorded in a session to a case node. Only the data is set, the viewer and the tecplots are
+    updated by the caller, the tecplot modes through the tecplot toggles.
+
+    Sub-shape states are only set if the case still has the same number of sub-shapes, otherwise its outputs changed
+    and the sub-shapes keep the case state.
+
+    @param case_node [CaseNode] The case, just loaded
+    @param state [dict] The "state" of the session entry of the case
+    @return None
+    """
+    case_node.setShapeColor(state["color"])
+    case_node.setShapeTransparency(state["transparency"])
+    case_node.setShapeQuality(state["quality"])
+
+    for coord, value in enumerate(state["transformation"]):
+        case_node.setShapeTransformation(value, coord)
+
+    if len(state["subshape"]) == len(case_node.subshape):
+        for subshape_ref, saved_subshape_ref in zip(case_node.subshape, state["subshape"]):
+            subshape_ref[:] = [list(saved_subshape_ref[0])] + saved_subshape_ref[1:]
+    else:
+        for subshape_ref in case_node.subshape:
+            subshape_ref[:] = [list(state["transformation"]), state["transparency"], state["color"], state["quality"]]
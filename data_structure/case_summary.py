@@ -0,0 +1,319 @@
+"""@package data_structure.case_summary
+
+File that contains the functions for summarizing BladePro cases without the GUI, e.g. for regression checks of
+BladePro output sets in continuous integration.
+
+Every case of a directory tree is found by data_structure.case_files, the same way Core.BladePyCore.addCase() finds
+them, and loaded in a separate process, so the cases are read in parallel. The shapes are read through the shape cache
+of occ_modules.shape_reader and the tecplot outputs through tecplot_modules.tecplot_reader, so cases summarized before
+are not translated nor parsed again. The summary is written as JSON, sorted by directory and case name, so summaries of
+two output sets can be compared with a text diff.
+
+For each case the summary has:
+- the zone counts of the tecplot output and the blade metrics computed from it;
+- for each CAD output, the number of sub-shapes, their names, their count by category and the bounding box;
+- the bounding box of all the shapes of the case.
+
+Usage: python -m data_structure.case_summary root_dir -o summary.json
+
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+
+from data_structure.case_files import findCaseNames, findCaseOutputs
+from occ_modules.shape_bvh import shapeBox
+from occ_modules.shape_reader import readCachedShapeFile
+from occ_modules.subshape_names import subShapeCategory
+from tecplot_modules.tecplot_reader import TecPlotCore
+
+## Version of the summary format, increased when it changes incompatibly
+summary_version = 1
+
+## Output types read as CAD files, in the order they are summarized
+shape_output_types = ["igs_surf", "igs_3d_cur", "igs_2d_cur", "step_ref"]
+
+## Tecplot zone kinds and the TecPlotCore instance variable that has one list for each zone of the kind
+tecplot_zone_lists = {"Hub": "hub_z",
+                      "Shroud": "shroud_z",
+                      "LeadingEdge": "leading_z",
+                      "TrailingEdge": "trailing_z",
+                      "Streamcurve": "stream_z_list",
+                      "Bladeprofile": "bladeprofile_mp_list",
+                      "Meanline": "meanline_mp_list",
+                      "Thickness": "thickness_s_list"}
+
+
+def _numbers(values):
+    """
+    Converts the values of a tecplot column to floats. Missing values, read as empty lists, are skipped.
+    """
+    return [float(value) for value in values if value != []]
+
+
+def _extent(values):
+    """
+    @return [list] Minimum and maximum of a tecplot column, or None if it is empty
+    """
+    numbers = _numbers(values)
+
+    if not numbers:
+        return None
+
+    return [min(numbers), max(numbers)]
+
+
+def _round(value, precision):
+    """
+    Rounds the floats of a summary value to a number of significant digits, so rounding noise does not show in diffs.
+    """
+    if isinstance(value, float):
+        return float("%.*g" % (precision, value))
+
+    if isinstance(value, list):
+        return [_round(item, precision) for item in value]
+
+    if isinstance(value, dict):
+        return dict((key, _round(item, precision)) for key, item in value.items())
+
+    return value
+
+
+def summarizeTecplot(tecplot_path):
+    """
+    Summarizes a tecplot output.
+
+    Hub, shroud and edges are single zones, the other kinds have one zone per curve. The blade metrics are the
+    meridional extents of hub, shroud and edges, the maximum thickness and, for each mean line, its meridional length
+    (m'), its wrap angle (theta) and its inlet and outlet angles (beta).
+
+    @param tecplot_path [str] Path of the tecplot output
+    @return [dict] The summary of the output
+    """
+    tecplot_core = TecPlotCore()
+    tecplot_core.tecplotReader(tecplot_path)
+
+    zone_counts = {}
+
+    for zone_kind, attribute in tecplot_zone_lists.items():
+        zone_values = getattr(tecplot_core, attribute)
+
+        # The reader starts the lists of curves with an empty curve
+        if attribute.endswith("_list"):
+            zone_counts[zone_kind] = len([values for values in zone_values if values])
+        else:
+            zone_counts[zone_kind] = 1 if zone_values else 0
+
+    meanlines = []
+
+    for meanline_mp, meanline_th, meanline_beta in zip(tecplot_core.meanline_mp_list, tecplot_core.meanline_th_list,
+                                                       tecplot_core.meanline_beta_list):
+        if not meanline_mp:
+            continue
+
+        mps = _numbers(meanline_mp)
+        ths = _numbers(meanline_th)
+        betas = _numbers(meanline_beta)
+
+        meanlines.append({"meridional_length": abs(mps[-1] - mps[0]),
+                          "wrap_angle": abs(ths[-1] - ths[0]) if ths else None,
+                          "inlet_beta": betas[0] if betas else None,
+                          "outlet_beta": betas[-1] if betas else None})
+
+    thicknesses = [thickness for thickness_t in tecplot_core.thickness_t_list for thickness in _numbers(thickness_t)]
+
+    blade_metrics = {"hub_z": _extent(tecplot_core.hub_z),
+                     "hub_r": _extent(tecplot_core.hub_r),
+                     "shroud_z": _extent(tecplot_core.shroud_z),
+                     "shroud_r": _extent(tecplot_core.shroud_r),
+                     "leading_edge_z": _extent(tecplot_core.leading_z),
+                     "leading_edge_r": _extent(tecplot_core.leading_r),
+                     "trailing_edge_z": _extent(tecplot_core.trailing_z),
+                     "trailing_edge_r": _extent(tecplot_core.trailing_r),
+                     "max_thickness": max(thicknesses) if thicknesses else None,
+                     "meanlines": meanlines}
+
+    return {"zone_count": sum(zone_counts.values()),
+            "zones": zone_counts,
+            "blade_metrics": blade_metrics}
+
+
+def _mergedBox(boxes):
+    """
+    @return [list] The box that contains all the given boxes, or None if there are none
+    """
+    boxes = [box for box in boxes if box is not None]
+
+    if not boxes:
+        return None
+
+    return [min(box[axis] for box in boxes) for axis in range(3)] + \
+           [max(box[axis] for box in boxes) for axis in range(3, 6)]
+
+
+def summarizeShapeFile(shape_path):
+    """
+    Summarizes a CAD output.
+
+    @param shape_path [str] Path of the IGS or STEP file
+    @return [dict] The summary of the output
+    """
+    read_shapes = readCachedShapeFile(shape_path)
+
+    categories = {}
+    for name_subshape, topods_shape in read_shapes:
+        category = subShapeCategory(name_subshape)
+        categories[category] = categories.get(category, 0) + 1
+
+    return {"subshape_count": len(read_shapes),
+            "subshape_names": [name_subshape for name_subshape, topods_shape in read_shapes],
+            "categories": categories,
+            "bounding_box": _mergedBox([shapeBox(topods_shape) for name_subshape, topods_shape in read_shapes])}
+
+
+def summarizeCase(working_path, case_name, precision=6):
+    """
+    Summarizes the outputs of a case. Outputs that cannot be read are reported in the "errors" of the summary.
+
+    @param working_path [str] Directory of the case
+    @param case_name [str] Name of the case
+    @param precision [int] Number of significant digits of the numbers in the summary
+    @return [dict] The summary of the case
+    """
+    case_outputs = findCaseOutputs(working_path, case_name)
+
+    case_summary = {"directory": working_path,
+                    "name": case_name,
+                    "outputs": dict((output_type, os.path.basename(output_path))
+                                    for output_type, output_path in case_outputs.items()),
+                    "tecplot": None,
+                    "shapes": {},
+                    "bounding_box": None,
+                    "errors": []}
+
+    if "tecplot" in case_outputs:
+        try:
+            case_summary["tecplot"] = summarizeTecplot(case_outputs["tecplot"])
+        except Exception as error:
+            # A malformed output must not stop the summary of the other outputs and cases
+            case_summary["errors"].append("%s: %s" % (case_outputs["tecplot"], error))
+
+    for output_type in shape_output_types:
+        if output_type not in case_outputs:
+            continue
+
+        try:
+            case_summary["shapes"][output_type] = summarizeShapeFile(case_outputs[output_type])
+        except Exception as error:
+            case_summary["errors"].append("%s: %s" % (case_outputs[output_type], error))
+
+    case_summary["bounding_box"] = _mergedBox([shape_summary["bounding_box"]
+                                               for shape_summary in case_summary["shapes"].values()])
+
+    return _round(case_summary, precision)
+
+
+def _summarizeCaseTask(task):
+    """
+    Unpacks the arguments of summarizeCase() for multiprocessing.Pool.imap_unordered().
+
+    An exception raised by a worker would stop the whole tree, so a case that cannot be summarized, e.g. because its
+    directory disappeared, is reported in the "errors" of a summary without outputs.
+    """
+    working_path, case_name = task[:2]
+
+    try:
+        return summarizeCase(*task)
+    except Exception as error:
+        return {"directory": working_path,
+                "name": case_name,
+                "outputs": {},
+                "tecplot": None,
+                "shapes": {},
+                "bounding_box": None,
+                "errors": ["%s: %s" % (os.path.join(working_path, case_name), error)]}
+
+
+def findCases(root_directory):
+    """
+    Finds every case of a directory tree.
+
+    @param root_directory [str] Root of the tree
+    @return [list] Sorted list of (directory, case name)
+    """
+    cases = []
+
+    for directory, sub_directories, file_names in os.walk(root_directory):
+        sub_directories.sort()
+        cases.extend((directory, case_name) for case_name in findCaseNames(directory))
+
+    return sorted(cases)
+
+
+def summarizeTree(root_directory, precision=6, processes=None):
+    """
+    Summarizes every case of a directory tree, loading the cases in parallel.
+
+    The directories of the cases are recorded relative to the root, so summaries of output sets in different places
+    can be compared.
+
+    @param root_directory [str] Root of the tree
+    @param precision [int] Number of significant digits of the numbers in the summary
+    @param processes [int] Number of processes. None uses the number of CPUs
+    @return [dict] The summary, with the list "cases"
+    """
+    tasks = [(directory, case_name, precision) for directory, case_name in findCases(root_directory)]
+
+    case_summaries = []
+
+    if tasks:
+        pool = multiprocessing.Pool(processes)
+        try:
+            for case_summary in pool.imap_unordered(_summarizeCaseTask, tasks):
+                case_summaries.append(case_summary)
+        finally:
+            pool.close()
+            pool.join()
+
+    for case_summary in case_summaries:
+        case_summary["directory"] = os.path.relpath(case_summary["directory"], root_directory)
+
+    case_summaries.sort(key=lambda case_summary: (case_summary["directory"], case_summary["name"]))
+
+    return {"version": summary_version,
+            "case_count": len(case_summaries),
+            "cases": case_summaries}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarizes BladePro cases as JSON without the GUI.")
+    parser.add_argument("root", help="root of the directory tree with BladePro outputs")
+    parser.add_argument("-o", "--output", default=None, help="file where the summary is written. Default is stdout")
+    parser.add_argument("-p", "--precision", type=int, default=6, help="significant digits of the numbers")
+    parser.add_argument("-j", "--processes", type=int, default=None, help="number of parallel processes")
+    args = parser.parse_args()
+
+    summary = summarizeTree(args.root, args.precision, args.processes)
+
+    if args.output is None:
+        json.dump(summary, sys.stdout, indent=1, sort_keys=True)
+        sys.stdout.write("\n")
+    else:
+        with open(args.output, "w") as summary_file:
+            json.dump(summary, summary_file, indent=1, sort_keys=True)
+
+    # Cases with outputs that cannot be read fail the check
+    failed_cases = [case_summary for case_summary in summary["cases"] if case_summary["errors"]]
+
+    for case_summary in failed_cases:
+        for error in case_summary["errors"]:
+            sys.stderr.write("%s\n" % error)
+
+    sys.exit(1 if failed_cases else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""@package data_structure.case_watcher
+
+File that contains the class CaseWatcher, which watches the output files of the loaded cases.
+
+When BladePro runs again for a loaded case, its outputs are rewritten. The watcher tells which output of which case was
+modified, so only that output is loaded again, keeping the display state of the case.
+
+BladePro writes an output in several steps, and some tools replace the file instead of writing it. A modification is
+only reported once the size and modification time of the file stay the same for settle_interval, so a file is never
+read while it is being written. Replaced files are removed from QtCore.QFileSystemWatcher, so the directories of the
+outputs are watched as well and the files are watched again when they are back.
+
+The outputs a case did not have when it was loaded, e.g. the IGS curves of a BladePro run that is still going, are
+watched through their directory as well, and reported once they are written, so they are added to the case.
+
+"""
+
+import os
+
+from PyQt4 import QtCore
+
+from data_structure.case_files import caseOutputCandidates
+
+
+def _fileSignature(file_path):
+    """
+    @return [tuple] Size and modification time of a file, or None if it does not exist
+    """
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
+        return None
+
+    return file_stat.st_size, file_stat.st_mtime
+
+
+class CaseWatcher(QtCore.QObject):
+    """
+    Class that watches the output files of the loaded cases and signals when they are modified or created.
+
+    """
+
+    ## Signal emitted with the case node, the output type and the path of a modified or new output
+    outputChanged = QtCore.pyqtSignal(object, str, str)
+
+    def __init__(self, parent=None):
+        """
+        The constructor of the class.
+
+        @param parent [QtCore.QObject] Parent object of the watcher
+        """
+        super(CaseWatcher, self).__init__(parent)
+
+        ## Time in milliseconds that a modified output must stay unchanged before it is reported
+        self.settle_interval = 1000
+
+        # Dictionary of watched path to the list of its (case node, output type), as the same case can be loaded more
+        # than once, and of modified path to its last signature
+        self._watched = {}
+        self._pending = {}
+
+        self._file_watcher = QtCore.QFileSystemWatcher(self)
+        self._file_watcher.fileChanged.connect(self._fileChanged)
+        self._file_watcher.directoryChanged.connect(self._directoryChanged)
+
+        self._settle_timer = QtCore.QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.timeout.connect(self._settle)
+
+    def watchCase(self, case_node, working_path, case_name, output_types=None):
+        """
+        Starts watching the outputs of a case, including the ones it does not have yet.
+
+        @param case_node [CaseNode] The case, with its outputs set
+        @param working_path [str] Directory of the case
+        @param case_name [str] Name of the case
+        @param output_types [list] Output types loaded for the case, as in data_structure.case_files.findCaseOutputs().
+        The missing outputs of these types are reported when they are created. None watches all the types
+        @return None
+        """
+        case_outputs = case_node.caseOutputs()
+        watched_outputs = [(output_type, output_file_path) for output_type, output_file_path in case_outputs.items()]
+
+        for output_type, candidate_paths in caseOutputCandidates(working_path, case_name, output_types).items():
+            if output_type not in case_outputs:
+                watched_outputs.extend((output_type, candidate_path) for candidate_path in candidate_paths)
+
+        for output_type, output_file_path in watched_outputs:
+            output_file_path = os.path.abspath(output_file_path)
+            self._watched.setdefault(output_file_path, []).append((case_node, output_type))
+
+            if os.path.isfile(output_file_path):
+                self._file_watcher.addPath(output_file_path)
+
+            output_directory = os.path.dirname(output_file_path)
+            if output_directory not in self._file_watcher.directories():
+                self._file_watcher.addPath(output_directory)
+
+    def unwatchCase(self, case_node):
+        """
+        Stops watching the outputs of a case, e.g. when it is deleted.
+
+        @param case_node [CaseNode] The case
+        @return None
+        """
+        for path in list(self._watched):
+            self._unwatch(path, lambda watched_node, output_type: watched_node is case_node)
+
+    def _unwatch(self, path, predicate):
+        """
+        Drops the (case node, output type) of a path for which predicate(case node, output type) is true. The path and
+        its directory stop being watched when nothing is left in them.
+        """
+        watchers = [watcher for watcher in self._watched[path] if not predicate(*watcher)]
+
+        if watchers:
+            self._watched[path] = watchers
+            return
+
+        del self._watched[path]
+        self._pending.pop(path, None)
+
+        if path in self._file_watcher.files():
+            self._file_watcher.removePath(path)
+
+        # Directories are kept while other outputs are watched in them
+        output_directory = os.path.dirname(path)
+        if output_directory in self._file_watcher.directories() and \
+                not any(os.path.dirname(watched_path) == output_directory for watched_path in self._watched):
+            self._file_watcher.removePath(output_directory)
+
+    def _fileChanged(self, path):
+        path = os.path.abspath(str(path))
+
+        if path in self._watched:
+            self._pending[path] = _fileSignature(path)
+            self._settle_timer.start(self.settle_interval)
+
+    def _directoryChanged(self, path):
+        # Outputs replaced by a new file are no longer watched and new outputs were never watched. They are watched
+        # once they exist.
+        watched_files = set(os.path.abspath(str(file_path)) for file_path in self._file_watcher.files())
+        directory = os.path.abspath(str(path))
+
+        for output_file_path in self._watched:
+            if os.path.dirname(output_file_path) != directory or output_file_path in watched_files:
+                continue
+
+            if os.path.isfile(output_file_path):
+                self._file_watcher.addPath(output_file_path)
+                self._pending[output_file_path] = _fileSignature(output_file_path)
+                self._settle_timer.start(self.settle_interval)
+
+    def _settle(self):
+        still_changing = False
+
+        for path, signature in list(self._pending.items()):
+            current_signature = _fileSignature(path)
+
+            if current_signature is None:
+                # Removed, it is reported when it is written again
+                del self._pending[path]
+            elif current_signature != signature:
+                self._pending[path] = current_signature
+                still_changing = True
+            else:
+                del self._pending[path]
+                self._report(path)
+
+        if still_changing:
+            self._settle_timer.start(self.settle_interval)
+
+    def _report(self, path):
+        """
+        Emits outputChanged for every case that has the output. A new output becomes the output of its type, so the
+        other paths of the type are no longer watched for that case.
+        """
+        for case_node, output_type in list(self._watched.get(path, [])):
+            if case_node.caseOutputs().get(output_type) is None:
+                for other_path in [other_path for other_path, watchers in self._watched.items()
+                                   if other_path != path and (case_node, output_type) in watchers]:
+                    self._unwatch(other_path, lambda watched_node, watched_type:
+                                  watched_node is case_node and watched_type == output_type)
+
+            self.outputChanged.emit(case_node, output_type, path)
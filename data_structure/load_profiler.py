@@ -0,0 +1,165 @@
+"""@package data_structure.load_profiler
+
+File that contains the class LoadProfiler, which records how long each phase of loading a case takes.
+
+Core.BladePyCore.addCase() reads the preferences, looks for the outputs, reads the CAD files, parses and plots the
+tecplot, creates the case node and selects it. Each of these phases is recorded as a span with the phase name, the case
+name, its start, its duration and the bytes of the output files it read. The spans of the last case are shown in the
+status bar. All the recorded spans can be written as JSON or in the Chrome trace event format, which is opened by
+chrome://tracing or https://ui.perfetto.dev.
+
+"""
+
+import collections
+import contextlib
+import json
+import os
+import time
+
+## Maximum number of spans kept. The oldest ones are dropped first
+max_spans = 10000
+
+## File dialog filters of the export formats
+span_export_filters = {"json": "Load Timing JSON (*.json)",
+                       "chrome": "Chrome Trace (*.trace.json)"}
+
+
+def fileSize(file_path):
+    """
+    @return [int] Size in bytes of a file, or 0 if it does not exist
+    """
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
+
+
+class LoadProfiler(object):
+    """
+    Class that records timing spans of the phases of loading cases.
+
+    Spans are dictionaries with the keys "phase", "case", "start" and "duration", in seconds, and "bytes". Spans can
+    be nested, e.g. the phases inside the span of the whole addCase(). The nesting is kept in "depth".
+
+    """
+
+    def __init__(self):
+        """
+        The constructor of the class.
+        """
+        self._spans = collections.deque(maxlen=max_spans)
+        self._depth = 0
+
+        # Reference time, so span starts are small numbers
+        self._origin = time.time()
+
+    @contextlib.contextmanager
+    def span(self, phase, case_name, bytes_read=0):
+        """
+        Records the time spent in a block of code.
+
+        The span is yielded, so the bytes read can be set when they are only known inside the block, e.g.
+        span["bytes"] += fileSize(path). The span is recorded even if the block raises an exception.
+
+        @param phase [str] Name of the phase, e.g. "tecplot"
+        @param case_name [str] Name of the case being loaded
+        @param bytes_read [int] Bytes of the files read in the phase
+        @return [dict] The span, yielded to the block
+        """
+        span = {"phase": phase,
+                "case": case_name,
+                "start": time.time() - self._origin,
+                "duration": 0.,
+                "bytes": bytes_read,
+                "depth": self._depth}
+
+        self._depth += 1
+        start = time.perf_counter()
+
+        try:
+            yield span
+        finally:
+            span["duration"] = time.perf_counter() - start
+            self._depth -= 1
+            self._spans.append(span)
+
+    def spans(self, case_name=None):
+        """
+        Returns the recorded spans, in the order they finished.
+
+        @param case_name [str] Only the spans of this case. None returns the spans of all cases
+        @return [list] List of spans
+        """
+        if case_name is None:
+            return list(self._spans)
+
+        return [span for span in self._spans if span["case"] == case_name]
+
+    def clear(self):
+        """
+        Drops all the recorded spans.
+
+        @return None
+        """
+        self._spans.clear()
+
+    def caseSummary(self, case_name):
+        """
+        Describes the last load of a case in a single line, for the status bar, e.g.
+        "case loaded in 2.31 s: shapes 1.90 s (12.4 MB), tecplot 0.30 s (1.1 MB), ...".
+
+        @param case_name [str] Name of the case
+        @return [str] The description, or an empty string if the case has no spans
+        """
+        case_spans = self.spans(case_name)
+
+        if not case_spans:
+            return ""
+
+        # The outermost span is recorded last, the phases of the last load are the ones after the previous one
+        last_total = case_spans[-1]
+        phases = []
+        for span in reversed(case_spans[:-1]):
+            if span["depth"] <= last_total["depth"]:
+                break
+            if span["depth"] == last_total["depth"] + 1:
+                phases.insert(0, span)
+
+        descriptions = []
+        for span in sorted(phases, key=lambda phase_span: phase_span["duration"], reverse=True):
+            description = "%s %.2f s" % (span["phase"], span["duration"])
+            if span["bytes"]:
+                description += " (%.1f MB)" % (span["bytes"] / 1e6)
+            descriptions.append(description)
+
+        return "%s loaded in %.2f s: %s" % (case_name, last_total["duration"], ", ".join(descriptions))
+
+    def writeJSON(self, file_path):
+        """
+        Writes the recorded spans to a JSON file, as a list of spans.
+
+        @param file_path [str] Path of the file
+        @return None
+        """
+        with open(file_path, "w") as span_file:
+            json.dump(self.spans(), span_file, indent=1)
+
+    def writeChromeTrace(self, file_path):
+        """
+        Writes the recorded spans in the Chrome trace event format, as complete events in microseconds.
+
+        @param file_path [str] Path of the file
+        @return None
+        """
+        trace_events = [{"name": span["phase"],
+                         "cat": "load",
+                         "ph": "X",
+                         "ts": int(span["start"] * 1e6),
+                         "dur": int(span["duration"] * 1e6),
+                         "pid": os.getpid(),
+                         "tid": 0,
+                         "args": {"case": span["case"], "bytes": span["bytes"]}}
+                        for span in self.spans()]
+
+        with open(file_path, "w") as trace_file:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, trace_file)
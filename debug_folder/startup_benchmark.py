@@ -0,0 +1,115 @@
+"""@package debug_folder.startup_benchmark
+
+Script that measures the start up time of BladePy.
+
+Every run is made in a new Python process, so nothing is already imported or cached in memory. Two starts are compared:
+the compilation of the .ui files at every start, as BladePy used to, forced by BLADEPY_COMPILE_UI=always, and the
+normal start, which only compiles changed .ui files, see ui_compiler. With --window the main window is created as
+well, which needs a display.
+
+Usage: python debug_folder/startup_benchmark.py [-n runs] [--window] [--imports 15]
+
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+bladepy_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+## Code run in each process. It prints the time to import Core and, optionally, to create the main window
+startup_code = """
+import sys, time
+start = time.perf_counter()
+import Core
+import_time = time.perf_counter() - start
+window_time = 0.
+if %(window)s:
+    app = Core.QtGui.QApplication(sys.argv)
+    main_window = Core.BladePyCore()
+    app.processEvents()
+    window_time = time.perf_counter() - start - import_time
+print("%%f %%f" %% (import_time, window_time))
+"""
+
+
+def measureStartup(window=False, compile_ui=False):
+    """
+    Starts BladePy once in a new process.
+
+    @param window [bool] Also creates the main window
+    @param compile_ui [bool] Compiles the .ui files even if they did not change
+    @return [tuple] Seconds spent importing Core and creating the main window
+    """
+    environment = dict(os.environ)
+    if compile_ui:
+        environment["BLADEPY_COMPILE_UI"] = "always"
+    else:
+        environment.pop("BLADEPY_COMPILE_UI", None)
+
+    output = subprocess.check_output([sys.executable, "-c", startup_code % {"window": window}], cwd=bladepy_dir,
+                                     env=environment, universal_newlines=True)
+
+    import_time, window_time = output.split()[-2:]
+
+    return float(import_time), float(window_time)
+
+
+def slowestImports(count):
+    """
+    Lists the modules that take the longest to import, measured by python -X importtime.
+
+    @param count [int] Number of modules listed
+    @return [list] List of (cumulative seconds, module name), slowest first
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import Core"], cwd=bladepy_dir,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        self_time, cumulative_time, module_name = line[len("import time:"):].split("|")
+        imports.append((int(cumulative_time) / 1e6, module_name.strip()))
+
+    return sorted(imports, reverse=True)[:count]
+
+
+def _report(label, times):
+    print("%-28s median %.3f s, min %.3f s, max %.3f s" % (label, statistics.median(times), min(times), max(times)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures the start up time of BladePy.")
+    parser.add_argument("-n", "--runs", type=int, default=5, help="number of starts measured for each mode")
+    parser.add_argument("--window", action="store_true", help="also create the main window, needs a display")
+    parser.add_argument("--imports", type=int, default=0, help="list the given number of slowest imports")
+    args = parser.parse_args()
+
+    results = {}
+
+    for label, compile_ui in [("compiling .ui files", True), ("compiling changed .ui only", False)]:
+        runs = [measureStartup(args.window, compile_ui) for run in range(args.runs)]
+        results[label] = [sum(run) for run in runs]
+
+        _report("%s (import)" % label, [run[0] for run in runs])
+        if args.window:
+            _report("%s (window)" % label, [run[1] for run in runs])
+
+    compiled_time = statistics.median(results["compiling .ui files"])
+    cached_time = statistics.median(results["compiling changed .ui only"])
+
+    print("start up is %.3f s (%.0f%%) faster without compiling unchanged .ui files" %
+          (compiled_time - cached_time, 100 * (compiled_time - cached_time) / compiled_time))
+
+    if args.imports:
+        print("\nSlowest imports (cumulative):")
+        for cumulative_time, module_name in slowestImports(args.imports):
+            print("%8.3f s  %s" % (cumulative_time, module_name))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,4 +9,28 @@ customized class from OCC.Display.qtDisplay.qtViewer3d of PythonOCC, inherits it
 \arg \c shape_properties File that contains the class SetProperties that is a class for a composition object in
  Core.BladePyCore for shape control purposes.
 
+\arg \c shape_registry File that contains the class shape_registry.ShapeRegistry, that keeps the handles of the
+AIS Shapes of every loaded case.
+
+\arg \c shape_bvh File that contains the class shape_bvh.ShapeBVH, a bounding volume hierarchy of the sub-shapes of a
+case used for picking.
+
+\arg \c shape_reader File that contains the function shape_reader.readShapeFile, for reading the named shapes of
+BladePro IGES outputs and STEP reference geometries, and the cache of translated shapes.
+
+\arg \c subshape_names File that contains subshape_names.ExceptionMatcher and subshape_names.subShapeCategory(),
+which tell the kind of a sub-shape from its name.
+
+\arg \c shape_translator File that contains the worker processes that translate CAD files into the shape cache of
+shape_reader, shared by the whole application.
+
+\arg \c mesh_export File that contains the functions for exporting the displayed triangulation of cases to STL, PLY
+and glTF files, and the thread mesh_export.MeshExportThread that writes them.
+
+\arg \c mesh_writers File that contains the functions for writing triangle meshes to STL, PLY and glTF files, without
+OCC nor Qt.
+
+\arg \c snapshot_renderer File that contains the functions for rendering PNG snapshots of cases in an offscreen
+viewer, without the GUI.
+
 """
@@ -0,0 +1,144 @@
+"""@package occ_modules.mesh_export
+
+File that contains the functions for exporting the triangulation of displayed cases to mesh files.
+
+The triangulation is the one computed by the Output Viewer when the shapes were displayed in shaded mode, so nothing is
+re-meshed. Faces that were never tessellated, e.g. of sub-shapes never displayed, and curves are skipped. The formats
+are binary STL, binary PLY and binary glTF (.glb), written without any extra library.
+
+The triangles are collected from the OCC shapes by collectMeshes() and the files are written by
+occ_modules.mesh_writers.writeMeshes(), which only works on Python lists, so it can be run by MeshExportThread while the
+GUI keeps responding.
+
+"""
+
+import struct
+
+from OCC.BRep import BRep_Tool
+from OCC.TopAbs import TopAbs_FACE, TopAbs_REVERSED
+from OCC.TopExp import TopExp_Explorer
+from OCC.TopLoc import TopLoc_Location
+from OCC.TopoDS import topods_Face
+from PyQt4 import QtCore
+
+from occ_modules.mesh_writers import mesh_export_formats, writeMeshes
+
+
+def shapeTriangles(topods_shape, transf=None):
+    """
+    Reads the triangulation of the faces of a shape.
+
+    @param topods_shape [TopoDS_Shape] The shape, already tessellated by the viewer
+    @param transf [gp_Trsf] Transformation applied to the vertices, e.g. the location of the AIS Shape in the viewer
+    @return [tuple] List of vertices (x, y, z) and list of triangles (i, j, k) with zero-based vertex indexes. Both
+    lists are empty if the shape has no triangulation
+    """
+    vertices = []
+    triangles = []
+
+    brep_tool = BRep_Tool()
+    explorer = TopExp_Explorer(topods_shape, TopAbs_FACE)
+
+    while explorer.More():
+        face = topods_Face(explorer.Current())
+        explorer.Next()
+
+        face_location = TopLoc_Location()
+        h_triangulation = brep_tool.Triangulation(face, face_location)
+
+        if h_triangulation.IsNull():
+            continue
+
+        triangulation = h_triangulation.GetObject()
+
+        face_transf = face_location.Transformation()
+        if transf is not None:
+            face_transf = transf * face_transf
+
+        nodes = triangulation.Nodes()
+        offset = len(vertices) - 1  # OCC indexes start at 1
+
+        for i in range(1, triangulation.NbNodes() + 1):
+            point = nodes.Value(i).Transformed(face_transf)
+            vertices.append((point.X(), point.Y(), point.Z()))
+
+        # Reversed faces have their triangles turned, so the normals point outwards
+        reversed_face = face.Orientation() == TopAbs_REVERSED
+        poly_triangles = triangulation.Triangles()
+
+        for i in range(1, triangulation.NbTriangles() + 1):
+            index_1, index_2, index_3 = poly_triangles.Value(i).Get()
+
+            if reversed_face:
+                index_2, index_3 = index_3, index_2
+
+            triangles.append((index_1 + offset, index_2 + offset, index_3 + offset))
+
+    return vertices, triangles
+
+
+def collectMeshes(context, case_node):
+    """
+    Collects the triangulation of the built sub-shapes of a case in the coordinates shown in the viewer.
+
+    This function reads OCC objects, so it must be called from the GUI thread.
+
+    @param context [AIS_InteractiveContext] The context of the viewer
+    @param case_node [CaseNode] The case to be exported
+    @return [list] List of [sub-shape name, vertices, triangles] of the sub-shapes that have a triangulation
+    """
+    meshes = []
+
+    group_transf = None
+    if case_node.shapeGroup() is not None:
+        group_transf = context.Location(case_node.shapeGroup()).Transformation()
+
+    for name, h_ais_shape in zip(case_node._supshape_names, case_node.shapeHAIS()):
+        if h_ais_shape is None:
+            continue
+
+        # Sub-shape locations are relative to the case group
+        transf = context.Location(h_ais_shape).Transformation()
+        if group_transf is not None:
+            transf = group_transf * transf
+
+        vertices, triangles = shapeTriangles(h_ais_shape.GetObject().Shape(), transf)
+
+        if triangles:
+            meshes.append([name, vertices, triangles])
+
+    return meshes
+
+
+class MeshExportThread(QtCore.QThread):
+    """
+    Thread that writes the collected meshes of a case, so large cases are exported without freezing the GUI.
+
+    The signal exportFinished carries the list of written files and exportFailed the error message.
+
+    """
+
+    exportFinished = QtCore.pyqtSignal(list)
+    exportFailed = QtCore.pyqtSignal(str)
+
+    def __init__(self, meshes, output_path, case_name, export_format="STL", merged=True, parent=None):
+        """
+        The constructor of the class. The arguments are the same as writeMeshes().
+        """
+        super(MeshExportThread, self).__init__(parent)
+
+        self._meshes = meshes
+        self._output_path = output_path
+        self._case_name = case_name
+        self._export_format = export_format
+        self._merged = merged
+
+    def run(self):
+        try:
+            written_files = writeMeshes(self._meshes, self._output_path, self._case_name, self._export_format,
+                                        self._merged)
+        except (IOError, OSError, struct.error) as error:
+            self.exportFailed.emit(str(error))
+            return
+
+        self.exportFinished.emit(written_files)
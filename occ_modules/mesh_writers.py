@@ -0,0 +1,194 @@
+"""@package occ_modules.mesh_writers
+
+File that contains the functions for writing triangle meshes to binary STL, binary PLY and binary glTF (.glb) files.
+
+The meshes are plain Python lists of vertices and triangles, as collected from the OCC shapes by
+occ_modules.mesh_export, so this file does not depend on OCC nor on Qt.
+
+"""
+
+import json
+import os
+import struct
+
+## File extension of each export format
+mesh_export_formats = {"STL": ".stl",
+                       "PLY": ".ply",
+                       "glTF": ".glb"}
+
+
+def _triangleNormal(v1, v2, v3):
+    """
+    Returns the unit normal of a triangle, or (0, 0, 0) for degenerated triangles.
+    """
+    ax, ay, az = v2[0] - v1[0], v2[1] - v1[1], v2[2] - v1[2]
+    bx, by, bz = v3[0] - v1[0], v3[1] - v1[1], v3[2] - v1[2]
+
+    nx, ny, nz = ay * bz - az * by, az * bx - ax * bz, ax * by - ay * bx
+    length = (nx * nx + ny * ny + nz * nz) ** 0.5
+
+    if length == 0:
+        return 0., 0., 0.
+
+    return nx / length, ny / length, nz / length
+
+
+def writeSTL(file_path, vertices, triangles):
+    """
+    Writes a mesh to a binary STL file.
+
+    @param file_path [str] Path of the file
+    @param vertices [list] List of vertices (x, y, z)
+    @param triangles [list] List of triangles (i, j, k)
+    @return None
+    """
+    with open(file_path, "wb") as stl_file:
+        stl_file.write(b"BladePy mesh export".ljust(80, b" "))
+        stl_file.write(struct.pack("<I", len(triangles)))
+
+        for i, j, k in triangles:
+            v1, v2, v3 = vertices[i], vertices[j], vertices[k]
+            stl_file.write(struct.pack("<12fH", *(_triangleNormal(v1, v2, v3) + v1 + v2 + v3 + (0,))))
+
+
+def writePLY(file_path, vertices, triangles):
+    """
+    Writes a mesh to a binary little endian PLY file.
+
+    @param file_path [str] Path of the file
+    @param vertices [list] List of vertices (x, y, z)
+    @param triangles [list] List of triangles (i, j, k)
+    @return None
+    """
+    header = ("ply\n"
+              "format binary_little_endian 1.0\n"
+              "comment BladePy mesh export\n"
+              "element vertex %d\n"
+              "property float x\n"
+              "property float y\n"
+              "property float z\n"
+              "element face %d\n"
+              "property list uchar int vertex_indices\n"
+              "end_header\n" % (len(vertices), len(triangles)))
+
+    with open(file_path, "wb") as ply_file:
+        ply_file.write(header.encode("ascii"))
+
+        for vertex in vertices:
+            ply_file.write(struct.pack("<3f", *vertex))
+
+        for triangle in triangles:
+            ply_file.write(struct.pack("<B3i", 3, *triangle))
+
+
+def writeGLTF(file_path, meshes):
+    """
+    Writes meshes to a binary glTF 2.0 file (.glb). Each mesh becomes a node named after it.
+
+    @param file_path [str] Path of the file
+    @param meshes [list] List of [name, vertices, triangles]
+    @return None
+    """
+    buffer_data = bytearray()
+    gltf = {"asset": {"version": "2.0", "generator": "BladePy"},
+            "scene": 0,
+            "scenes": [{"nodes": list(range(len(meshes)))}],
+            "nodes": [], "meshes": [], "accessors": [], "bufferViews": []}
+
+    for name, vertices, triangles in meshes:
+        # Positions. glTF requires their bounds
+        positions = b"".join(struct.pack("<3f", *vertex) for vertex in vertices)
+        gltf["bufferViews"].append({"buffer": 0, "byteOffset": len(buffer_data), "byteLength": len(positions),
+                                    "target": 34962})
+        buffer_data.extend(positions)
+
+        gltf["accessors"].append({"bufferView": len(gltf["bufferViews"]) - 1, "componentType": 5126,
+                                  "count": len(vertices), "type": "VEC3",
+                                  "min": [min(vertex[n] for vertex in vertices) for n in range(3)],
+                                  "max": [max(vertex[n] for vertex in vertices) for n in range(3)]})
+
+        # Indexes
+        indexes = b"".join(struct.pack("<3I", *triangle) for triangle in triangles)
+        gltf["bufferViews"].append({"buffer": 0, "byteOffset": len(buffer_data), "byteLength": len(indexes),
+                                    "target": 34963})
+        buffer_data.extend(indexes)
+
+        gltf["accessors"].append({"bufferView": len(gltf["bufferViews"]) - 1, "componentType": 5125,
+                                  "count": 3 * len(triangles), "type": "SCALAR"})
+
+        gltf["meshes"].append({"name": name,
+                               "primitives": [{"attributes": {"POSITION": len(gltf["accessors"]) - 2},
+                                               "indices": len(gltf["accessors"]) - 1}]})
+        gltf["nodes"].append({"name": name, "mesh": len(gltf["meshes"]) - 1})
+
+    gltf["buffers"] = [{"byteLength": len(buffer_data)}]
+
+    # Chunks must be aligned to 4 bytes, JSON is padded with spaces and the binary chunk with zeros
+    json_chunk = json.dumps(gltf).encode("utf-8")
+    json_chunk += b" " * (-len(json_chunk) % 4)
+    buffer_data.extend(b"\x00" * (-len(buffer_data) % 4))
+
+    with open(file_path, "wb") as glb_file:
+        glb_file.write(struct.pack("<4sII", b"glTF", 2, 12 + 8 + len(json_chunk) + 8 + len(buffer_data)))
+        glb_file.write(struct.pack("<I4s", len(json_chunk), b"JSON"))
+        glb_file.write(json_chunk)
+        glb_file.write(struct.pack("<I4s", len(buffer_data), b"BIN\x00"))
+        glb_file.write(bytes(buffer_data))
+
+
+def _mergedMesh(meshes):
+    """
+    Merges a list of meshes into a single one, shifting the vertex indexes of each mesh.
+    """
+    merged_vertices = []
+    merged_triangles = []
+
+    for name, vertices, triangles in meshes:
+        offset = len(merged_vertices)
+        merged_vertices.extend(vertices)
+        merged_triangles.extend((i + offset, j + offset, k + offset) for i, j, k in triangles)
+
+    return merged_vertices, merged_triangles
+
+
+def _fileName(name):
+    """
+    Turns a sub-shape name, e.g. "case.surf.igs - BLADE_1", into a string usable as file name.
+    """
+    return "".join(character if character.isalnum() or character in "-_." else "_" for character in name)
+
+
+def writeMeshes(meshes, output_path, case_name, export_format="STL", merged=True):
+    """
+    Writes the meshes of a case to files.
+
+    @param meshes [list] List of [sub-shape name, vertices, triangles], as returned by collectMeshes()
+    @param output_path [str] Directory where the files are written
+    @param case_name [str] Name of the case, used as file name
+    @param export_format [str] Key of mesh_export_formats
+    @param merged [bool] True writes a single file for the case, False writes a file for each sub-shape. glTF files
+    keep the sub-shapes as separate nodes when merged
+    @return [list] Paths of the written files
+    """
+    extension = mesh_export_formats[export_format]
+
+    if merged:
+        groups = [[case_name, meshes]]
+    else:
+        groups = [["%s.%s" % (case_name, _fileName(mesh[0])), [mesh]] for mesh in meshes]
+
+    written_files = []
+
+    for file_name, group_meshes in groups:
+        file_path = os.path.join(output_path, file_name + extension)
+
+        if export_format == "glTF":
+            writeGLTF(file_path, group_meshes)
+        elif export_format == "PLY":
+            writePLY(file_path, *_mergedMesh(group_meshes))
+        else:
+            writeSTL(file_path, *_mergedMesh(group_meshes))
+
+        written_files.append(file_path)
+
+    return written_files
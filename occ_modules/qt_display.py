@@ -7,6 +7,8 @@ The class qtViewer3d is a class that in general setups the visualization and the
 """
 
 from OCC.Display.qtDisplay import qtViewer3d
+from PyQt4 import QtCore, QtGui
+
 
 class customQtViewer3d(qtViewer3d):
     """
@@ -14,14 +16,45 @@ class customQtViewer3d(qtViewer3d):
 
     This costumized class allows to change de zoom step of mouse wheel event on Qt environment.
 
+    While the camera is being rotated, panned or zoomed, the shapes are switched to a lighter display mode (bounding
+    boxes by default). The full quality display is restored when the mouse stays idle for interaction_idle_time.
+
+    A left click without dragging emits pointPicked with the position of the click instead of selecting with
+    pythonOCC, so the owner can look up what is under the mouse and select it.
+
     """
+
+    ## Signal emitted with the x and y position of a left click that did not move the camera
+    pointPicked = QtCore.pyqtSignal(int, int)
+
     def __init__(self, parent=None):
         super(customQtViewer3d, self).__init__(parent)
 
+        ## Enables the lighter display mode while the camera is moving
+        self.interaction_lod_enabled = True
+
+        ## AIS display mode used while the camera is moving. 0 is wireframe and 2 is bounding box for AIS_Shape
+        self.interaction_display_mode = 2
+
+        ## Time in milliseconds without camera movement before restoring the full quality display
+        self.interaction_idle_time = 300
+
+        # Display mode to be restored at the end of the interaction. None when there is no interaction going on.
+        self._saved_display_mode = None
+
+        self._interaction_timer = QtCore.QTimer(self)
+        self._interaction_timer.setSingleShot(True)
+        self._interaction_timer.timeout.connect(self._endInteraction)
+
+        # Position of the last left button press, for telling clicks from drags
+        self._press_pos = None
+
     def wheelEvent(self, event):
         """
         Graphic method of the qtViewer3d of pythonOCC that attributes function to Mouse Wheel on Qt environment.
 
+        ZoomFactor already redraws the view, so no extra repaint is made for each wheel tick.
+
         @param event [QtGui.QWheelEvent] Object created triggered by user Mouse Wheel movement.
         @return None
 
@@ -35,10 +68,90 @@ class customQtViewer3d(qtViewer3d):
         else:
             zoom_factor = 1 / 2
 
-        # print(self.zoomfactor)
-        self._display.Repaint()
+        self._beginInteraction()
         self._display.ZoomFactor(zoom_factor)
 
+    def mouseMoveEvent(self, event):
+        """
+        Graphic method of the qtViewer3d of pythonOCC for mouse movement. Rotation, pan and dynamic zoom are made
+        while a button is pressed, so the lighter display mode is set before the camera moves.
+
+        @param event [QtGui.QMouseEvent] Object created triggered by user Mouse movement.
+        @return None
+
+        """
+        if event.buttons() != QtCore.Qt.NoButton:
+            self._beginInteraction()
+
+        super(customQtViewer3d, self).mouseMoveEvent(event)
+
+    def mousePressEvent(self, event):
+        """
+        Graphic method of the qtViewer3d of pythonOCC for mouse press. Stores the position of a left button press.
+
+        @param event [QtGui.QMouseEvent] Object created triggered by user Mouse press.
+        @return None
+
+        """
+        if event.button() == QtCore.Qt.LeftButton:
+            self._press_pos = event.pos()
+
+        super(customQtViewer3d, self).mousePressEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        """
+        Graphic method of the qtViewer3d of pythonOCC for mouse release. Emits pointPicked for a left click.
+
+        A plain left click is not given to the selection of pythonOCC: the slot of pointPicked finds the shape under
+        the mouse and selects it, so the shapes are searched only once. Shift clicks and area selections are kept.
+
+        @param event [QtGui.QMouseEvent] Object created triggered by user Mouse release.
+        @return None
+
+        """
+        press_pos = self._press_pos
+
+        if event.button() == QtCore.Qt.LeftButton:
+            self._press_pos = None
+
+        if event.button() == QtCore.Qt.LeftButton and press_pos is not None and \
+                event.modifiers() == QtCore.Qt.NoModifier and \
+                (event.pos() - press_pos).manhattanLength() <= QtGui.QApplication.startDragDistance():
+            # As at the end of the release of qtViewer3d
+            self.cursor = "arrow"
+            self.pointPicked.emit(event.pos().x(), event.pos().y())
+            return
+
+        super(customQtViewer3d, self).mouseReleaseEvent(event)
+
+    def _beginInteraction(self):
+        """
+        Switches the shapes to the interaction display mode and (re)starts the idle timer.
+
+        @return None
+        """
+        if not self.interaction_lod_enabled or self._display is None:
+            return
+
+        if self._saved_display_mode is None:
+            context = self._display.Context
+            self._saved_display_mode = context.DisplayMode()
+            context.SetDisplayMode(self.interaction_display_mode, False)
+
+        self._interaction_timer.start(self.interaction_idle_time)
+
+    def _endInteraction(self):
+        """
+        Restores the display mode that was active before the camera started moving.
+
+        @return None
+        """
+        if self._saved_display_mode is None:
+            return
+
+        self._display.Context.SetDisplayMode(self._saved_display_mode, True)
+        self._saved_display_mode = None
+
     def cursor(self, value):
         if not self._current_cursor == value:
 
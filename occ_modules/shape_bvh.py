@@ -0,0 +1,155 @@
+"""@package occ_modules.shape_bvh
+
+File that contains the class ShapeBVH, a bounding volume hierarchy of the sub-shapes of a case.
+
+The hierarchy is a binary tree of axis aligned bounding boxes. Queries only visit the branches whose box is hit, so
+finding the sub-shapes under the mouse costs about the logarithm of the number of sub-shapes instead of testing every
+one of them. It is built by occ_modules.shape_properties.ShapeManager.caseBVH() and kept in the case node.
+
+"""
+
+
+def shapeBox(topods_shape, transf=None):
+    """
+    Computes the bounding box of a shape.
+
+    @param topods_shape [TopoDS_Shape] The shape
+    @param transf [gp_Trsf] Transformation applied to the box, e.g. the location of the sub-shape in its case
+    @return [tuple] (xmin, ymin, zmin, xmax, ymax, zmax), or None for an empty shape
+    """
+    # OCC is only needed for shapes, the hierarchy itself is plain Python
+    from OCC.Bnd import Bnd_Box
+    from OCC.BRepBndLib import brepbndlib_Add
+
+    box = Bnd_Box()
+    brepbndlib_Add(topods_shape, box)
+
+    if box.IsVoid():
+        return None
+
+    if transf is not None:
+        box = box.Transformed(transf)
+
+    return box.Get()
+
+
+def _mergedBox(boxes):
+    """
+    Returns the box that contains all the given boxes.
+    """
+    return (min(box[0] for box in boxes), min(box[1] for box in boxes), min(box[2] for box in boxes),
+            max(box[3] for box in boxes), max(box[4] for box in boxes), max(box[5] for box in boxes))
+
+
+def _lineBoxEntry(box, origin, direction):
+    """
+    Slab test of a line against a box.
+
+    @return [float] Parameter of the line where it enters the box, or None if the line misses the box
+    """
+    t_min = float("-inf")
+    t_max = float("inf")
+
+    for axis in range(3):
+        if direction[axis] == 0:
+            if origin[axis] < box[axis] or origin[axis] > box[axis + 3]:
+                return None
+            continue
+
+        t_1 = (box[axis] - origin[axis]) / direction[axis]
+        t_2 = (box[axis + 3] - origin[axis]) / direction[axis]
+
+        if t_1 > t_2:
+            t_1, t_2 = t_2, t_1
+
+        t_min = max(t_min, t_1)
+        t_max = min(t_max, t_2)
+
+        if t_min > t_max:
+            return None
+
+    return t_min
+
+
+class ShapeBVH(object):
+    """
+    Bounding volume hierarchy of indexed boxes.
+
+    Each node is a list [box, left child, right child, leaf items], where leaf items is a list of (index, box) for
+    leaves and None for inner nodes. The tree is split at the median of the box centers along its longest axis.
+
+    """
+
+    ## Maximum number of boxes in a leaf
+    leaf_size = 4
+
+    def __init__(self, indexed_boxes):
+        """
+        The constructor of the class.
+
+        @param indexed_boxes [list] List of (index, box), where index is any identifier, e.g. the row of the sub-shape,
+        and box is (xmin, ymin, zmin, xmax, ymax, zmax). Entries with None box are ignored.
+        """
+        indexed_boxes = [(index, box) for index, box in indexed_boxes if box is not None]
+
+        self._root = self._buildNode(indexed_boxes) if indexed_boxes else None
+
+    def _buildNode(self, indexed_boxes):
+        """
+        Builds the node of a list of boxes and, recursively, its children.
+        """
+        node_box = _mergedBox([box for index, box in indexed_boxes])
+
+        if len(indexed_boxes) <= self.leaf_size:
+            return [node_box, None, None, indexed_boxes]
+
+        extents = [node_box[axis + 3] - node_box[axis] for axis in range(3)]
+        axis = extents.index(max(extents))
+
+        indexed_boxes = sorted(indexed_boxes, key=lambda item: item[1][axis] + item[1][axis + 3])
+        middle = len(indexed_boxes) // 2
+
+        return [node_box, self._buildNode(indexed_boxes[:middle]), self._buildNode(indexed_boxes[middle:]), None]
+
+    def box(self):
+        """
+        Returns the box that contains all the boxes of the hierarchy.
+
+        @return [tuple] (xmin, ymin, zmin, xmax, ymax, zmax), or None if the hierarchy is empty
+        """
+        if self._root is None:
+            return None
+
+        return self._root[0]
+
+    def lineQuery(self, origin, direction):
+        """
+        Finds the boxes crossed by a line, e.g. the line of sight under the mouse.
+
+        @param origin [tuple] A point (x, y, z) of the line
+        @param direction [tuple] Direction (x, y, z) of the line
+        @return [list] List of (entry parameter, index) sorted along the direction of the line
+        """
+        hits = []
+        stack = [self._root] if self._root is not None else []
+
+        while stack:
+            node = stack.pop()
+
+            t_entry = _lineBoxEntry(node[0], origin, direction)
+            if t_entry is None:
+                continue
+
+            if node[3] is None:
+                stack.append(node[1])
+                stack.append(node[2])
+                continue
+
+            for index, box in node[3]:
+                t_entry = _lineBoxEntry(box, origin, direction)
+                if t_entry is not None:
+                    hits.append((t_entry, index))
+
+        hits.sort(key=lambda hit: hit[0])
+
+        return hits
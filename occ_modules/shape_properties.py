@@ -12,19 +12,24 @@ import OCC.Quantity as OCC_Color
 import os
 
 from OCC.IGESControl import IGESControl_Controller, IGESControl_Reader
-from OCC.IGESCAFControl import IGESCAFControl_Reader
-from OCC.TDataStd import TDataStd_Name_GetID, Handle_TDataStd_Name
-from OCC.TCollection import TCollection_ExtendedString
-from OCC.TDF import TDF_LabelSequence
-from OCC.TDocStd import Handle_TDocStd_Document
-from OCC.XCAFApp import _XCAFApp
-from OCC.XCAFDoc import XCAFDoc_DocumentTool
-from OCC.AIS import AIS_ColoredShape
+from OCC.AIS import AIS_ColoredShape, AIS_ConnectedInteractive, AIS_MultipleConnectedInteractive, AIS_Shaded
+from OCC.BRep import BRep_Tool, BRep_Builder
+from OCC.BRepBuilderAPI import BRepBuilderAPI_MakeEdge
+from OCC.BRepExtrema import BRepExtrema_DistShapeShape
+from OCC.BRepIntCurveSurface import BRepIntCurveSurface_Inter
+from OCC.BRepTools import breptools_Clean
+from OCC.TopAbs import TopAbs_FACE
+from OCC.TopExp import TopExp_Explorer
 from OCC.TopLoc import TopLoc_Location
-from OCC.gp import gp_Trsf, gp_Pnt, gp_Ax1, gp_Dir, gp_Vec
-from math import pi
+from OCC.TopoDS import topods_Face, TopoDS_Compound
+from OCC.gp import gp_Trsf, gp_Pnt, gp_Ax1, gp_Dir, gp_Vec, gp_Lin
+from math import pi, sqrt
 from PyQt4 import QtCore, QtGui
 from bladepro_modules.inputfile_writer import InputWriterWindow
+from occ_modules.shape_reader import readShapeFiles
+from occ_modules.subshape_names import ExceptionMatcher, subShapeCategory
+from occ_modules.shape_registry import uniqueShapes
+from occ_modules.shape_bvh import ShapeBVH, shapeBox
 
 
 shape_colorlist = ["Golden", "Blue", "Red", "White", "Black", "Yellow"]
@@ -55,6 +60,9 @@ class ShapeManager(object):
 
     """
 
+    ## Distance in pixels from the mouse within which a curve is picked
+    curve_pick_tolerance = 4
+
     def __init__(self, OutputViewerWidget):
 
         ## Object reference to main object
@@ -64,97 +72,259 @@ class ShapeManager(object):
         """
         Method for loading one or more shapes and displaying to Output Viewer.
 
-        This method uses libraries of iges caf control for fetching sub-shape names within .igs files. This method
-        is used when adding a case in the main routine.
+        This method uses libraries of iges and step caf control for fetching sub-shape names within .igs and .stp
+        files. This method is used when adding a case in the main routine. The files are read through the shape
+        cache of occ_modules.shape_reader, so files not cached yet are translated in parallel in other processes
+        while the GUI keeps being painted.
+
+        Sub-shapes matched by the exception lists are not displayed, so their AIS_ColoredShape is not created here.
+        Only their TopoDS_Shape is kept and the AIS object is built by buildSubShape() when the user first displays
+        them.
+
+        Files of curves can be loaded with their curves merged: all displayed curves of a category, see
+        occ_modules.subshape_names.subShapeCategory(), become a single compound with a single presentation. Each curve
+        keeps its name and row, and the rows of a compound share its handle, so selecting any of them selects the
+        compound.
 
         @param shape_list [list] First index contains the path of shape, second index contains a list of display
-        exceptions, e.g: [[igs_2d_shape_path, ["HUB", "SHROUD"], [igs_3d_shape_path, ["STREAM"]]
-        @return First return contains list of ais_shapes handles and second return contains a list of sub-shape names
-        in strings
+        exceptions and the optional third index tells whether the curves are merged, e.g:
+        [[igs_2d_shape_path, ["HUB", "SHROUD"], True], [igs_3d_shape_path, ["STREAM"]]]
+        @return First return contains list of ais_shapes handles (None for not yet built sub-shapes), second return
+        contains a list of sub-shape names in strings and third return contains the list of TopoDS_Shape of every
+        sub-shape
         """
-        loaded_ais_shape = []
         loaded_h_ais_shape = []
         loaded_subshape_names = []
+        loaded_topods_shape = []
         default_displaying_h_ais_shape = []
 
-        for shape_case in shape_list:
+        # number of cases is a variable used to make the loaded shape color different from the previous one
+        number_of_cases = self.op_viewer.model.rowCount(self.op_viewer.ui_case_treeview.rootIndex())
+
+        # reads every individual shape of the files with its name. Every IGS file contains a name for each shape
+        read_files = readShapeFiles([shape_case[0] for shape_case in shape_list],
+                                    lambda: QtGui.QApplication.processEvents(QtCore.QEventLoop.ExcludeUserInputEvents))
+
+        for shape_case, read_shapes in zip(shape_list, read_files):
+            file_h_ais_shape, file_subshape_names, file_topods_shape = self._fileShapes(shape_case, read_shapes)
+
+            loaded_h_ais_shape.extend(file_h_ais_shape)
+            loaded_subshape_names.extend(file_subshape_names)
+            loaded_topods_shape.extend(file_topods_shape)
+
+        default_displaying_h_ais_shape = uniqueShapes(loaded_h_ais_shape)
 
-            loaded_shape_filename = os.path.basename(shape_case[0])
-            exception_list = shape_case[1]
-            exception_list = list(filter(None, exception_list)) # Mistake-prevention of user filling of exception list
+        # sets the default attributes for ais shapes handles and displays them in the viewer3d context.
+        self.applyShapeAttributes(default_displaying_h_ais_shape,
+                                  color=shape_colordictionary[shape_colorlist[
+                                      (self.op_viewer.default_shape_color + number_of_cases) % len(shape_colorlist)]],
+                                  transparency=self.op_viewer.default_shape_transparency,
+                                  quality=self.op_viewer.default_shape_factor,
+                                  display=True)
 
-            # creates a handle for TdocStd documents
-            h_doc = Handle_TDocStd_Document()
+        return loaded_h_ais_shape, loaded_subshape_names, loaded_topods_shape
 
-            # create the application
-            app = _XCAFApp.XCAFApp_Application_GetApplication().GetObject()
-            app.NewDocument(TCollection_ExtendedString(""), h_doc)
+    def _fileShapes(self, shape_case, read_shapes):
+        """
+        Creates the AIS Shapes of the sub-shapes read from a file, as described in loadShape().
+
+        @param shape_case [list] Entry of the shape list of loadShape(): path, display exceptions and optionally
+        whether the curves are merged
+        @param read_shapes [list] List of [sub-shape name, TopoDS_Shape] read from the file
+        @return The list of ais_shapes handles (None for not yet built sub-shapes), the list of sub-shape names and the
+        list of TopoDS_Shape of the file
+        """
+        file_h_ais_shape = []
+        file_subshape_names = []
+        file_topods_shape = []
+
+        loaded_shape_filename = os.path.basename(shape_case[0])
+        exception_matcher = ExceptionMatcher(shape_case[1])
+        merge_curves = len(shape_case) > 2 and shape_case[2]
 
-            # get root assembly
-            doc = h_doc.GetObject()
-            h_shape_tool = XCAFDoc_DocumentTool().ShapeTool(doc.Main())
+        # Dictionary of category to the rows of its displayed curves, for merging
+        curve_rows = {}
 
-            # creates a reader responsible for reading an IGS file
-            reader = IGESCAFControl_Reader()
-            reader.ReadFile(shape_case[0])
+        for name_subshape, topods_shape in read_shapes:
+            name = "%s - %s" % (loaded_shape_filename, name_subshape)
 
-            #  Translates currently loaded IGES file into the document
-            reader.Transfer(doc.GetHandle())
+            file_subshape_names.append(name)
+            file_topods_shape.append(topods_shape)
 
-            # labels for the shapes. Every IGS file contains a name for each individual shape
-            labels = TDF_LabelSequence()
+            if exception_matcher.isException(name_subshape):
+                file_h_ais_shape.append(None)
+                continue
 
-            shape_tool = h_shape_tool.GetObject()
-            shape_tool.GetShapes(labels)
+            if merge_curves and not TopExp_Explorer(topods_shape, TopAbs_FACE).More():
+                curve_rows.setdefault(subShapeCategory(name_subshape), []).append(len(file_h_ais_shape))
+                file_h_ais_shape.append(None)
+                continue
 
-            # gets the number of individual shapes contained in the igs file
-            nb = reader.NbShapes()
+            file_h_ais_shape.append(AIS_ColoredShape(topods_shape).GetHandle())
 
-            # for each individual shape gets the label nad creates a AIS_Shape for data contained in reader.Shape()
-            for i in range(1, nb + 1):
-                label = labels.Value(i)
+        for rows in curve_rows.values():
+            h_ais_shape = self._mergedCurves([file_topods_shape[row] for row in rows])
 
-                h_name = Handle_TDataStd_Name()
-                label.FindAttribute(TDataStd_Name_GetID(), h_name)
-                str_dump = h_name.GetObject().DumpToString()
-                name_subshape = str_dump.split('|')[-2]
-                name = "%s - %s" % (loaded_shape_filename, name_subshape)
+            for row in rows:
+                file_h_ais_shape[row] = h_ais_shape
 
-                loaded_subshape_names.append(name)
+        return file_h_ais_shape, file_subshape_names, file_topods_shape
 
-                shape = AIS_ColoredShape(reader.Shape(i))
-                loaded_ais_shape.append(shape)
-                loaded_h_ais_shape.append(shape.GetHandle())
+    def reloadShapeFile(self, case_node, shape_case):
+        """
+        Replaces the sub-shapes of a case read from a file by the ones of the file as it is now.
+
+        Only the rows of the file are replaced, the other files of the case are kept. The display state of the case is
+        preserved: if the file still has the same number of sub-shapes, each new sub-shape gets the properties and the
+        visibility of the one it replaces, otherwise the new sub-shapes get the properties of the case.
 
-                if not any(iterator in name_subshape for iterator in exception_list):
-                    default_displaying_h_ais_shape.append(shape.GetHandle())
+        @param case_node [CaseNode] The case
+        @param shape_case [list] Entry of the shape list of loadShape() for the file
+        @return None
+        """
+        context = self.op_viewer.display.Context
 
-                self.op_viewer.master_shape_list.append(shape.GetHandle())
+        file_prefix = os.path.basename(shape_case[0]) + " - "
+        old_rows = [row for row, name in enumerate(case_node._supshape_names) if name.startswith(file_prefix)]
 
-            # number of cases is a variable used to make the loaded shape color different from the previous one
-            number_of_cases = self.op_viewer.model.rowCount(self.op_viewer.ui_case_treeview.rootIndex())
+        read_shapes = readShapeFiles([shape_case[0]], lambda: QtGui.QApplication.processEvents(
+            QtCore.QEventLoop.ExcludeUserInputEvents))[0]
 
-            # sets the default attributes for ais shapes handles
-            for h_ais_shape in loaded_h_ais_shape:
-                self.op_viewer.display.Context.SetDeviationCoefficient(h_ais_shape,
-                                                                       self.op_viewer.DC /
-                                                                       self.op_viewer.default_shape_factor)
-                self.op_viewer.display.Context.SetHLRDeviationCoefficient(h_ais_shape,
-                                                                          self.op_viewer.DC_HLR /
-                                                                          self.op_viewer.default_shape_factor)
-                self.op_viewer.display.Context.SetColor(h_ais_shape,
-                                              shape_colordictionary[shape_colorlist[
-                                                  (self.op_viewer.default_shape_color + number_of_cases) %
-                                                  len(shape_colorlist)]])
+        file_h_ais_shape, file_subshape_names, file_topods_shape = self._fileShapes(shape_case, read_shapes)
 
-                self.op_viewer.display.Context.SetTransparency(h_ais_shape, self.op_viewer.default_shape_transparency)
+        # A file not loaded before is appended to the case
+        start = old_rows[0] if old_rows else len(case_node._supshape_names)
 
-        # displays the handles of the ais_shapes in the viewer3d context.
-        for h_ais_shape in default_displaying_h_ais_shape:
-            self.op_viewer.display.Context.Display(h_ais_shape)
+        displayed_rows = set(row for row, h_ais_shape in enumerate(case_node.shapeHAIS())
+                             if h_ais_shape is not None and context.IsDisplayed(h_ais_shape))
 
+        if len(old_rows) == len(file_subshape_names):
+            subshape_refs = [case_node.subshape[row] for row in old_rows]
+            file_displayed_rows = [row for row in old_rows if row in displayed_rows]
+        else:
+            subshape_refs = [[list(case_node.shapeTransformation()), case_node.shapeTransparency(),
+                              case_node.shapeColor(), case_node.shapeQuality()] for name in file_subshape_names]
+            file_displayed_rows = [start + row for row, h_ais_shape in enumerate(file_h_ais_shape)
+                                   if h_ais_shape is not None]
 
-        return loaded_h_ais_shape, loaded_subshape_names
+        for h_ais_shape in uniqueShapes(case_node.shapeHAIS()[row] for row in old_rows):
+            if case_node.shapeGroup() is not None:
+                case_node.shapeGroup().GetObject().RemoveChild(h_ais_shape)
+            context.Remove(h_ais_shape, False)
+
+        for h_ais_shape in uniqueShapes(file_h_ais_shape):
+            if case_node.shapeGroup() is not None:
+                case_node.shapeGroup().GetObject().AddChild(h_ais_shape)
+
+        case_node.replaceSubShapes(start, len(old_rows), file_h_ais_shape, file_subshape_names, file_topods_shape,
+                                   subshape_refs)
+
+        # The rows after the file are shifted by the difference of its number of sub-shapes
+        shift = len(file_subshape_names) - len(old_rows)
+        displayed_rows = [row for row in displayed_rows if row < start] + \
+                         [row + shift for row in displayed_rows if row >= start + len(old_rows)] + \
+                         file_displayed_rows
+
+        self.op_viewer.shape_registry.replaceShapes(case_node, case_node.shapeHAIS())
+        self.restoreCaseDisplay(case_node, displayed_rows)
+
+    @staticmethod
+    def _mergedCurves(topods_shapes):
+        """
+        Creates a single AIS Shape for a group of curves.
+
+        @param topods_shapes [list] The TopoDS_Shape of each curve
+        @return [Handle_AIS_InteractiveObject] The handle of the AIS_ColoredShape of the compound of the curves
+        """
+        builder = BRep_Builder()
+        compound = TopoDS_Compound()
+        builder.MakeCompound(compound)
+
+        for topods_shape in topods_shapes:
+            builder.Add(compound, topods_shape)
+
+        return AIS_ColoredShape(compound).GetHandle()
+
+    def buildSubShape(self, case_node, index):
+        """
+        Builds the AIS Shape of a sub-shape that was deferred by loadShape().
+
+        The AIS_ColoredShape is created from the TopoDS_Shape kept in the case node and receives the sub-shape
+        properties stored in CaseNode.subshape, so it looks as if it had been loaded with the case. If the sub-shape
+        was already built, its handle is simply returned.
+
+        @param case_node [CaseNode] The case that owns the sub-shape
+        @param index [int] Index of the sub-shape in the case, same as the row in ui_subcase_list
+        @return [Handle_AIS_InteractiveObject] The handle of the AIS Shape of the sub-shape
+        """
+        h_ais_shape = case_node.shapeHAIS()[index]
+
+        if h_ais_shape is not None:
+            return h_ais_shape
+
+        subshape_ref = case_node.subshape[index]
+
+        shape = AIS_ColoredShape(case_node.shapeTopoDS()[index])
+        h_ais_shape = shape.GetHandle()
+
+        # The sub-shape becomes a child of the case group, so its location is set relative to the group location.
+        location = self._transformationLocation(subshape_ref[0])
+
+        if case_node.shapeGroup() is not None:
+            case_node.shapeGroup().GetObject().AddChild(h_ais_shape)
+            group_transf = self.op_viewer.display.Context.Location(case_node.shapeGroup()).Transformation()
+            location = TopLoc_Location(group_transf.Inverted() * location.Transformation())
+            case_node.locationOverrides().add(index)
+
+        self.applyShapeAttributes([h_ais_shape],
+                                  color=shape_colordictionary[shape_colorlist[subshape_ref[2]]],
+                                  transparency=subshape_ref[1],
+                                  quality=subshape_ref[3],
+                                  location=location,
+                                  update=False)
+
+        case_node.setSubShapeHAIS(index, h_ais_shape)
+        case_node.setSubShapeBVH(None)
+        self.op_viewer.shape_registry.add(case_node, h_ais_shape)
+
+        return h_ais_shape
+
+    def groupCaseShapes(self, case_node):
+        """
+        Groups the built sub-shapes of a case under a single parent object.
+
+        The parent is an AIS_MultipleConnectedInteractive without connected objects of its own. The sub-shapes are
+        added as its children, so the location set to the parent moves the whole case with a single location change.
+        The location of each sub-shape is then relative to the parent and is used for sub-shape overrides.
+
+        @param case_node [CaseNode] The case whose sub-shapes are grouped
+        @return None
+        """
+        group = AIS_MultipleConnectedInteractive()
+        h_group = group.GetHandle()
+
+        for h_ais_shape in uniqueShapes(case_node.shapeHAIS()):
+            group.AddChild(h_ais_shape)
+
+        case_node.setShapeGroup(h_group)
+
+    def _selectedRows(self):
+        """
+        Returns the rows of the sub-shapes selected in the sub-shape list and of the ones sharing their AIS Shape.
+
+        Merged curves share the handle of their compound, so a property set to one of them is set to all of them. The
+        rows of the case node are kept consistent with what is displayed.
+
+        @return [list] The rows in ascending order
+        """
+        h_ais_shapes = self.op_viewer.case_node.shapeHAIS()
+        rows = set(index.row() for index in self.op_viewer.ui_subcase_list.selectedIndexes())
+        selected_ids = set(id(h_ais_shapes[row]) for row in rows if h_ais_shapes[row] is not None)
+
+        rows.update(row for row, h_ais_shape in enumerate(h_ais_shapes)
+                    if h_ais_shape is not None and id(h_ais_shape) in selected_ids)
+
+        return sorted(rows)
 
     def setQuality(self):
         """
@@ -168,23 +338,21 @@ class ShapeManager(object):
 
         factor = self.op_viewer.ui_shape_quality_dspn.value()
 
-        for i in range(0, len(self.op_viewer.current_h_ais_shape)):
-            self.op_viewer.display.Context.SetDeviationCoefficient(self.op_viewer.current_h_ais_shape[i],
-                                                                   self.op_viewer.DC / factor)
-            self.op_viewer.display.Context.SetHLRDeviationCoefficient(self.op_viewer.current_h_ais_shape[i],
-                                                                      self.op_viewer.DC_HLR / factor)
+        self.applyShapeAttributes(self.op_viewer.current_h_ais_shape, quality=factor)
 
         if self.op_viewer.selectionMode == "surf":
             if self.op_viewer.ui_subcase_list.count() / 2 < len(self.op_viewer.ui_subcase_list.selectedIndexes()):
                 self.op_viewer.case_node.setShapeQuality(factor)
 
-            for i in range(0, len(self.op_viewer.ui_subcase_list.selectedIndexes())):
-                self.op_viewer.case_node.subshape[self.op_viewer.ui_subcase_list.selectedIndexes()[i].row()][3] = factor
+            for row in self._selectedRows():
+                self.op_viewer.case_node.subshape[row][3] = factor
 
         if self.op_viewer.selectionMode == "shape":
             for i in range(0, len(self.op_viewer.case_node.subshape)):
                 self.op_viewer.case_node.subshape[i][3] = factor
 
+        self.op_viewer.model.invalidateNode(self.op_viewer.case_node)
+
     def setTransparency(self):
         """
         Sets transparency to the current working AIS Shape
@@ -197,8 +365,7 @@ class ShapeManager(object):
 
         transparency = self.op_viewer.ui_shape_transparency_dspn.value()
 
-        for i in range(0, len(self.op_viewer.current_h_ais_shape)):
-            self.op_viewer.display.Context.SetTransparency(self.op_viewer.current_h_ais_shape[i], transparency)
+        self.applyShapeAttributes(self.op_viewer.current_h_ais_shape, transparency=transparency)
 
         if self.op_viewer.selectionMode == "surf":
             # If the selected items is the majority of the list, then the property is set to the whole Case
@@ -206,14 +373,15 @@ class ShapeManager(object):
                 self.op_viewer.case_node.setShapeTransparency(transparency)
 
             # set the properties to to the selected shapes
-            for i in range(0, len(self.op_viewer.ui_subcase_list.selectedIndexes())):
-                index = self.op_viewer.ui_subcase_list.selectedIndexes()[i]
-                self.op_viewer.case_node.subshape[index.row()][1] = transparency
+            for row in self._selectedRows():
+                self.op_viewer.case_node.subshape[row][1] = transparency
 
         if self.op_viewer.selectionMode == "shape":
             for i in range(0, len(self.op_viewer.case_node.subshape)):
                 self.op_viewer.case_node.subshape[i][1] = transparency
 
+        self.op_viewer.model.invalidateNode(self.op_viewer.case_node)
+
     def setColor(self):
         """
         Sets color to the current working AIS Shape
@@ -227,25 +395,26 @@ class ShapeManager(object):
         current_color_combo = self.op_viewer.ui_shape_setcolor_combo.currentText()
         current_color_index_combo = self.op_viewer.ui_shape_setcolor_combo.currentIndex()
 
-        for i in range(0, len(self.op_viewer.current_h_ais_shape)):
-            self.op_viewer.display.Context.SetColor(self.op_viewer.current_h_ais_shape[i], shape_colordictionary[current_color_combo])
+        self.applyShapeAttributes(self.op_viewer.current_h_ais_shape, color=shape_colordictionary[current_color_combo])
 
-            self.op_viewer.model.dataChanged.emit(self.op_viewer.ui_case_treeview.currentIndex(),
-                                                  self.op_viewer.ui_case_treeview.indexAbove(self.op_viewer.ui_case_treeview.currentIndex()))
+        self.op_viewer.model.dataChanged.emit(self.op_viewer.ui_case_treeview.currentIndex(),
+                                              self.op_viewer.ui_case_treeview.indexAbove(self.op_viewer.ui_case_treeview.currentIndex()))
 
         if self.op_viewer.selectionMode == "surf":
             # If the selected items is the majority of the list, then the property is set to the whole Case
             if self.op_viewer.ui_subcase_list.count() / 2 < len(self.op_viewer.ui_subcase_list.selectedIndexes()):
                 self.op_viewer.case_node.setShapeColor(current_color_index_combo)
 
-            for i in range(0, len(self.op_viewer.ui_subcase_list.selectedIndexes())):
-                index = self.op_viewer.ui_subcase_list.selectedIndexes()[i]
-                self.op_viewer.case_node.subshape[index.row()][2] = current_color_index_combo
+            for row in self._selectedRows():
+                self.op_viewer.case_node.subshape[row][2] = current_color_index_combo
 
         if self.op_viewer.selectionMode == "shape":
             for i in range(0, len(self.op_viewer.case_node.subshape)):
                 self.op_viewer.case_node.subshape[i][2] = current_color_index_combo
 
+        # The signal above was sent before the color of the case was set
+        self.op_viewer.model.invalidateNode(self.op_viewer.case_node)
+
         # self.display.Context.HilightWithColor(self.h_aisshape, Quantity_NOC_WHITE)
 
         return
@@ -264,13 +433,6 @@ class ShapeManager(object):
 
         rotataxis_index_combo = self.op_viewer.ui_shape_rotataxis_combo.currentIndex()
 
-        if self.op_viewer.ui_shape_rotataxis_combo.currentText() == "Z":
-            ax1 = gp_Ax1(gp_Pnt(0., 0., 0.), gp_Dir(0, 0, 1))
-        elif self.op_viewer.ui_shape_rotataxis_combo.currentText() == "Y":
-            ax1 = gp_Ax1(gp_Pnt(0., 0., 0.), gp_Dir(0, 1, 0))
-        elif self.op_viewer.ui_shape_rotataxis_combo.currentText() == "X":
-            ax1 = gp_Ax1(gp_Pnt(0., 0., 0.), gp_Dir(1, 0, 0))
-
         # Retrieve the displacements set by user
 
         x = float(self.op_viewer.ui_shape_xdispl_dspn.value())
@@ -278,28 +440,37 @@ class ShapeManager(object):
         z = float(self.op_viewer.ui_shape_zdispl_dspn.value())
         teta = float(self.op_viewer.ui_shape_tetarotat_dspn.value()) * pi / 180
 
-        # creates objects of shape transformation (Returns the identity transformation),
-        # one for axial and other for x, y, z coordinates
-        transf_teta = gp_Trsf()
-        transf_xyz = gp_Trsf()
+        cube_toploc = self._transformationLocation([x, y, z, teta / pi * 180, rotataxis_index_combo])
 
-        transf_teta.SetRotation(ax1, teta)
+        context = self.op_viewer.display.Context
+        case_node = self.op_viewer.case_node
 
-        transf_xyz.SetTranslation(gp_Vec(x, y, z))
+        if self.op_viewer.selectionMode == "shape":
+            # The whole case is moved by its group. Sub-shapes that had their own transformation follow the case again.
+            context.SetLocation(case_node.shapeGroup(), cube_toploc)
 
-        # Calculates the transformation matrix with respect of both transformations.
-        transf_matrix = transf_xyz * transf_teta
+            for index in case_node.locationOverrides():
+                if case_node.shapeHAIS()[index] is not None:
+                    context.SetLocation(case_node.shapeHAIS()[index], TopLoc_Location())
 
-        # Constructs an local coordinate system object. Note: A Location constructed from a default datum is said
-        # to be "empty".
-        # ref: https://www.opencascade.com/doc/occt-6.9.1/refman/html/class_top_loc___location.html
-        cube_toploc = TopLoc_Location(transf_matrix)
+            # The hierarchy is in the group coordinates, so it only changes if sub-shapes had their own location
+            if case_node.locationOverrides():
+                case_node.setSubShapeBVH(None)
 
-        # Then applies the local coordinate to the current shape
-        for i in range(0, len(self.op_viewer.current_h_ais_shape)):
-            self.op_viewer.display.Context.SetLocation(self.op_viewer.current_h_ais_shape[i], cube_toploc)
+            case_node.locationOverrides().clear()
+            context.UpdateCurrentViewer()
 
         if self.op_viewer.selectionMode == "surf":
+            # The selected sub-shapes are children of the case group, so the location is made relative to it.
+            group_transf = context.Location(case_node.shapeGroup()).Transformation()
+            subshape_toploc = TopLoc_Location(group_transf.Inverted() * cube_toploc.Transformation())
+
+            self.applyShapeAttributes(self.op_viewer.current_h_ais_shape, location=subshape_toploc)
+
+            case_node.locationOverrides().update(self._selectedRows())
+
+            case_node.setSubShapeBVH(None)
+
             # If the selected items is the majority of the list, then the property is set to the whole Case
             if self.op_viewer.ui_subcase_list.count() / 2 < len(self.op_viewer.ui_subcase_list.selectedIndexes()):
                 self.op_viewer.case_node.setShapeTransformation(x, 0)
@@ -308,10 +479,8 @@ class ShapeManager(object):
                 self.op_viewer.case_node.setShapeTransformation(teta / pi * 180, 3)
                 self.op_viewer.case_node.setShapeTransformation(rotataxis_index_combo, 4)
 
-            for i in range(0, len(self.op_viewer.ui_subcase_list.selectedIndexes())):
-                index = self.op_viewer.ui_subcase_list.selectedIndexes()[i]
-                self.op_viewer.case_node.subshape[index.row()][0] = [x, y, z, teta / pi * 180, rotataxis_index_combo]
-
+            for row in self._selectedRows():
+                self.op_viewer.case_node.subshape[row][0] = [x, y, z, teta / pi * 180, rotataxis_index_combo]
 
         if self.op_viewer.selectionMode == "shape":
             for i in range(0, len(self.op_viewer.case_node.subshape)):
@@ -321,20 +490,484 @@ class ShapeManager(object):
                 self.op_viewer.case_node.subshape[i][0][3] = teta / pi * 180
                 self.op_viewer.case_node.subshape[i][0][4] = rotataxis_index_combo
 
-        self.op_viewer.display.Context.UpdateCurrentViewer()
+        self.op_viewer.model.invalidateNode(self.op_viewer.case_node)
 
         return
 
+    def restoreCaseDisplay(self, case_node, displayed_rows):
+        """
+        Displays a case as recorded in a session, after its node received the recorded state.
+
+        The case group is moved to the case transformation. Sub-shapes whose transformation differs from the case one
+        get their own location. Each sub-shape receives its color, transparency and quality, the recorded displayed
+        sub-shapes are built and displayed and the other ones are erased. The viewer is updated once.
+
+        Merged curves share one AIS Shape, which receives the state of the first of their rows and is displayed if any
+        of them was displayed.
+
+        @param case_node [CaseNode] The case, with the state set by data_structure.case_session.applyCaseState()
+        @param displayed_rows [list] Rows of the sub-shapes displayed when the session was saved
+        @return None
+        """
+        context = self.op_viewer.display.Context
+        displayed_rows = set(row for row in displayed_rows if row < len(case_node.subshape))
+
+        if case_node.shapeGroup() is not None:
+            context.SetLocation(case_node.shapeGroup(), self._transformationLocation(case_node.shapeTransformation()))
+
+        # Dictionary of id of a shared AIS Shape to its rows
+        shared_rows = {}
+
+        for row, h_ais_shape in enumerate(case_node.shapeHAIS()):
+            if h_ais_shape is not None:
+                shared_rows.setdefault(id(h_ais_shape), []).append(row)
+
+        for row, subshape_ref in enumerate(case_node.subshape):
+            h_ais_shape = case_node.shapeHAIS()[row]
+
+            if h_ais_shape is None:
+                # Built with the attributes of the sub-shape
+                if row in displayed_rows:
+                    context.Display(self.buildSubShape(case_node, row), False)
+                continue
+
+            handle_rows = shared_rows[id(h_ais_shape)]
+
+            # Already set with the first row of the shared AIS Shape
+            if row != handle_rows[0]:
+                continue
+
+            # Sub-shapes with the case transformation follow the group
+            location = TopLoc_Location()
+            case_node.locationOverrides().difference_update(handle_rows)
+
+            if [float(value) for value in subshape_ref[0]] != \
+                    [float(value) for value in case_node.shapeTransformation()]:
+                location = self._transformationLocation(subshape_ref[0])
+
+                if case_node.shapeGroup() is not None:
+                    group_transf = context.Location(case_node.shapeGroup()).Transformation()
+                    location = TopLoc_Location(group_transf.Inverted() * location.Transformation())
+                    case_node.locationOverrides().update(handle_rows)
+
+            self.applyShapeAttributes([h_ais_shape],
+                                      color=shape_colordictionary[shape_colorlist[subshape_ref[2]]],
+                                      transparency=subshape_ref[1],
+                                      quality=subshape_ref[3],
+                                      location=location,
+                                      update=False)
+
+            # The state of the other rows follows the one of the AIS Shape
+            for shared_row in handle_rows[1:]:
+                case_node.subshape[shared_row] = [list(subshape_ref[0])] + list(subshape_ref[1:])
+
+            if displayed_rows.intersection(handle_rows):
+                context.Display(h_ais_shape, False)
+            elif context.IsDisplayed(h_ais_shape):
+                context.Erase(h_ais_shape, False)
+
+        case_node.setSubShapeBVH(None)
+        context.UpdateCurrentViewer()
+
+        self.updateMeshMemory(case_node)
+
+    def applyShapeAttributes(self, h_ais_shapes, color=None, transparency=None, quality=None, location=None,
+                             display=False, update=True):
+        """
+        Applies display attributes to a group of AIS Shapes refreshing the viewer only once.
+
+        Every call to the AIS context is made with the viewer update suppressed. Only the attributes that are not
+        None are applied. After all shapes are modified, a single UpdateCurrentViewer is issued, so modifying a case
+        with hundreds of sub-shapes costs one redraw.
+
+        @param h_ais_shapes [list] Handles of the AIS Shapes to be modified
+        @param color [Quantity_NameOfColor] Color, as in shape_colordictionary
+        @param transparency [float] Transparency from 0 to 1
+        @param quality [float] Quality factor. The deviation coefficients become the default ones divided by it
+        @param location [TopLoc_Location] Location to be set to the shapes
+        @param display [bool] Displays the shapes after setting the attributes
+        @param update [bool] Issues the viewer update at the end. False lets the caller update it later
+        @return None
+        """
+        context = self.op_viewer.display.Context
+
+        for h_ais_shape in h_ais_shapes:
+            if quality is not None:
+                context.SetDeviationCoefficient(h_ais_shape, self.op_viewer.DC / quality, False)
+                context.SetHLRDeviationCoefficient(h_ais_shape, self.op_viewer.DC_HLR / quality, False)
+
+            if color is not None:
+                context.SetColor(h_ais_shape, color, False)
+
+            if transparency is not None:
+                context.SetTransparency(h_ais_shape, transparency, False)
+
+            if location is not None:
+                context.SetLocation(h_ais_shape, location)
+
+            if display:
+                context.Display(h_ais_shape, False)
+
+        if update:
+            context.UpdateCurrentViewer()
+
+    @staticmethod
+    def _transformationLocation(transformation):
+        """
+        Creates the local coordinate system of a transformation as stored in CaseNode.
+
+        gp_Ax1 describes an axis in 3D space. An axis is defined by a point (gp_Pnt) and a direction (gp_Dir) reference
+
+        @param transformation [list] Transformation in the CaseNode format: [x, y, z, theta in degrees, axis index],
+        where the axis index follows ui_shape_rotataxis_combo: X:0, Y:1, Z:2
+        @return [TopLoc_Location] The location to be applied to AIS Shapes
+        """
+        rotataxis_index = int(transformation[4])
+
+        if rotataxis_index == 2:
+            ax1 = gp_Ax1(gp_Pnt(0., 0., 0.), gp_Dir(0, 0, 1))
+        elif rotataxis_index == 1:
+            ax1 = gp_Ax1(gp_Pnt(0., 0., 0.), gp_Dir(0, 1, 0))
+        else:
+            ax1 = gp_Ax1(gp_Pnt(0., 0., 0.), gp_Dir(1, 0, 0))
+
+        # creates objects of shape transformation (Returns the identity transformation),
+        # one for axial and other for x, y, z coordinates
+        transf_teta = gp_Trsf()
+        transf_xyz = gp_Trsf()
+
+        transf_teta.SetRotation(ax1, float(transformation[3]) * pi / 180)
+
+        transf_xyz.SetTranslation(gp_Vec(float(transformation[0]), float(transformation[1]), float(transformation[2])))
+
+        # Calculates the transformation matrix with respect of both transformations.
+        transf_matrix = transf_xyz * transf_teta
+
+        # Constructs an local coordinate system object. Note: A Location constructed from a default datum is said
+        # to be "empty".
+        # ref: https://www.opencascade.com/doc/occt-6.9.1/refman/html/class_top_loc___location.html
+        return TopLoc_Location(transf_matrix)
+
+    def setShadedDrawMode(self, face_boundary):
+        """
+        Sets the shaded draw mode with or without the face boundaries drawn ("Flat lines" or "Shaded").
+
+        The face boundary aspect is set in the drawer of each presentation. Only shapes that have faces are affected,
+        so curves are left untouched. Displayed shapes have only their current presentation recomputed, with the
+        viewer update suppressed, and hidden shapes are just marked to be updated when displayed again. The viewer is
+        redrawn once at the end.
+
+        @param face_boundary [bool] True for drawing face boundaries (Flat lines), False for plain shading
+        @return None
+        """
+        context = self.op_viewer.display.Context
+
+        # The default drawer is used by the shapes loaded after the switch
+        context.DefaultDrawer().GetObject().SetFaceBoundaryDraw(face_boundary)
+        context.SetDisplayMode(AIS_Shaded, False)
+
+        for h_ais_shape in self.op_viewer.shape_registry.shapes():
+            ais_shape = h_ais_shape.GetObject()
+
+            if not TopExp_Explorer(ais_shape.Shape(), TopAbs_FACE).More():
+                continue
+
+            drawer = ais_shape.Attributes().GetObject()
+
+            if drawer.IsFaceBoundaryDraw() == face_boundary:
+                continue
+
+            drawer.SetFaceBoundaryDraw(face_boundary)
+
+            if context.IsDisplayed(h_ais_shape):
+                context.RecomputePrsOnly(h_ais_shape, False, False)
+            else:
+                ais_shape.SetToUpdate()
+
+        context.UpdateCurrentViewer()
+
+    def setFullWheel(self, n_blades):
+        """
+        Displays the whole wheel of the current case by showing rotated instances of its blade passage.
+
+        BladePro writes a single blade passage. For each displayed sub-shape of the case, n_blades - 1 instances of
+        AIS_ConnectedInteractive are created and rotated around the Z axis, the axis of the machine. The instances
+        are connected to the AIS Shape of the passage, so they share its triangulation and presentation instead of
+        copying the geometry. Calling it with n_blades lower than 2 removes the instances of the case.
+
+        @param n_blades [int] Number of blades of the wheel, e.g. the CFT-GEO ui_read_cftgeo_nblades_spn value
+        @return None
+        """
+        if self._exceptionCatch():
+            return
+
+        context = self.op_viewer.display.Context
+        case_node = self.op_viewer.case_node
+
+        # Previous instances are removed, so the wheel can be re-created with another number of blades
+        for h_instance in case_node.wheelInstances():
+            context.Remove(h_instance, False)
+
+        wheel_instances = []
+
+        if n_blades > 1:
+            machine_axis = gp_Ax1(gp_Pnt(0., 0., 0.), gp_Dir(0, 0, 1))
+
+            for h_ais_shape in uniqueShapes(case_node.shapeHAIS()):
+                if not context.IsDisplayed(h_ais_shape):
+                    continue
+
+                # The rotation of the instance is made in the passage coordinates, then the passage location relative
+                # to the case group is applied
+                passage_transf = context.Location(h_ais_shape).Transformation()
+
+                for blade in range(1, n_blades):
+                    transf_blade = gp_Trsf()
+                    transf_blade.SetRotation(machine_axis, 2 * pi * blade / n_blades)
+
+                    instance = AIS_ConnectedInteractive()
+                    instance.Connect(h_ais_shape)
+                    h_instance = instance.GetHandle()
+
+                    # Instances are children of the case group, so they follow the case transformations
+                    case_node.shapeGroup().GetObject().AddChild(h_instance)
+                    context.SetLocation(h_instance, TopLoc_Location(passage_transf * transf_blade))
+                    context.Display(h_instance, False)
+
+                    wheel_instances.append(h_instance)
+
+        case_node.setWheelInstances(wheel_instances)
+        context.UpdateCurrentViewer()
+
+    def caseBVH(self, case_node):
+        """
+        Returns the bounding volume hierarchy of the built sub-shapes of a case, building it if needed.
+
+        The boxes are in the coordinates of the case group, so moving the whole case does not change the hierarchy.
+        It is dropped by buildSubShape() and setTranslation() when sub-shapes are added or moved inside the case.
+
+        @param case_node [CaseNode] The case
+        @return [ShapeBVH] The hierarchy, whose indexes are the rows of the sub-shapes
+        """
+        if case_node.subShapeBVH() is None:
+            context = self.op_viewer.display.Context
+
+            # Merged curves are indexed by the row of their first curve
+            first_rows = {}
+            for row, h_ais_shape in enumerate(case_node.shapeHAIS()):
+                if h_ais_shape is not None:
+                    first_rows.setdefault(id(h_ais_shape), row)
+
+            indexed_boxes = [(first_rows[id(h_ais_shape)],
+                              shapeBox(h_ais_shape.GetObject().Shape(), context.Location(h_ais_shape).Transformation()))
+                             for h_ais_shape in uniqueShapes(case_node.shapeHAIS())]
+
+            case_node.setSubShapeBVH(ShapeBVH(indexed_boxes))
+
+        return case_node.subShapeBVH()
+
+    def pickSubShape(self, x, y):
+        """
+        Finds the displayed sub-shape under a point of the viewer.
+
+        The line of sight of the point is taken to the coordinates of each case group and tested against the
+        bounding volume hierarchy of the case, so only sub-shapes whose box is crossed are intersected with the
+        line. Candidates are tested front to back and the search stops as soon as the next box is behind the nearest
+        intersection found. Curves, which cannot be intersected, are picked if they pass within curve_pick_tolerance
+        pixels of the line, see _curveDepth().
+
+        @param x [int] Horizontal position of the point in the viewer, in pixels
+        @param y [int] Vertical position of the point in the viewer, in pixels
+        @return [tuple] (CaseNode, row of the sub-shape), or (None, None) if there is nothing under the point
+        """
+        context = self.op_viewer.display.Context
+        view = self.op_viewer.display.View
+
+        x_p, y_p, z_p, v_x, v_y, v_z = view.ConvertWithProj(x, y)
+
+        # The projection vector is made to point from the eye into the scene, so parameters grow with depth
+        eye = view.Eye()
+        if (x_p - eye[0]) * v_x + (y_p - eye[1]) * v_y + (z_p - eye[2]) * v_z < 0:
+            v_x, v_y, v_z = -v_x, -v_y, -v_z
+
+        # Tolerance of curves in model units, the same for every case because group transformations are rigid
+        curve_tolerance = view.Convert(self.curve_pick_tolerance)
+
+        picked = (None, None)
+        picked_depth = float("inf")
+
+        for case_node in self.op_viewer.shape_registry.cases():
+            group_transf = context.Location(case_node.shapeGroup()).Transformation().Inverted()
+
+            origin = gp_Pnt(x_p, y_p, z_p).Transformed(group_transf)
+            direction = gp_Dir(v_x, v_y, v_z).Transformed(group_transf)
+            line = gp_Lin(origin, direction)
+
+            # The group transformation is rigid, so the parameters of every case are comparable
+            for t_entry, row in self.caseBVH(case_node).lineQuery(origin.Coord(), direction.Coord()):
+                if t_entry >= picked_depth:
+                    break
+
+                h_ais_shape = case_node.shapeHAIS()[row]
+                if not context.IsDisplayed(h_ais_shape):
+                    continue
+
+                topods_shape = h_ais_shape.GetObject().Shape().Moved(context.Location(h_ais_shape))
+
+                if not TopExp_Explorer(topods_shape, TopAbs_FACE).More():
+                    curve_depth = self._curveDepth(topods_shape, line, t_entry, curve_tolerance)
+
+                    if curve_depth is not None and curve_depth < picked_depth:
+                        picked = (case_node, row)
+                        picked_depth = curve_depth
+                    continue
+
+                intersector = BRepIntCurveSurface_Inter()
+                intersector.Init(topods_shape, line, 1e-7)
+
+                while intersector.More():
+                    if intersector.W() < picked_depth:
+                        picked = (case_node, row)
+                        picked_depth = intersector.W()
+                    intersector.Next()
+
+        return picked
+
+    @staticmethod
+    def _curveDepth(topods_shape, line, t_entry, tolerance):
+        """
+        Measures how close a shape without faces, e.g. a stream curve, passes to the line of sight.
+
+        The distance is measured to the segment of the line that crosses the bounding box of the shape, from its entry
+        parameter to the box diagonal beyond it.
+
+        @param topods_shape [TopoDS_Shape] The shape, in the coordinates of the line
+        @param line [gp_Lin] The line of sight
+        @param t_entry [float] Parameter of the line where it enters the box of the shape
+        @param tolerance [float] Maximum distance, in model units
+        @return [float] Parameter of the line at the nearest point of the shape, or None if it is farther than tolerance
+        """
+        box = shapeBox(topods_shape)
+        if box is None:
+            return None
+
+        diagonal = sqrt(sum((box[axis + 3] - box[axis]) ** 2 for axis in range(3)))
+
+        segment = BRepBuilderAPI_MakeEdge(line, t_entry - tolerance, t_entry + diagonal + tolerance).Edge()
+        distance = BRepExtrema_DistShapeShape(topods_shape, segment)
+
+        if not distance.IsDone() or distance.NbSolution() == 0 or distance.Value() > tolerance:
+            return None
+
+        nearest = distance.PointOnShape2(1)
+        origin = line.Location()
+        direction = line.Direction()
+
+        return (nearest.X() - origin.X()) * direction.X() + (nearest.Y() - origin.Y()) * direction.Y() + \
+               (nearest.Z() - origin.Z()) * direction.Z()
+
+    @staticmethod
+    def _meshMemory(topods_shape):
+        """
+        Estimates the memory held by the mesh of a shape: its triangulation and the presentation arrays built from it.
+
+        @param topods_shape [TopoDS_Shape] The shape
+        @return [int] Memory in bytes. Shapes without triangulation, e.g. curves, return 0
+        """
+        mesh_memory = 0
+
+        brep_tool = BRep_Tool()
+        explorer = TopExp_Explorer(topods_shape, TopAbs_FACE)
+
+        while explorer.More():
+            h_triangulation = brep_tool.Triangulation(topods_Face(explorer.Current()), TopLoc_Location())
+            explorer.Next()
+
+            if h_triangulation.IsNull():
+                continue
+
+            triangulation = h_triangulation.GetObject()
+            nb_nodes = triangulation.NbNodes()
+            nb_triangles = triangulation.NbTriangles()
+
+            # Triangulation: nodes in doubles and triangles in integers, plus the uv nodes of the face
+            mesh_memory += 24 * nb_nodes + 12 * nb_triangles
+            if triangulation.HasUVNodes():
+                mesh_memory += 16 * nb_nodes
+
+            # Presentation: vertices and normals in floats and the triangle indexes
+            mesh_memory += 24 * nb_nodes + 12 * nb_triangles
+
+        return mesh_memory
+
+    def updateMeshMemory(self, case_node):
+        """
+        Recomputes the estimated mesh memory of the built sub-shapes of a case and stores it in the shape registry.
+
+        @param case_node [CaseNode] The case
+        @return [int] Memory in bytes
+        """
+        mesh_memory = sum(self._meshMemory(h_ais_shape.GetObject().Shape())
+                          for h_ais_shape in self.op_viewer.shape_registry.caseShapes(case_node))
+
+        self.op_viewer.shape_registry.setMeshMemory(case_node, mesh_memory)
+
+        return mesh_memory
+
+    def enforceMeshBudget(self):
+        """
+        Drops meshes of hidden shapes while the mesh memory of the loaded cases is above the budget of preferences.
+
+        The cases are visited from the least to the most recently viewed. Only shapes erased from the viewer lose
+        their presentations and triangulation, so nothing visible changes. They are meshed again by the context when
+        displayed. The current case and cases showing a full wheel, whose instances share the presentations of the
+        passage, are kept.
+
+        @return None
+        """
+        budget = self.op_viewer.default_mesh_budget * 1024 * 1024
+        registry = self.op_viewer.shape_registry
+
+        if budget <= 0 or registry.meshMemory() <= budget:
+            return
+
+        context = self.op_viewer.display.Context
+
+        for case_node in registry.casesByLastView():
+            if case_node is self.op_viewer.case_node or case_node.wheelInstances():
+                continue
+
+            if registry.meshMemory(case_node) == 0:
+                continue
+
+            for h_ais_shape in registry.caseShapes(case_node):
+                if context.IsDisplayed(h_ais_shape):
+                    continue
+
+                # Wireframe, shaded and bounding box presentations
+                for display_mode in range(0, 3):
+                    context.ClearPrs(h_ais_shape, display_mode, False)
+
+                breptools_Clean(h_ais_shape.GetObject().Shape())
+
+            self.updateMeshMemory(case_node)
+
+            if registry.meshMemory() <= budget:
+                break
+
     def hideShape(self):
         """
         Method for hiding selected shape.
 
+        The meshes of hidden shapes may be dropped if the mesh memory budget is exceeded.
+
         @return None
         """
         if self._exceptionCatch():
             return
 
         self.op_viewer.display.Context.EraseSelected()
+        self.enforceMeshBudget()
 
     def displayShape(self):
         """
@@ -345,9 +978,20 @@ class ShapeManager(object):
         if self._exceptionCatch():
             return
 
+        # Sub-shapes deferred by loadShape() are built and displayed the first time the user displays them.
+        if self.op_viewer.selectionMode == "surf":
+            for index in self.op_viewer.ui_subcase_list.selectedIndexes():
+                if self.op_viewer.case_node.shapeHAIS()[index.row()] is None:
+                    h_ais_shape = self.buildSubShape(self.op_viewer.case_node, index.row())
+                    self.op_viewer.display.Context.Display(h_ais_shape, False)
+
         self.op_viewer.display.Context.DisplaySelected()
         self.op_viewer._surfaceChanged()
 
+        # Displayed shapes may have been meshed (again)
+        self.updateMeshMemory(self.op_viewer.case_node)
+        self.enforceMeshBudget()
+
     def _exceptionCatch(self):
         """
         This functions is a exception catcher: if user tries to wrongly set properties when there is nothing to be
@@ -361,3 +1005,8 @@ class ShapeManager(object):
         if self.op_viewer.current_h_ais_shape is None or number_of_cases == 0:
             print("Action not feasible")
             return True
+
+        # Groups of cases have no shapes of their own
+        if self.op_viewer.case_node is None or self.op_viewer.case_node.isGroup():
+            print("Action not feasible")
+            return True
@@ -0,0 +1,384 @@
+"""@package occ_modules.shape_reader
+
+File that contains the functions for reading the shapes of CAD files generated by BladePro.
+
+The functions only depend on OCC, so they are used both by occ_modules.shape_properties.ShapeManager, when loading
+cases in the Output Viewer, and by the tools that run without the GUI.
+
+IGES outputs and STEP reference geometries are read the same way. Translating a CAD file is the slowest step of
+loading a case, so the translated shapes are cached in shape_cache_dir as a BRep file with the sub-shape names, keyed
+by the path, size and modification time of the CAD file. Writing an entry removes the older entries of the same file and
+keeps the cache within shape_cache_budget, see pruneCache(). readShapeFiles() translates the files that are not cached
+yet in the worker processes of occ_modules.shape_translator, in parallel, and then reads every file from the cache.
+
+"""
+
+import hashlib
+import json
+import os
+
+from OCC.BRep import BRep_Builder
+from OCC.BRepTools import breptools_Read, breptools_Write
+from OCC.IFSelect import IFSelect_RetDone
+from OCC.IGESCAFControl import IGESCAFControl_Reader
+from OCC.STEPCAFControl import STEPCAFControl_Reader
+from OCC.TDataStd import TDataStd_Name_GetID, Handle_TDataStd_Name
+from OCC.TCollection import TCollection_ExtendedString, TCollection_AsciiString
+from OCC.TDF import TDF_Label, TDF_LabelSequence
+from OCC.TopLoc import TopLoc_Location
+from OCC.TopoDS import TopoDS_Compound, TopoDS_Iterator, TopoDS_Shape
+from OCC.TDocStd import Handle_TDocStd_Document
+from OCC.XCAFApp import _XCAFApp
+from OCC.XCAFDoc import XCAFDoc_DocumentTool
+
+from occ_modules.shape_translator import translateFiles
+
+## Directory of the cached translated shapes
+shape_cache_dir = os.path.join(os.path.expanduser("~"), ".bladepy", "shape_cache")
+
+## Version of the cache entries, part of their key. Increased when entries written before must not be read, e.g.
+# version 1 cached the empty result of files that failed to be read and version 2 the root of STEP assemblies
+shape_cache_version = 3
+
+## Maximum size of the shape cache in MB. When it is exceeded, the entries used least recently are removed
+shape_cache_budget = 2048
+
+## File extensions read as STEP. Any other file is read as IGES
+step_extensions = (".stp", ".step")
+
+
+def readShapeFile(shape_path):
+    """
+    Reads an IGS or STEP file and returns its individual shapes with their names.
+
+    This function uses libraries of iges and step caf control for fetching sub-shape names within the files. STEP
+    assemblies are returned as their parts, see _addStepParts(). It does not use the cache.
+
+    @param shape_path [str] Path of the IGS or STEP file
+    @return [list] List of [sub-shape name, TopoDS_Shape] in the order they are found in the file
+    @exception IOError The file cannot be read or translated, e.g. it is truncated
+    """
+    read_shapes = []
+
+    # creates a handle for TdocStd documents
+    h_doc = Handle_TDocStd_Document()
+
+    # create the application
+    app = _XCAFApp.XCAFApp_Application_GetApplication().GetObject()
+    app.NewDocument(TCollection_ExtendedString(""), h_doc)
+
+    # get root assembly
+    doc = h_doc.GetObject()
+    h_shape_tool = XCAFDoc_DocumentTool().ShapeTool(doc.Main())
+
+    is_step = shape_path.lower().endswith(step_extensions)
+
+    # creates a reader responsible for reading an IGS or STEP file
+    if is_step:
+        reader = STEPCAFControl_Reader()
+    else:
+        reader = IGESCAFControl_Reader()
+
+    if reader.ReadFile(shape_path) != IFSelect_RetDone:
+        raise IOError("%s could not be read" % shape_path)
+
+    #  Translates currently loaded file into the document
+    if not reader.Transfer(doc.GetHandle()):
+        raise IOError("%s could not be translated" % shape_path)
+
+    shape_tool = h_shape_tool.GetObject()
+
+    if is_step:
+        # STEP reference geometries are assemblies, their parts are found by walking the components of the free shapes
+        labels = TDF_LabelSequence()
+        shape_tool.GetFreeShapes(labels)
+
+        for i in range(1, labels.Length() + 1):
+            _addStepParts(shape_tool, labels.Value(i), _labelName(labels.Value(i)), TopLoc_Location(), read_shapes)
+
+        return read_shapes
+
+    # labels for the shapes. Every IGS file contains a name for each individual shape
+    labels = TDF_LabelSequence()
+    shape_tool.GetShapes(labels)
+
+    # for each individual shape gets the label name and the shape contained in reader.Shape()
+    for i in range(1, reader.NbShapes() + 1):
+        read_shapes.append([_labelName(labels.Value(i)), reader.Shape(i)])
+
+    return read_shapes
+
+
+def _labelName(label):
+    """
+    Returns the name of a label of a CAF document, or an empty string if it has none. Non-ASCII characters are
+    replaced by "?".
+    """
+    h_name = Handle_TDataStd_Name()
+    if label.FindAttribute(TDataStd_Name_GetID(), h_name):
+        return TCollection_AsciiString(h_name.GetObject().Get(), "?").ToCString()
+
+    return ""
+
+
+def _addStepParts(shape_tool, label, name_subshape, location, read_shapes):
+    """
+    Adds the parts of a STEP assembly to the list of read shapes.
+
+    The assembly tree is walked depth first. A component references the shape of a part or of a sub-assembly, placed
+    by the location of the component. The parts are named by their component, or by the part they reference when the
+    component has no name, and placed by the locations of all the components above them.
+
+    @param shape_tool [XCAFDoc_ShapeTool] Shape tool of the document
+    @param label [TDF_Label] Label of a free shape or of the shape referenced by a component
+    @param name_subshape [str] Name given to the shape if it is a part
+    @param location [TopLoc_Location] Location of the shape in the assembly
+    @param read_shapes [list] List of [sub-shape name, TopoDS_Shape] where the parts are added
+    @return None
+    """
+    if not shape_tool.IsAssembly(label):
+        read_shapes.append([name_subshape, shape_tool.GetShape(label).Moved(location)])
+        return
+
+    components = TDF_LabelSequence()
+    shape_tool.GetComponents(label, components)
+
+    for i in range(1, components.Length() + 1):
+        component = components.Value(i)
+
+        referred_label = TDF_Label()
+        if not shape_tool.GetReferredShape(component, referred_label):
+            continue
+
+        component_location = location.Multiplied(shape_tool.GetLocation(component))
+
+        _addStepParts(shape_tool, referred_label, _labelName(component) or _labelName(referred_label),
+                      component_location, read_shapes)
+
+
+def _cachePrefix(shape_path):
+    """
+    @return [str] Start of the names of the cache entries of a CAD file, whatever its size and modification time
+    """
+    return hashlib.sha1(os.path.abspath(shape_path).encode("utf-8")).hexdigest()[:16] + "-"
+
+
+def _cachePaths(shape_path):
+    """
+    Returns the paths of the BRep and names files that cache a CAD file.
+
+    @param shape_path [str] Path of the CAD file
+    @return [tuple] Path of the BRep file and path of the JSON file with the sub-shape names
+    """
+    shape_stat = os.stat(shape_path)
+    key = "%d|%s|%d|%f" % (shape_cache_version, os.path.abspath(shape_path), shape_stat.st_size,
+                            shape_stat.st_mtime)
+
+    # The name starts with a hash of the path only, so the older entries of a file are found by it
+    cache_name = _cachePrefix(shape_path) + hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    return os.path.join(shape_cache_dir, cache_name + ".brep"), os.path.join(shape_cache_dir, cache_name + ".json")
+
+
+def isCached(shape_path):
+    """
+    Tells whether a CAD file has an up to date cache.
+
+    @param shape_path [str] Path of the CAD file
+    @return [bool] True if the cached shapes can be read
+    """
+    brep_path, names_path = _cachePaths(shape_path)
+
+    return os.path.isfile(brep_path) and os.path.isfile(names_path)
+
+
+def _writeCache(shape_path, read_shapes):
+    """
+    Writes the shapes read from a CAD file to the cache. The sub-shapes are stored in order in a single compound.
+
+    Files are written under temporary names and renamed, so an interrupted write never leaves a partial cache.
+
+    @param shape_path [str] Path of the CAD file
+    @param read_shapes [list] List of [sub-shape name, TopoDS_Shape], as returned by readShapeFile()
+    @return None
+    """
+    brep_path, names_path = _cachePaths(shape_path)
+
+    if not os.path.isdir(shape_cache_dir):
+        os.makedirs(shape_cache_dir)
+
+    builder = BRep_Builder()
+    compound = TopoDS_Compound()
+    builder.MakeCompound(compound)
+
+    for name_subshape, topods_shape in read_shapes:
+        builder.Add(compound, topods_shape)
+
+    temp_suffix = ".%d.tmp" % os.getpid()
+
+    if not breptools_Write(compound, brep_path + temp_suffix):
+        raise IOError("Could not write the shape cache of %s" % shape_path)
+
+    with open(names_path + temp_suffix, "w") as names_file:
+        json.dump([name_subshape for name_subshape, topods_shape in read_shapes], names_file)
+
+    os.replace(brep_path + temp_suffix, brep_path)
+    os.replace(names_path + temp_suffix, names_path)
+
+    pruneCache(shape_path)
+
+
+def pruneCache(shape_path=None, budget=None):
+    """
+    Removes entries of the shape cache.
+
+    The older entries of a CAD file, written before it was modified, are never read again, so they are removed. Then,
+    while the cache is larger than the budget, the entries used least recently are removed. Reading an entry touches
+    its BRep file, so its modification time is the last use. Files being written, and files that cannot be removed,
+    e.g. being read by another process on Windows, are skipped.
+
+    @param shape_path [str] CAD file whose older entries are removed. Its current entry is never removed
+    @param budget [float] Maximum size of the cache in MB. None uses shape_cache_budget
+    @return None
+    """
+    if budget is None:
+        budget = shape_cache_budget
+
+    try:
+        dir_entries = list(os.scandir(shape_cache_dir))
+    except OSError:
+        return
+
+    # Dictionary of entry name to [last use, size, list of file paths]
+    cache_entries = {}
+
+    for dir_entry in dir_entries:
+        if dir_entry.name.endswith(".tmp"):
+            continue
+
+        entry_name, extension = os.path.splitext(dir_entry.name)
+
+        try:
+            file_stat = dir_entry.stat()
+        except OSError:
+            continue
+
+        cache_entry = cache_entries.setdefault(entry_name, [0., 0, []])
+        if extension == ".brep":
+            cache_entry[0] = file_stat.st_mtime
+        cache_entry[1] += file_stat.st_size
+        cache_entry[2].append(dir_entry.path)
+
+    current_entry_name = None
+    if shape_path is not None:
+        current_entry_name = os.path.splitext(os.path.basename(_cachePaths(shape_path)[0]))[0]
+        file_prefix = _cachePrefix(shape_path)
+
+        for entry_name in [entry_name for entry_name in cache_entries
+                           if entry_name.startswith(file_prefix) and entry_name != current_entry_name]:
+            _removeCacheFiles(cache_entries.pop(entry_name)[2])
+
+    cache_size = sum(cache_entry[1] for cache_entry in cache_entries.values())
+
+    for entry_name, cache_entry in sorted(cache_entries.items(), key=lambda item: item[1][0]):
+        if cache_size <= budget * 1e6:
+            break
+
+        if entry_name == current_entry_name:
+            continue
+
+        _removeCacheFiles(cache_entry[2])
+        cache_size -= cache_entry[1]
+
+
+def _removeCacheFiles(file_paths):
+    """
+    Removes the files of a cache entry, skipping the ones that cannot be removed.
+    """
+    for file_path in file_paths:
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+
+
+def _readCache(shape_path):
+    """
+    Reads the cached shapes of a CAD file.
+
+    @param shape_path [str] Path of the CAD file
+    @return [list] List of [sub-shape name, TopoDS_Shape], the same as readShapeFile()
+    """
+    brep_path, names_path = _cachePaths(shape_path)
+
+    with open(names_path) as names_file:
+        names = json.load(names_file)
+
+    compound = TopoDS_Shape()
+    if not breptools_Read(compound, brep_path, BRep_Builder()):
+        raise IOError("Could not read the shape cache of %s" % shape_path)
+
+    topods_shapes = []
+    iterator = TopoDS_Iterator(compound)
+    while iterator.More():
+        topods_shapes.append(iterator.Value())
+        iterator.Next()
+
+    if len(topods_shapes) != len(names):
+        raise IOError("Corrupted shape cache of %s" % shape_path)
+
+    # Records the use of the entry, so it is the last to be removed by pruneCache()
+    try:
+        os.utime(brep_path, None)
+    except OSError:
+        pass
+
+    return [[name_subshape, topods_shape] for name_subshape, topods_shape in zip(names, topods_shapes)]
+
+
+def readCachedShapeFile(shape_path):
+    """
+    Reads a CAD file through the cache. Files not cached yet are translated and then cached. Files that cannot be
+    read are not cached, so they are read again once they are fixed.
+
+    @param shape_path [str] Path of the IGS or STEP file
+    @return [list] List of [sub-shape name, TopoDS_Shape], the same as readShapeFile()
+    @exception IOError The file cannot be read or translated
+    """
+    if isCached(shape_path):
+        try:
+            return _readCache(shape_path)
+        except (IOError, OSError, ValueError):
+            pass
+
+    read_shapes = readShapeFile(shape_path)
+
+    # A cache that cannot be written, e.g. in a read-only home, only costs the translation next time
+    try:
+        _writeCache(shape_path, read_shapes)
+    except (IOError, OSError):
+        pass
+
+    return read_shapes
+
+
+def readShapeFiles(shape_paths, wait_callback=None, processes=None):
+    """
+    Reads a list of CAD files through the cache, translating the files not cached yet in parallel processes.
+
+    The OCC translators hold the Python interpreter while they run, so the translation is made in the worker processes
+    of occ_modules.shape_translator, which write the cache. The calling process only reads the cached BRep files. Files
+    whose translation fails in a worker, e.g. when the cache cannot be written, are read in the calling process.
+
+    @param shape_paths [list] Paths of the IGS or STEP files
+    @param wait_callback [function] Function called repeatedly while the workers run, e.g. for processing GUI events
+    @param processes [int] Number of worker processes, see shape_translator.translationPool()
+    @return [list] For each path, the list of [sub-shape name, TopoDS_Shape] as returned by readShapeFile()
+    @exception IOError A file cannot be read or translated
+    """
+    uncached_paths = [shape_path for shape_path in set(shape_paths) if not isCached(shape_path)]
+
+    if uncached_paths:
+        translateFiles(uncached_paths, wait_callback, processes)
+
+    return [readCachedShapeFile(shape_path) for shape_path in shape_paths]
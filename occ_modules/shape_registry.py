@@ -0,0 +1,167 @@
+"""@package occ_modules.shape_registry
+
+File that contains the class ShapeRegistry that keeps track of the AIS Shapes loaded in Core.BladePyCore.
+
+The shapes are registered by case, so all shapes of a deleted case are dropped at once and only the shapes of the
+cases still loaded are iterated when the display settings of every shape must be changed. The registry also keeps
+the mesh memory of each case and the order in which the cases were viewed, used for dropping the meshes of the least
+recently viewed cases when the mesh memory budget is exceeded.
+
+"""
+
+import itertools
+
+
+def uniqueShapes(h_ais_shapes):
+    """
+    Returns the handles of a list of sub-shape handles without repetitions and without the not built (None) ones.
+
+    Merged curves share the handle of their compound, so the handle appears once for each curve of the compound.
+
+    @param h_ais_shapes [list] List of handles of AIS Shapes, e.g. CaseNode.shapeHAIS()
+    @return [list] The handles in the order they first appear
+    """
+    seen_ids = set()
+    unique_shapes = []
+
+    for h_ais_shape in h_ais_shapes:
+        if h_ais_shape is None or id(h_ais_shape) in seen_ids:
+            continue
+
+        seen_ids.add(id(h_ais_shape))
+        unique_shapes.append(h_ais_shape)
+
+    return unique_shapes
+
+
+class ShapeRegistry(object):
+    """
+    Registry of the handles of AIS Shapes of each loaded case.
+
+    The registry is a dictionary whose keys are data_structure.case_node.CaseNode objects and values are the lists of
+    Handle_AIS_InteractiveObject of the case. It replaces the former append-only master shape list of
+    Core.BladePyCore, which was never cleaned when a case was deleted.
+
+    """
+
+    def __init__(self):
+        # Dictionary of case node to list of handles of its AIS Shapes
+        self._case_shapes = {}
+
+        # Dictionary of case node to the estimated memory of its meshes, in bytes
+        self._mesh_memory = {}
+
+        # Dictionary of case node to the order of its last view. Higher means more recent.
+        self._last_viewed = {}
+        self._view_counter = itertools.count()
+
+    def register(self, case_node, h_ais_shapes):
+        """
+        Registers the AIS Shapes of a case. Sub-shapes that were not built yet (None) and repeated handles are ignored.
+
+        @param case_node [CaseNode] The case that owns the shapes
+        @param h_ais_shapes [list] List of handles of AIS Shapes
+        @return None
+        """
+        self.touch(case_node)
+
+        case_shapes = self._case_shapes.setdefault(case_node, [])
+        case_shapes.extend(uniqueShapes(h_ais_shapes))
+
+    def add(self, case_node, h_ais_shape):
+        """
+        Registers a single AIS Shape built after its case was loaded.
+
+        @param case_node [CaseNode] The case that owns the shape
+        @param h_ais_shape [Handle_AIS_InteractiveObject] The handle of the AIS Shape
+        @return None
+        """
+        self._case_shapes.setdefault(case_node, []).append(h_ais_shape)
+
+    def replaceShapes(self, case_node, h_ais_shapes):
+        """
+        Replaces the registered AIS Shapes of a case, e.g. after one of its files was reloaded.
+
+        @param case_node [CaseNode] The case that owns the shapes
+        @param h_ais_shapes [list] List of handles of AIS Shapes. Not built sub-shapes (None) are ignored
+        @return None
+        """
+        self._case_shapes[case_node] = uniqueShapes(h_ais_shapes)
+
+    def unregister(self, case_node):
+        """
+        Drops all the AIS Shapes of a case from the registry.
+
+        @param case_node [CaseNode] The case being deleted
+        @return [list] The handles that were registered for the case
+        """
+        self._mesh_memory.pop(case_node, None)
+        self._last_viewed.pop(case_node, None)
+
+        return self._case_shapes.pop(case_node, [])
+
+    def touch(self, case_node):
+        """
+        Marks a case as the most recently viewed one.
+
+        @param case_node [CaseNode] The viewed case
+        @return None
+        """
+        self._last_viewed[case_node] = next(self._view_counter)
+
+    def casesByLastView(self):
+        """
+        Returns the registered cases from the least to the most recently viewed.
+
+        @return [list] List of CaseNode
+        """
+        return sorted(self._case_shapes, key=lambda case_node: self._last_viewed.get(case_node, -1))
+
+    def setMeshMemory(self, case_node, mesh_memory):
+        """
+        Stores the estimated memory of the meshes of a case.
+
+        @param case_node [CaseNode] The case that owns the meshes
+        @param mesh_memory [int] Memory in bytes
+        @return None
+        """
+        self._mesh_memory[case_node] = mesh_memory
+
+    def meshMemory(self, case_node=None):
+        """
+        Returns the estimated memory of the meshes of a case or of all cases.
+
+        @param case_node [CaseNode] The case. None returns the sum of all cases
+        @return [int] Memory in bytes
+        """
+        if case_node is None:
+            return sum(self._mesh_memory.values())
+
+        return self._mesh_memory.get(case_node, 0)
+
+    def caseShapes(self, case_node):
+        """
+        Returns the AIS Shapes registered for a case.
+
+        @param case_node [CaseNode] The case that owns the shapes
+        @return [list] List of handles of AIS Shapes
+        """
+        return self._case_shapes.get(case_node, [])
+
+    def cases(self):
+        """
+        Returns the cases that have shapes registered.
+
+        @return [list] List of CaseNode
+        """
+        return list(self._case_shapes.keys())
+
+    def shapes(self):
+        """
+        Iterates over all the registered AIS Shapes.
+
+        @return [generator] Handles of the AIS Shapes
+        """
+        for case_shapes in self._case_shapes.values():
+            for h_ais_shape in case_shapes:
+                yield h_ais_shape
@@ -0,0 +1,167 @@
+"""@package occ_modules.shape_translator
+
+File that contains the worker processes that translate CAD files into the shape cache of occ_modules.shape_reader.
+
+The processes are kept in one multiprocessing pool for the whole application, created by the first translation and
+shut down by shutdownTranslator() when the application quits. They are started with the spawn method, so they do not
+inherit the state of the GUI, e.g. Qt and OpenGL, as forked processes would. A spawned process imports the main module
+again under the name __mp_main__. Core only creates the windows when it is run as __main__, so the workers import its
+modules but show nothing.
+
+"""
+
+import atexit
+import collections
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+## Seconds after which a translation is given up. A worker killed by a crash of the translator is replaced by the pool,
+# but the result of its file never arrives
+translation_timeout = 600
+
+# Pool of the worker processes and its number of processes, created by translationPool()
+_pool = None
+_pool_size = 0
+
+
+def _initWorker():
+    """
+    Prepares a worker process when it starts.
+
+    Ctrl+C in the console of the application is handled by the application, not by each worker. OCC is loaded once
+    here, instead of in the first translation of the worker.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # A worker whose initializer raises is replaced at once by the pool, endlessly. Without OCC the translations fail
+    # instead, and the error is logged
+    try:
+        import occ_modules.shape_reader
+    except ImportError:
+        pass
+
+
+def translateToCache(shape_path):
+    """
+    Translates a CAD file and writes it to the cache. Runs in the worker processes.
+
+    @param shape_path [str] Path of the IGS or STEP file
+    @return [str] The path of the CAD file
+    @exception IOError The file cannot be read or translated, or the cache cannot be written
+    """
+    from occ_modules.shape_reader import readShapeFile, _writeCache
+
+    _writeCache(shape_path, readShapeFile(shape_path))
+
+    return shape_path
+
+
+def _finishTranslations(pool):
+    """
+    Waits for the translations already running when the interpreter exits, so their cache entries are complete.
+    """
+    pool.close()
+    pool.join()
+
+
+def translationPool(processes=None):
+    """
+    Returns the pool of the worker processes, creating it the first time.
+
+    @param processes [int] Number of worker processes, only used when the pool is created. None uses the number of
+    CPUs
+    @return [multiprocessing.pool.Pool] The pool
+    """
+    global _pool, _pool_size
+
+    if _pool is None:
+        _pool_size = processes or os.cpu_count() or 1
+        _pool = multiprocessing.get_context("spawn").Pool(_pool_size, _initWorker)
+        atexit.register(_finishTranslations, _pool)
+
+    return _pool
+
+
+def translateFiles(shape_paths, wait_callback=None, processes=None):
+    """
+    Translates CAD files into the shape cache in the worker processes and waits for them.
+
+    Only as many files as there are workers are given to the pool at a time, the others wait here, so the files not
+    started yet are dropped when the translator is shut down meanwhile. Translations that fail are logged and skipped,
+    the caller reads those files itself, so the error is reported where the file is used.
+
+    @param shape_paths [list] Paths of the IGS or STEP files
+    @param wait_callback [function] Function called repeatedly while the workers run, e.g. for processing GUI events
+    @param processes [int] Number of worker processes, see translationPool()
+    @return [list] Paths of the files that were translated
+    """
+    pool = translationPool(processes)
+
+    waiting_paths = collections.deque(shape_paths)
+    # Dictionary of path to (async result, start time) of the files given to the pool
+    running = {}
+    translated_paths = []
+
+    # Set by the pool when a translation finishes, so the loop does not poll the results
+    finished = threading.Event()
+
+    def notify(result):
+        finished.set()
+
+    while waiting_paths or running:
+        # Shut down by wait_callback(), e.g. the application was closed
+        if pool is not _pool:
+            break
+
+        while waiting_paths and len(running) < _pool_size:
+            shape_path = waiting_paths.popleft()
+            running[shape_path] = (pool.apply_async(translateToCache, (shape_path,), callback=notify,
+                                                    error_callback=notify), time.time())
+
+        # Woken up now and then to notice translations that never finish
+        finished.wait(1. if wait_callback is None else 0.05)
+        finished.clear()
+
+        for shape_path, (result, start_time) in list(running.items()):
+            if not result.ready():
+                if time.time() - start_time > translation_timeout:
+                    del running[shape_path]
+                    logger.warning("Translation of %s was given up after %d s", shape_path, translation_timeout)
+                continue
+
+            del running[shape_path]
+
+            try:
+                result.get()
+            except Exception as error:
+                logger.warning("Translation of %s failed in a worker process: %s", shape_path, error)
+                continue
+
+            translated_paths.append(shape_path)
+
+        if wait_callback is not None:
+            wait_callback()
+
+    return translated_paths
+
+
+def shutdownTranslator():
+    """
+    Shuts down the worker processes. Called when the application quits.
+
+    The files waiting in translateFiles() are dropped. The translations already running are left to finish, so their
+    cache entries are complete.
+
+    @return None
+    """
+    global _pool
+
+    if _pool is not None:
+        _pool.close()
+        _pool = None
@@ -0,0 +1,243 @@
+"""@package occ_modules.snapshot_renderer
+
+File that contains the functions for rendering snapshots of BladePro cases without the GUI.
+
+The shapes are read through the shape cache of occ_modules.shape_reader, the same used by
+occ_modules.shape_properties.ShapeManager.loadShape(), and displayed in an offscreen OCC viewer. The standard views
+of the Output Viewer toolbar are dumped to PNG files. Every case directory is rendered by a separate process, so a
+list of directories is rendered in parallel.
+
+Usage: python -m occ_modules.snapshot_renderer case_dir_1 case_dir_2 ... -o thumbnails_dir
+
+"""
+
+import argparse
+import collections
+import hashlib
+import multiprocessing
+import os
+import re
+
+from OCC.AIS import AIS_ColoredShape
+from OCC.Display.OCCViewer import OffscreenRenderer
+import OCC.Quantity as OCC_Color
+
+from occ_modules.shape_reader import readCachedShapeFile
+from occ_modules.subshape_names import ExceptionMatcher
+from data_structure.case_files import findCaseNames, findCaseOutputs
+from settings.settings_snapshot import mainSettings, default_output_exceptions
+
+## Methods of OCC.Display.OCCViewer.Viewer3d for each view, named as in the Output Viewer toolbar
+snapshot_views = {"Front": "View_Front",
+                  "Top": "View_Top",
+                  "Left": "View_Left",
+                  "Rear": "View_Rear",
+                  "Bottom": "View_Bottom",
+                  "Right": "View_Right",
+                  "Axonometric": "View_Iso"}
+
+## Views rendered by default
+default_snapshot_views = ["Front", "Top", "Axonometric"]
+
+
+def savedExceptions():
+    """
+    Returns the display exceptions saved in the preferences of the Output Viewer, so the snapshots show the sub-shapes
+    the Output Viewer shows.
+
+    Output types without a saved exception, e.g. when the Output Viewer was never started, use
+    settings.settings_snapshot.default_output_exceptions.
+
+    @return [dict] Display exceptions by output type
+    """
+    settings = mainSettings()
+    exceptions = {}
+
+    with settings.inGroup("outputs_settings"):
+        for output_type, default_exception in default_output_exceptions.items():
+            exceptions[output_type] = settings.value("default_%s_exception" % output_type, default_exception)
+
+    return exceptions
+
+
+def _exceptionList(exception):
+    """
+    Splits an exception string the same way the Output Viewer does, e.g. "HUB; SHROUD" or "HUB, SHROUD".
+
+    @param exception [str] The exception string
+    @return [list] List of non-empty exception entries
+    """
+    return list(filter(None, re.split("[ ,/;]", exception)))
+
+
+def renderCase(renderer, working_path, case_name, output_dir, views=None, exceptions=None):
+    """
+    Renders the standard views of a case to PNG files.
+
+    @param renderer [OffscreenRenderer] The offscreen viewer used for rendering
+    @param working_path [str] Directory of the case
+    @param case_name [str] Name of the case
+    @param output_dir [str] Directory where the images are written as <case_name>.<view>.png
+    @param views [list] Names of the views, keys of snapshot_views. None renders default_snapshot_views
+    @param exceptions [dict] Display exceptions by output type. None uses the saved ones, see savedExceptions()
+    @return [list] Paths of the written images
+    """
+    if views is None:
+        views = default_snapshot_views
+
+    if exceptions is None:
+        exceptions = savedExceptions()
+
+    context = renderer.Context
+    context.RemoveAll()
+
+    case_outputs = findCaseOutputs(working_path, case_name, ["igs_surf", "igs_3d_cur", "igs_2d_cur"])
+
+    for output_type, shape_path in case_outputs.items():
+        exception_matcher = ExceptionMatcher(_exceptionList(exceptions.get(output_type, "")))
+
+        try:
+            read_shapes = readCachedShapeFile(shape_path)
+        except IOError as error:
+            print("Skipping %s: %s" % (shape_path, error))
+            continue
+
+        for name_subshape, topods_shape in read_shapes:
+            if exception_matcher.isException(name_subshape):
+                continue
+
+            h_ais_shape = AIS_ColoredShape(topods_shape).GetHandle()
+
+            # Golden, the default shape color of the Output Viewer
+            context.SetColor(h_ais_shape, OCC_Color.Quantity_NOC_ORANGE3, False)
+            context.Display(h_ais_shape, False)
+
+    written_images = []
+
+    for view in views:
+        getattr(renderer, snapshot_views[view])()
+        renderer.FitAll()
+
+        image_path = os.path.join(output_dir, "%s.%s.png" % (case_name, view))
+        renderer.View.Dump(image_path)
+        written_images.append(image_path)
+
+    return written_images
+
+
+def renderDirectory(directory, output_dir, views=None, size=(640, 480), exceptions=None, output_name=None):
+    """
+    Renders every case found in a directory. A new offscreen viewer is created for the directory.
+
+    @param directory [str] Directory with BladePro outputs
+    @param output_dir [str] Directory where the images are written, in a sub-directory for the case directory, so
+    cases with same name in different directories do not overwrite each other
+    @param views [list] Names of the views, keys of snapshot_views
+    @param size [tuple] Width and height of the images in pixels
+    @param exceptions [dict] Display exceptions by output type. None uses the saved ones, see savedExceptions()
+    @param output_name [str] Path of the sub-directory, relative to output_dir. None uses the name of the directory
+    @return [list] Paths of the written images
+    """
+    if output_name is None:
+        output_name = os.path.basename(os.path.abspath(directory))
+
+    case_output_dir = os.path.join(output_dir, output_name)
+
+    # Other processes may be creating the same parent directories
+    os.makedirs(case_output_dir, exist_ok=True)
+
+    renderer = OffscreenRenderer(size)
+    renderer.SetModeShaded()
+
+    written_images = []
+
+    for case_name in findCaseNames(directory):
+        written_images.extend(renderCase(renderer, directory, case_name, case_output_dir, views, exceptions))
+
+    return written_images
+
+
+def outputNames(directories):
+    """
+    Gives each directory of a list a distinct sub-directory for its images.
+
+    The sub-directory is the path of the directory relative to the parent of the directory common to all of them,
+    e.g. "runs/a/rotor" and "runs/b/rotor" for "/data/runs/a/rotor" and "/data/runs/b/rotor", so directories with
+    the same name do not write to the same place. A single directory uses its name. Directories on different drives
+    have no common directory, their name is followed by a hash of their path instead.
+
+    @param directories [list] Directories with BladePro outputs, without repetitions
+    @return [list] Relative paths of the sub-directories, in the order of the directories
+    """
+    absolute_directories = [os.path.abspath(directory) for directory in directories]
+
+    try:
+        parent_directory = os.path.dirname(os.path.commonpath(absolute_directories))
+    except ValueError:
+        return ["%s-%s" % (os.path.basename(directory), hashlib.sha1(directory.encode("utf-8")).hexdigest()[:8])
+                for directory in absolute_directories]
+
+    return [os.path.relpath(directory, parent_directory) for directory in absolute_directories]
+
+
+def _renderDirectoryTask(task):
+    """
+    Unpacks the arguments of renderDirectory() for multiprocessing.Pool.imap_unordered().
+    """
+    return renderDirectory(*task)
+
+
+def renderDirectories(directories, output_dir, views=None, size=(640, 480), exceptions=None, processes=None):
+    """
+    Renders the cases of a list of directories in parallel, one process per directory at a time.
+
+    @param directories [list] Directories with BladePro outputs
+    @param output_dir [str] Directory where the images are written, in a sub-directory for each directory, see
+    outputNames()
+    @param views [list] Names of the views, keys of snapshot_views
+    @param size [tuple] Width and height of the images in pixels
+    @param exceptions [dict] Display exceptions by output type. None uses the saved ones, see savedExceptions()
+    @param processes [int] Number of processes. None uses the number of CPUs
+    @return [list] Paths of the written images
+    """
+    # Read once here, instead of by every case in the processes
+    if exceptions is None:
+        exceptions = savedExceptions()
+
+    # A directory given twice is rendered once
+    directories = list(collections.OrderedDict((os.path.abspath(directory), None) for directory in directories))
+
+    tasks = [(directory, output_dir, views, size, exceptions, output_name)
+             for directory, output_name in zip(directories, outputNames(directories))]
+
+    written_images = []
+
+    pool = multiprocessing.Pool(processes)
+    try:
+        for directory_images in pool.imap_unordered(_renderDirectoryTask, tasks):
+            written_images.extend(directory_images)
+    finally:
+        pool.close()
+        pool.join()
+
+    return written_images
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Renders snapshots of BladePro cases without the GUI.")
+    parser.add_argument("directories", nargs="+", help="directories with BladePro outputs")
+    parser.add_argument("-o", "--output", default="snapshots", help="directory where the images are written")
+    parser.add_argument("-v", "--views", nargs="+", default=default_snapshot_views, choices=sorted(snapshot_views),
+                        help="views to be rendered")
+    parser.add_argument("-s", "--size", nargs=2, type=int, default=[640, 480], help="width and height in pixels")
+    parser.add_argument("-j", "--processes", type=int, default=None, help="number of parallel processes")
+    args = parser.parse_args()
+
+    written_images = renderDirectories(args.directories, args.output, args.views, tuple(args.size),
+                                       processes=args.processes)
+
+    print("%d images written to %s" % (len(written_images), args.output))
+
+
+if __name__ == "__main__":
+    main()
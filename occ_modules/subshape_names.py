@@ -0,0 +1,82 @@
+"""@package occ_modules.subshape_names
+
+File that contains the function subShapeCategory() and the class ExceptionMatcher, which tell the kind of a sub-shape
+from its name.
+
+BladePro names the sub-shapes of its outputs with the kind of the sub-shape followed by numbers, e.g. "STREAM_12".
+subShapeCategory() groups the sub-shapes of the same kind and ExceptionMatcher tells which ones are not displayed by
+default. They only work on strings, so this file does not depend on OCC.
+
+"""
+
+import re
+
+
+def _subShapeLetters(name_subshape):
+    """
+    Returns only the letters of a sub-shape name, e.g. "Stream" for "Stream_12".
+    """
+    return re.sub("[^A-Za-z]", "", name_subshape)
+
+
+def subShapeCategory(name_subshape):
+    """
+    Returns the category of a sub-shape name, which is its letters in upper case, e.g. "STREAM" for "Stream_12".
+
+    Sub-shapes of the same kind in BladePro outputs only differ by numbers and separators in their names, so the
+    category groups them, e.g. all stream sub-shapes.
+
+    @param name_subshape [str] The name of the sub-shape as read from the file
+    @return [str] The category of the sub-shape
+    """
+    return _subShapeLetters(name_subshape).upper()
+
+
+class ExceptionMatcher(object):
+    """
+    Class that tells whether a sub-shape name is in a display exception list, e.g. ["HUB", "SHROUD", "STREAM"].
+
+    Entries made only of letters are searched in the letters of the name, ignoring digits and separators. The result
+    is kept for those letters, so sub-shapes of the same kind, e.g. "STREAM1" and "STREAM2", are resolved by a
+    dictionary lookup instead of a scan of the whole list. Other entries are searched in the name itself. The search
+    is case sensitive, as the entries are written in upper case like the names of BladePro outputs.
+
+    Letter entries differ from a plain search in the name when the letters are split by digits or separators in the
+    name, e.g. "HUBSHROUD" is found in "HUB_SHROUD_1" and "STREAM" in "STRE_AM". BladePro names only put digits and
+    separators after the letters of the kind, so the entries match the same sub-shapes in its outputs.
+
+    """
+
+    def __init__(self, exception_list):
+        """
+        The constructor of the class.
+
+        @param exception_list [list] List of strings of the exception entries. Empty entries are ignored.
+        """
+        exception_list = list(filter(None, exception_list))
+
+        self._letter_exceptions = [exception for exception in exception_list if exception.isalpha()]
+        self._name_exceptions = [exception for exception in exception_list if not exception.isalpha()]
+
+        # Dictionary of the letters of a name to bool, filled as new names are found
+        self._letters_results = {}
+
+    def isException(self, name_subshape):
+        """
+        Checks a sub-shape name against the exception list.
+
+        @param name_subshape [str] The name of the sub-shape as read from the file
+        @return [bool] True if the sub-shape is in the exception list
+        """
+        letters = _subShapeLetters(name_subshape)
+
+        letters_result = self._letters_results.get(letters)
+
+        if letters_result is None:
+            letters_result = any(exception in letters for exception in self._letter_exceptions)
+            self._letters_results[letters] = letters_result
+
+        if letters_result:
+            return True
+
+        return any(exception in name_subshape for exception in self._name_exceptions)
@@ -6,4 +6,7 @@ Package that contains the codes for managing settings within the application.
 \arg \c settings.preferences File that contains the class preferences.PreferencesBladePy, for adding functions,
 for managing user preferences, to the function-less Dialog Layout preferencesUI.Ui_PreferencesDialog.
 
+\arg \c settings.settings_snapshot File that contains the class settings_snapshot.SettingsSnapshot, an in-memory copy
+of settings shared by the application, and mainSettings() for the snapshot of the main application options.
+
 """
\ No newline at end of file
@@ -9,15 +9,17 @@ user preferences, to the function-less Dialog Layout preferencesUI.Ui_Preference
 
 import os
 
+from ui_compiler import compileUi
+
 ui_file = os.path.join(os.path.dirname(__file__), "preferencesUI.ui")
 py_ui_file = os.path.join(os.path.dirname(__file__), "preferencesUI.py")
 
-os.system("pyuic4 -x %s -o %s" % (ui_file, py_ui_file))
+# The layout is only compiled if the .ui file changed
+compileUi(ui_file, py_ui_file)
 
-from PyQt4 import QtCore, QtGui, uic
+from PyQt4 import QtCore, QtGui
 from settings import preferencesUI
-
-dct = {"true": True, "false": False, True: True, False: False}
+from settings.settings_snapshot import mainSettings, dct, default_output_exceptions
 
 
 class PreferencesBladePy(QtGui.QDialog, preferencesUI.Ui_PreferencesDialog):
@@ -30,7 +32,9 @@ class PreferencesBladePy(QtGui.QDialog, preferencesUI.Ui_PreferencesDialog):
         super(PreferencesBladePy, self).__init__(parent)
         self.setupUi(self)
         self.last_settings = QtCore.QSettings("BladePy", "BladePy\MainApp\LastMainOptions".format(number=1))
-        self.user_settings = [QtCore.QSettings("BladePy", "BladePy\MainApp\Options{number}".format(number=1))]
+        # The options are written here and read by everyone else from the shared snapshot
+        self.settings_snapshot = mainSettings()
+        self.user_settings = [self.settings_snapshot.settings()]
         self.list_settings = []
         self.list_settings.append(self.last_settings)
         self.list_settings.extend(self.user_settings)
@@ -41,42 +45,43 @@ class PreferencesBladePy(QtGui.QDialog, preferencesUI.Ui_PreferencesDialog):
 
         # The try/except below is to prevent the program crashing when opening for the first time in a computer
         try:
-            int(self.list_settings[1].value("shapes_settings/default_shape_color"))
+            int(self.settings_snapshot.value("shapes_settings/default_shape_color"))
 
         except TypeError:
             # Set standard configuration if it is the first time
             self.saveSettings(1, restore=True)
+            self.settings_snapshot.refresh()
 
         finally:
 
-            self.list_settings[1].beginGroup("shapes_settings")
-
-            default_shape_color = int(self.list_settings[1].value("default_shape_color"))
-            default_shape_factor = float(self.list_settings[1].value("default_shape_quality"))
-            default_shape_transparency = float(self.list_settings[1].value("default_shape_transparency"))
-            default_zoom_step = float(self.list_settings[1].value("default_zoomfactor"))
-
-            self.list_settings[1].endGroup()
-
-            self.list_settings[1].beginGroup("outputs_settings")
-
-            default_igs_surf_check_state = dct[self.list_settings[1].value("default_igs_surf_check_state")]
-            default_igs_surf_exception = self.list_settings[1].value("default_igs_surf_exception")
-            default_igs_3d_cur_check_state = dct[self.list_settings[1].value("default_igs_3d_cur_check_state")]
-            default_igs_3d_cur_exception = self.list_settings[1].value("default_igs_3d_cur_exception")
-            default_igs_2d_cur_check_state = dct[self.list_settings[1].value("default_igs_2d_cur_check_state")]
-            default_igs_2d_cur_exception = self.list_settings[1].value("default_igs_2d_cur_exception")
-            default_tecplot_2d_check_state = dct[self.list_settings[1].value("default_tecplot_check_state")]
-
-            self.list_settings[1].endGroup()
-
-            self.list_settings[1].beginGroup("bladepro_settings")
-
-            default_bladebro_version = self.list_settings[1].value("default_bladebro_version")
-
-            self.list_settings[1].endGroup()
+            settings = self.settings_snapshot
+
+            with settings.inGroup("shapes_settings"):
+                default_shape_color = settings.intValue("default_shape_color")
+                default_shape_factor = settings.floatValue("default_shape_quality")
+                default_shape_transparency = settings.floatValue("default_shape_transparency")
+                default_zoom_step = settings.floatValue("default_zoomfactor")
+                # Settings saved by older versions do not have a mesh budget
+                default_mesh_budget = settings.intValue("default_mesh_budget", 2048)
+
+            with settings.inGroup("outputs_settings"):
+                default_igs_surf_check_state = settings.boolValue("default_igs_surf_check_state")
+                default_igs_surf_exception = settings.value("default_igs_surf_exception")
+                default_igs_3d_cur_check_state = settings.boolValue("default_igs_3d_cur_check_state")
+                default_igs_3d_cur_exception = settings.value("default_igs_3d_cur_exception")
+                default_igs_2d_cur_check_state = settings.boolValue("default_igs_2d_cur_check_state")
+                default_igs_2d_cur_exception = settings.value("default_igs_2d_cur_exception")
+                default_tecplot_2d_check_state = settings.boolValue("default_tecplot_check_state")
+                # Settings saved by older versions do not have the merge option
+                default_merge_curves_check_state = settings.boolValue("default_merge_curves_check_state", False)
+                # STEP reference geometries were always loaded before they had a preference
+                default_step_ref_check_state = settings.boolValue("default_step_ref_check_state", True)
+
+            with settings.inGroup("bladepro_settings"):
+                default_bladebro_version = settings.value("default_bladebro_version")
 
         self.ui_preferences_zoom_dpsn.setValue(float(default_zoom_step))
+        self.ui_preferences_mesh_budget_spn.setValue(default_mesh_budget)
         self.ui_preferences_default_color_combo.setCurrentIndex(default_shape_color)
         self.ui_preferences_default_quality_dspn.setValue(default_shape_factor)
         self.ui_preferences_default_transparency_dspn.setValue(default_shape_transparency)
@@ -90,6 +95,8 @@ class PreferencesBladePy(QtGui.QDialog, preferencesUI.Ui_PreferencesDialog):
         self.ui_preferences_igs_2d_cur_exception_edit.setText(default_igs_2d_cur_exception)
 
         self.ui_preferences_tecplot_2d_chk.setChecked(default_tecplot_2d_check_state)
+        self.ui_preferences_step_ref_chk.setChecked(default_step_ref_check_state)
+        self.ui_preferences_merge_curves_chk.setChecked(default_merge_curves_check_state)
 
         self.ui_preferences_running_bladepro_version_edit.setText(default_bladebro_version)
 
@@ -124,14 +131,16 @@ class PreferencesBladePy(QtGui.QDialog, preferencesUI.Ui_PreferencesDialog):
         """
         self.saveSettings(1)
 
-        self.list_settings[1].beginGroup("shapes_settings")
-
-        self.op_viewer.default_shape_color = int(self.list_settings[1].value("default_shape_color"))
-        self.op_viewer.default_shape_factor = float(self.list_settings[1].value("default_shape_quality"))
-        self.op_viewer.default_shape_transparency = float(self.list_settings[1].value("default_shape_transparency"))
-        self.op_viewer.ui_display_zoomfactor_dspn.setValue(float(self.list_settings[1].value("default_zoomfactor")))
+        # Cases created from now on see the new preferences
+        settings = self.settings_snapshot
+        settings.refresh()
 
-        self.list_settings[1].endGroup()
+        with settings.inGroup("shapes_settings"):
+            self.op_viewer.default_shape_color = settings.intValue("default_shape_color")
+            self.op_viewer.default_shape_factor = settings.floatValue("default_shape_quality")
+            self.op_viewer.default_shape_transparency = settings.floatValue("default_shape_transparency")
+            self.op_viewer.ui_display_zoomfactor_dspn.setValue(settings.floatValue("default_zoomfactor"))
+            self.op_viewer.default_mesh_budget = settings.intValue("default_mesh_budget", 2048)
 
 
 
@@ -158,6 +167,7 @@ class PreferencesBladePy(QtGui.QDialog, preferencesUI.Ui_PreferencesDialog):
             to_be_default_shape_factor = self.ui_preferences_default_quality_dspn.value()
             to_be_default_shape_transparency = self.ui_preferences_default_transparency_dspn.value()
             to_be_default_zoom_step = self.ui_preferences_zoom_dpsn.value()
+            to_be_default_mesh_budget = self.ui_preferences_mesh_budget_spn.value()
             to_be_default_igs_surf_check_state = self.ui_preferences_igs_surf_chk.isChecked()
             to_be_default_igs_surf_exception = self.ui_preferences_igs_surf_exception_edit.text()
 
@@ -168,6 +178,8 @@ class PreferencesBladePy(QtGui.QDialog, preferencesUI.Ui_PreferencesDialog):
             to_be_default_igs_2d_cur_exception = self.ui_preferences_igs_2d_cur_exception_edit.text()
 
             to_be_default_tecplot_2d_check_state = self.ui_preferences_tecplot_2d_chk.isChecked()
+            to_be_default_step_ref_check_state = self.ui_preferences_step_ref_chk.isChecked()
+            to_be_default_merge_curves_check_state = self.ui_preferences_merge_curves_chk.isChecked()
 
             to_be_default_bladebro_version = self.ui_preferences_running_bladepro_version_edit.text()
 
@@ -180,16 +192,19 @@ class PreferencesBladePy(QtGui.QDialog, preferencesUI.Ui_PreferencesDialog):
             to_be_default_shape_factor = 1
             to_be_default_shape_transparency = 0
             to_be_default_zoom_step = 1.2
+            to_be_default_mesh_budget = 2048
             to_be_default_igs_surf_check_state = True
-            to_be_default_igs_surf_exception = 'HUB; SHROUD; STREAM'
+            to_be_default_igs_surf_exception = default_output_exceptions["igs_surf"]
 
             to_be_default_igs_3d_cur_check_state = True
-            to_be_default_igs_3d_cur_exception = 'HUB; SHROUD'
+            to_be_default_igs_3d_cur_exception = default_output_exceptions["igs_3d_cur"]
 
             to_be_default_igs_2d_cur_check_state = False
-            to_be_default_igs_2d_cur_exception = ''
+            to_be_default_igs_2d_cur_exception = default_output_exceptions["igs_2d_cur"]
 
             to_be_default_tecplot_2d_check_state = True
+            to_be_default_step_ref_check_state = True
+            to_be_default_merge_curves_check_state = False
 
             to_be_default_bladebro_version = "bladepro"
 
@@ -200,6 +215,7 @@ class PreferencesBladePy(QtGui.QDialog, preferencesUI.Ui_PreferencesDialog):
         self.list_settings[setting].setValue("default_shape_quality", to_be_default_shape_factor)
         self.list_settings[setting].setValue("default_shape_transparency", to_be_default_shape_transparency)
         self.list_settings[setting].setValue("default_zoomfactor", to_be_default_zoom_step)
+        self.list_settings[setting].setValue("default_mesh_budget", to_be_default_mesh_budget)
         self.list_settings[setting].setValue("default_transformation", [0, 0, 0, 0, 2])
 
         self.list_settings[setting].endGroup()
@@ -213,6 +229,9 @@ class PreferencesBladePy(QtGui.QDialog, preferencesUI.Ui_PreferencesDialog):
         self.list_settings[setting].setValue("default_igs_2d_cur_check_state", to_be_default_igs_2d_cur_check_state)
         self.list_settings[setting].setValue("default_igs_2d_cur_exception", to_be_default_igs_2d_cur_exception)
         self.list_settings[setting].setValue("default_tecplot_check_state", to_be_default_tecplot_2d_check_state)
+        self.list_settings[setting].setValue("default_step_ref_check_state", to_be_default_step_ref_check_state)
+        self.list_settings[setting].setValue("default_merge_curves_check_state",
+                                             to_be_default_merge_curves_check_state)
 
         self.list_settings[setting].endGroup()
 
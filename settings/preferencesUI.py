@@ -57,6 +57,13 @@ class Ui_PreferencesDialog(object):
         self.ui_preferences_tecplot_2d_chk.setChecked(True)
         self.ui_preferences_tecplot_2d_chk.setObjectName(_fromUtf8("ui_preferences_tecplot_2d_chk"))
         self.self_preferences_general_outputs_gl.addWidget(self.ui_preferences_tecplot_2d_chk, 3, 0, 1, 1)
+        self.ui_preferences_step_ref_chk = QtGui.QCheckBox(self.self_preferences_general_outputs_groupbox)
+        self.ui_preferences_step_ref_chk.setChecked(True)
+        self.ui_preferences_step_ref_chk.setObjectName(_fromUtf8("ui_preferences_step_ref_chk"))
+        self.self_preferences_general_outputs_gl.addWidget(self.ui_preferences_step_ref_chk, 4, 0, 1, 1)
+        self.ui_preferences_merge_curves_chk = QtGui.QCheckBox(self.self_preferences_general_outputs_groupbox)
+        self.ui_preferences_merge_curves_chk.setObjectName(_fromUtf8("ui_preferences_merge_curves_chk"))
+        self.self_preferences_general_outputs_gl.addWidget(self.ui_preferences_merge_curves_chk, 5, 0, 1, 2)
         self.ui_preferences_igs_3d_cur_exception_edit = QtGui.QLineEdit(self.self_preferences_general_outputs_groupbox)
         self.ui_preferences_igs_3d_cur_exception_edit.setInputMask(_fromUtf8(""))
         self.ui_preferences_igs_3d_cur_exception_edit.setObjectName(_fromUtf8("ui_preferences_igs_3d_cur_exception_edit"))
@@ -166,6 +173,15 @@ class Ui_PreferencesDialog(object):
         self.ui_preferences_zoom_lbl = QtGui.QLabel(self.self_preferences_general_display_groupbox)
         self.ui_preferences_zoom_lbl.setObjectName(_fromUtf8("ui_preferences_zoom_lbl"))
         self.self_preferences_general_display_gl.addWidget(self.ui_preferences_zoom_lbl, 1, 0, 1, 1)
+        self.ui_preferences_mesh_budget_lbl = QtGui.QLabel(self.self_preferences_general_display_groupbox)
+        self.ui_preferences_mesh_budget_lbl.setObjectName(_fromUtf8("ui_preferences_mesh_budget_lbl"))
+        self.self_preferences_general_display_gl.addWidget(self.ui_preferences_mesh_budget_lbl, 2, 0, 1, 1)
+        self.ui_preferences_mesh_budget_spn = QtGui.QSpinBox(self.self_preferences_general_display_groupbox)
+        self.ui_preferences_mesh_budget_spn.setMaximum(65536)
+        self.ui_preferences_mesh_budget_spn.setSingleStep(256)
+        self.ui_preferences_mesh_budget_spn.setProperty("value", 2048)
+        self.ui_preferences_mesh_budget_spn.setObjectName(_fromUtf8("ui_preferences_mesh_budget_spn"))
+        self.self_preferences_general_display_gl.addWidget(self.ui_preferences_mesh_budget_spn, 2, 1, 1, 1)
         self.ui_preferences_general_groupbox_vl.addLayout(self.self_preferences_general_display_gl)
         self.ui_preferences_general_groupbox_gl.addWidget(self.self_preferences_general_display_groupbox, 0, 0, 1, 1)
         self.ui_preferences_general_tab_vl.addWidget(self.ui_preferences_general_groupbox)
@@ -218,6 +234,10 @@ class Ui_PreferencesDialog(object):
         self.self_preferences_general_outputs_groupbox.setTitle(_translate("PreferencesDialog", "BladePro Outputs Loaded by Case", None))
         self.ui_preferences_general_outputs_description_lbl.setText(_translate("PreferencesDialog", "<html><head/><body><p><span style=\" font-weight:600;\">Fields are exceptions that will not be displayed by default</span></p></body></html>", None))
         self.ui_preferences_tecplot_2d_chk.setText(_translate("PreferencesDialog", "Tecplot 2D", None))
+        self.ui_preferences_step_ref_chk.setToolTip(_translate("PreferencesDialog", "Loads the STEP reference geometry of the case, one shape for each part of its assembly", None))
+        self.ui_preferences_step_ref_chk.setText(_translate("PreferencesDialog", "STEP Reference", None))
+        self.ui_preferences_merge_curves_chk.setToolTip(_translate("PreferencesDialog", "Curves of the same kind in IGS 3D and 2D Curves, e.g. all stream curves, are displayed as a single shape", None))
+        self.ui_preferences_merge_curves_chk.setText(_translate("PreferencesDialog", "Merge curves of the same kind", None))
         self.ui_preferences_igs_3d_cur_exception_edit.setToolTip(_translate("PreferencesDialog", "The parts in this field will not be initially displayed in the Output Viewer when loading a IGS 3D Curves", None))
         self.ui_preferences_igs_3d_cur_exception_edit.setText(_translate("PreferencesDialog", "HUB; SHROUD", None))
         self.ui_preferences_igs_2d_cur_chk.setText(_translate("PreferencesDialog", "IGS 2D Curves", None))
@@ -242,6 +262,10 @@ class Ui_PreferencesDialog(object):
         self.ui_preferences_zoom_dpsn.setStatusTip(_translate("PreferencesDialog", "Amount of percentage of zooming by wheel scroll", None))
         self.ui_preferences_zoom_lbl.setStatusTip(_translate("PreferencesDialog", "Zoom Step: The amount of zoom when scrolling mouse\'s wheel", None))
         self.ui_preferences_zoom_lbl.setText(_translate("PreferencesDialog", "Zoom Step", None))
+        self.ui_preferences_mesh_budget_lbl.setStatusTip(_translate("PreferencesDialog", "Mesh Memory Budget: Memory for meshes of loaded cases. Meshes of hidden shapes are dropped above it", None))
+        self.ui_preferences_mesh_budget_lbl.setText(_translate("PreferencesDialog", "Mesh Memory Budget (MB)", None))
+        self.ui_preferences_mesh_budget_spn.setToolTip(_translate("PreferencesDialog", "0 means no limit", None))
+        self.ui_preferences_mesh_budget_spn.setStatusTip(_translate("PreferencesDialog", "Meshes of hidden shapes of the least recently viewed cases are dropped above this memory", None))
         self.ui_preferences_tab.setTabText(self.ui_preferences_tab.indexOf(self.ui_preferences_general_tab), _translate("PreferencesDialog", "General", None))
         self.ui_preferences_bladepro_groupbox.setTitle(_translate("PreferencesDialog", "BladePro", None))
         self.ui_preferences_running_bladepro_version_lbl.setText(_translate("PreferencesDialog", "Running Version", None))
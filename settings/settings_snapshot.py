@@ -0,0 +1,153 @@
+"""@package settings.settings_snapshot
+
+File that contains the class SettingsSnapshot, an in-memory copy of the values of a QSettings.
+
+Creating a QSettings object reads its file, or registry, and every value() goes through it. The snapshot reads all keys
+once, so objects created in large numbers, e.g. data_structure.case_node.CaseNode for every case, only look up a
+dictionary. The snapshot of the main application options is shared by everyone through mainSettings() and refreshed by
+settings.preferences.PreferencesBladePy whenever the preferences are applied.
+
+"""
+
+import contextlib
+
+from PyQt4 import QtCore
+
+## For some reason, when a checkbox isChecked is saved to the settings, it is read as lowercase letters.
+dct = {"true": True, "false": False, True: True, False: False}
+
+## Standard display exceptions of each output type, saved by settings.preferences.PreferencesBladePy when the program
+# starts for the first time or the preferences are restored
+default_output_exceptions = {"igs_surf": "HUB; SHROUD; STREAM",
+                             "igs_3d_cur": "HUB; SHROUD",
+                             "igs_2d_cur": ""}
+
+_main_settings = None
+
+
+class SettingsSnapshot(object):
+    """
+    In-memory copy of the values of a QSettings, with typed getters.
+
+    It can be used in place of the QSettings for reading. Groups are opened with inGroup(), which closes them again
+    even if the reading raises, as the snapshot of the main options is shared by the whole application. Values are
+    written to the QSettings, then refresh() makes them visible in the snapshot.
+
+    """
+
+    def __init__(self, settings):
+        """
+        The constructor of the class.
+
+        @param settings [QtCore.QSettings] The settings to be copied
+        """
+        self._settings = settings
+        self._values = {}
+        self._groups = []
+
+        self.refresh()
+
+    def settings(self):
+        """
+        Method for retrieving the QSettings of the snapshot, for writing values.
+
+        @return [QtCore.QSettings] The settings
+        """
+        return self._settings
+
+    def refresh(self):
+        """
+        Reads all keys of the settings again, e.g. after they were saved.
+
+        @return None
+        """
+        self._settings.sync()
+
+        # The keys are read from the top level, even if a group of the QSettings is open.
+        open_groups = []
+        while self._settings.group():
+            open_groups.insert(0, self._settings.group())
+            self._settings.endGroup()
+
+        self._values = dict((key, self._settings.value(key)) for key in self._settings.allKeys())
+
+        for group in open_groups:
+            self._settings.beginGroup(group)
+
+    @contextlib.contextmanager
+    def inGroup(self, prefix):
+        """
+        Prepends a group to the keys of the lookups made in the with block, as QSettings.beginGroup() does. The group is
+        closed at the end of the block, also when it is left by a return or an exception, e.g:
+
+            with settings.inGroup("shapes_settings"):
+                color = settings.intValue("default_shape_color")
+
+        @param prefix [str] Name of the group
+        @return [context manager] Context manager without a value
+        """
+        self._groups.append(prefix)
+
+        try:
+            yield
+        finally:
+            self._groups.pop()
+
+    def group(self):
+        """
+        @return [str] The groups open by inGroup(), as QSettings.group() returns them
+        """
+        return "/".join(self._groups)
+
+    def _fullKey(self, key):
+        return "/".join(self._groups + [key])
+
+    def contains(self, key):
+        """
+        @param key [str] The key, relative to the open groups
+        @return [bool] True if the settings have the key
+        """
+        return self._fullKey(key) in self._values
+
+    def value(self, key, default=None):
+        """
+        Returns the value of a key as it was stored by QSettings.
+
+        @param key [str] The key, relative to the open groups
+        @param default [object] Value returned when the key does not exist
+        @return [object] The value
+        """
+        return self._values.get(self._fullKey(key), default)
+
+    def boolValue(self, key, default=False):
+        """
+        @return [bool] The value of a key saved from a checkbox state, or default if it does not exist
+        """
+        return dct[self.value(key, default)]
+
+    def intValue(self, key, default=0):
+        """
+        @return [int] The value of a key, or default if it does not exist
+        """
+        return int(self.value(key, default))
+
+    def floatValue(self, key, default=0.):
+        """
+        @return [float] The value of a key, or default if it does not exist
+        """
+        return float(self.value(key, default))
+
+
+def mainSettings():
+    """
+    Returns the snapshot of the user options of the main application, shared by the whole application.
+
+    @return [SettingsSnapshot] The snapshot
+    """
+    global _main_settings
+
+    if _main_settings is None:
+        settings = QtCore.QSettings("BladePy", "BladePy\MainApp\Options{number}".format(number=1))
+        _main_settings = SettingsSnapshot(settings)
+
+    return _main_settings
@@ -3,7 +3,8 @@
 
 Package that contains the codes used for tecplot reading and displaying.
 
-\arg \c tecplot_reader File that contains the class tecplot_reader.TecPlotCore, for reading tecplot files
+\arg \c tecplot_reader File that contains the class tecplot_reader.TecPlotCore, for reading tecplot files. Parsed
+files are cached.
 
 \arg \c tecplot_display File that contains the class tecplot_display.TecPlotWindow, for plotting, displaying and managing
 tecplot graphics by adding functions to the function-less layout tecplot_displayUI.Ui_MainWindow
@@ -19,10 +19,13 @@ from tecplot_modules.tecplot_reader import tecplot_colors
 import os
 import sys
 
+from ui_compiler import compileUi
+
 ui_file = os.path.join(os.path.dirname(__file__), "tecplot_displayUI.ui")
 py_ui_file = os.path.join(os.path.dirname(__file__), "tecplot_displayUI.py")
 
-os.system("pyuic4 -x %s -o %s" % (ui_file, py_ui_file))
+# The layout is only compiled if the .ui file changed
+compileUi(ui_file, py_ui_file)
 
 from tecplot_modules import tecplot_displayUI
 
@@ -3,15 +3,36 @@
 
 File that contains the class TecPlotCore for reading tecplot outputs.
 
+Parsed tecplot outputs are cached in tecplot_cache_dir as JSON, keyed by the path, size and modification time of the
+tecplot file, so cases opened again, e.g. when restoring a session, are not parsed again.
+
 """
 import csv as csv
-import matplotlib.pyplot as plt
+import hashlib
+import json
+import os
 
 # Set the color list to be used by the plotter. The user is free to customize it.
 
 tecplot_colors = ['#800000', '#e60000', '#ff4d4d', '#006600', '#00b33c', '#33cc33', '#000099', '#3333ff', '#4d79ff',
                   '#990099', '#cc00cc', '#ff4dff']
 
+## Directory of the cached parsed tecplot outputs
+tecplot_cache_dir = os.path.join(os.path.expanduser("~"), ".bladepy", "tecplot_cache")
+
+
+def tecplotCachePath(tecplot_path):
+    """
+    Returns the path of the JSON file that caches a parsed tecplot output.
+
+    @param tecplot_path [str] Path of the tecplot file
+    @return [str] Path of the cache file
+    """
+    tecplot_stat = os.stat(tecplot_path)
+    key = "%s|%d|%f" % (os.path.abspath(tecplot_path), tecplot_stat.st_size, tecplot_stat.st_mtime)
+
+    return os.path.join(tecplot_cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
 
 class TecPlotCore(object):
     """
@@ -22,6 +43,12 @@ class TecPlotCore(object):
 
     """
 
+    ## Instance variables filled by tecplotReader(), which are the ones cached
+    parsed_attributes = ("hub_z", "hub_r", "shroud_z", "shroud_r", "trailing_z", "trailing_r", "leading_z",
+                         "leading_r", "stream_z_list", "stream_r_list", "bladeprofile_mp_list", "bladeprofile_th_list",
+                         "meanline_s_list", "meanline_mp_list", "meanline_th_list", "meanline_beta_list",
+                         "thickness_s_list", "thickness_t_list")
+
     def __init__(self):
         # Setups instance variables. PEP 8 requirement of instance variables to be defined in _init_
         self.hub_z = []
@@ -50,14 +77,61 @@ class TecPlotCore(object):
         self.thickness_s_list = []
         self.thickness_t_list = []
 
-    def tecplotReader(self, read_csv):
+    def _readCache(self, read_csv):
+        """
+        Fills the instance variables from the cache of a tecplot file.
+
+        @param read_csv [str] Path of the tecplot file
+        @return [bool] True if the cache was read, False if the file is not cached or the cache is damaged
+        """
+        try:
+            with open(tecplotCachePath(read_csv), "r") as cache_file:
+                parsed_data = json.load(cache_file)
+        except (IOError, OSError, ValueError):
+            return False
+
+        if any(attribute not in parsed_data for attribute in self.parsed_attributes):
+            return False
+
+        for attribute in self.parsed_attributes:
+            setattr(self, attribute, parsed_data[attribute])
+
+        return True
+
+    def _writeCache(self, read_csv):
+        """
+        Writes the instance variables to the cache of a tecplot file. Failing to write the cache is not an error.
+
+        @param read_csv [str] Path of the tecplot file
+        @return None
+        """
+        try:
+            cache_path = tecplotCachePath(read_csv)
+
+            if not os.path.isdir(tecplot_cache_dir):
+                os.makedirs(tecplot_cache_dir)
+
+            # Written to a temporary file first, so a cache being written is never read
+            with open(cache_path + ".tmp", "w") as cache_file:
+                json.dump(dict((attribute, getattr(self, attribute)) for attribute in self.parsed_attributes),
+                          cache_file)
+
+            os.replace(cache_path + ".tmp", cache_path)
+        except (IOError, OSError):
+            pass
+
+    def tecplotReader(self, read_csv, use_cache=True):
         """
         Function to dig into a csv file and to record it to instance variables lists.
 
         @param read_csv [csv_file] The file where tecplot data is 
+        @param use_cache [bool] Reads the parsed data from the cache, if the file was parsed before, and caches it
+        otherwise
         @return None
         
         """
+        if use_cache and self._readCache(read_csv):
+            return
 
         col_dict = {"X": 0,
                     "Y": 1,
@@ -243,6 +317,9 @@ class TecPlotCore(object):
         self.thickness_s_list.append(thickness_s)
         self.thickness_t_list.append(thickness_t)
 
+        if use_cache and os.path.isfile(read_csv):
+            self._writeCache(read_csv)
+
         # TODO: refactor this section. Not practical in any way
 
 
@@ -251,6 +328,9 @@ class TecPlotCore(object):
 
 # lines that are not meant to be executed outside running this file itself.
 if __name__ == "__main__":
+    # Only imported here, so the reader is used without a display, e.g. by data_structure.case_summary
+    import matplotlib.pyplot as plt
+
     tecplt_core = TecPlotCore()
 
     tecplt_core.tecplotReader('../588-chordred.2d.tec.dat')
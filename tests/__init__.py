@@ -0,0 +1,19 @@
+"""
+@package tests
+
+Package that contains the unit tests of the modules of BladePy that run without the GUI, OCC nor Qt. They are run
+with pytest from the BladePy directory:
+
+    python -m pytest tests
+
+\arg \c test_case_session Tests of the session files of data_structure.case_session.
+
+\arg \c test_load_profiler Tests of the timing spans of data_structure.load_profiler.
+
+\arg \c test_mesh_writers Tests of the STL, PLY and glTF writers of occ_modules.mesh_writers.
+
+\arg \c test_shape_bvh Tests of the bounding volume hierarchy of occ_modules.shape_bvh.
+
+\arg \c test_subshape_names Tests of the sub-shape categories and display exceptions of occ_modules.subshape_names.
+
+"""
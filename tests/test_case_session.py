@@ -0,0 +1,210 @@
+"""@package tests.test_case_session
+
+Tests of the session files of data_structure.case_session.
+
+"""
+
+import json
+import os
+
+import pytest
+
+from data_structure.case_session import caseEntry, groupEntry, writeSession, readSession, existingOutputs, \
+    staleOutputs, applyCaseState, session_version
+
+
+class FakeCaseNode(object):
+    """
+    Case with the display state of data_structure.case_node.CaseNode, without its shapes nor the preferences.
+    """
+
+    def __init__(self, name, case_outputs, subshape_count):
+        self._name = name
+        self._case_outputs = dict(case_outputs)
+        self._color = 0
+        self._transparency = 0.
+        self._quality = 1.
+        self._transformation = [0, 0, 0, 0, 2]
+
+        self.subshape = [[[0, 0, 0, 0, 2], 0., 0, 1.] for row in range(subshape_count)]
+
+    def name(self):
+        return self._name
+
+    def caseOutputs(self):
+        return self._case_outputs
+
+    def shapeColor(self):
+        return self._color
+
+    def setShapeColor(self, color):
+        self._color = color
+
+    def shapeTransparency(self):
+        return self._transparency
+
+    def setShapeTransparency(self, transparency):
+        self._transparency = transparency
+
+    def shapeQuality(self):
+        return self._quality
+
+    def setShapeQuality(self, quality):
+        self._quality = quality
+
+    def shapeTransformation(self):
+        return self._transformation
+
+    def setShapeTransformation(self, transformation, coord):
+        self._transformation[coord] = transformation
+
+    def tecplotMode(self):
+        return "neutral"
+
+    def tecplotVisibility(self):
+        return True
+
+    def tecplotMeanLinesVisibility(self):
+        return False
+
+    def tecplotBladeProfilesVisibility(self):
+        return True
+
+
+class FakeGroupNode(object):
+    """
+    Group with the interface of data_structure.case_node.CaseGroupNode.
+    """
+
+    def __init__(self, name, working_path, children, pending_case_names):
+        self._name = name
+        self._working_path = working_path
+        self._children = children
+        self._pending_case_names = pending_case_names
+
+    def name(self):
+        return self._name
+
+    def workingPath(self):
+        return self._working_path
+
+    def child(self, row):
+        return self._children[row]
+
+    def childCount(self):
+        return len(self._children)
+
+    def pendingCaseNames(self):
+        return self._pending_case_names
+
+
+@pytest.fixture
+def case_outputs(tmp_path):
+    """
+    Outputs of a case "rotor" written in a temporary directory.
+    """
+    outputs = {"tecplot": str(tmp_path / "rotor.2d.tec.dat"),
+               "igs_surf": str(tmp_path / "rotor.surf.igs")}
+
+    for output_path in outputs.values():
+        with open(output_path, "w") as output_file:
+            output_file.write("output of %s\n" % os.path.basename(output_path))
+
+    return outputs
+
+
+def _savedCase(case_outputs):
+    """
+    @return [FakeCaseNode] Case with a display state different from the default one
+    """
+    case_node = FakeCaseNode("rotor", case_outputs, 3)
+    case_node.setShapeColor(4)
+    case_node.setShapeTransparency(0.5)
+    case_node.setShapeQuality(0.2)
+    case_node.setShapeTransformation(10., 0)
+    case_node.setShapeTransformation(90., 3)
+    case_node.subshape[1] = [[0., 5., 0., 45., 1], 0.25, 2, 0.5]
+
+    return case_node
+
+
+def testRoundTrip(tmp_path, case_outputs):
+    session_path = str(tmp_path / "session.bps")
+    case_node = _savedCase(case_outputs)
+
+    group_case = FakeCaseNode("stator", {}, 0)
+    group_node = FakeGroupNode("stages", str(tmp_path), [group_case], ["diffuser"])
+
+    writeSession(session_path, [caseEntry(case_node, [2, 0])],
+                 [groupEntry(group_node, [caseEntry(group_case, [])])])
+
+    session = readSession(session_path)
+
+    assert session["version"] == session_version
+    assert not os.path.exists(session_path + ".tmp")
+
+    case_entry = session["cases"][0]
+    assert case_entry["name"] == "rotor"
+    assert case_entry["state"]["displayed_rows"] == [0, 2]
+    assert case_entry["state"]["transformation"] == [10., 0., 0., 90., 2]
+
+    assert existingOutputs(case_entry) == dict((output_type, os.path.abspath(output_path))
+                                               for output_type, output_path in case_outputs.items())
+    assert staleOutputs(case_entry) == []
+
+    group_entry = session["groups"][0]
+    assert group_entry["case_names"] == ["stator", "diffuser"]
+    assert [entry["name"] for entry in group_entry["cases"]] == ["stator"]
+
+
+def testChangedOutputs(tmp_path, case_outputs):
+    session_path = str(tmp_path / "session.bps")
+    writeSession(session_path, [caseEntry(_savedCase(case_outputs), [])], [])
+
+    with open(case_outputs["igs_surf"], "a") as output_file:
+        output_file.write("written again by BladePro\n")
+    os.remove(case_outputs["tecplot"])
+
+    case_entry = readSession(session_path)["cases"][0]
+
+    assert staleOutputs(case_entry) == [os.path.abspath(case_outputs["igs_surf"])]
+    assert existingOutputs(case_entry) == {"igs_surf": os.path.abspath(case_outputs["igs_surf"])}
+
+
+def testApplyCaseState(tmp_path, case_outputs):
+    session_path = str(tmp_path / "session.bps")
+    saved_case = _savedCase(case_outputs)
+    writeSession(session_path, [caseEntry(saved_case, [])], [])
+
+    state = readSession(session_path)["cases"][0]["state"]
+
+    restored_case = FakeCaseNode("rotor", case_outputs, 3)
+    applyCaseState(restored_case, state)
+
+    assert restored_case.shapeColor() == 4
+    assert restored_case.shapeTransparency() == 0.5
+    assert restored_case.shapeQuality() == 0.2
+    assert restored_case.shapeTransformation() == [10., 0., 0., 90., 2]
+    assert restored_case.subshape == saved_case.subshape
+
+    # The outputs changed, so the sub-shapes get the state of the case
+    changed_case = FakeCaseNode("rotor", case_outputs, 2)
+    applyCaseState(changed_case, state)
+
+    assert changed_case.subshape == [[[10., 0., 0., 90., 2], 0.5, 4, 0.2]] * 2
+
+
+def testReadInvalidSession(tmp_path):
+    not_session_path = str(tmp_path / "list.bps")
+    with open(not_session_path, "w") as session_file:
+        json.dump([1, 2], session_file)
+
+    newer_session_path = str(tmp_path / "newer.bps")
+    with open(newer_session_path, "w") as session_file:
+        json.dump({"version": session_version + 1, "cases": []}, session_file)
+
+    with pytest.raises(ValueError):
+        readSession(not_session_path)
+
+    with pytest.raises(ValueError):
+        readSession(newer_session_path)
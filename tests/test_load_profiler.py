@@ -0,0 +1,150 @@
+"""@package tests.test_load_profiler
+
+Tests of the timing spans of data_structure.load_profiler.
+
+"""
+
+import json
+
+import pytest
+
+from data_structure import load_profiler
+from data_structure.load_profiler import LoadProfiler
+
+
+def _loadCase(profiler, case_name, shape_bytes=0):
+    """
+    Records the spans of a case load as Core.BladePyCore.addCase() does: a total span with phases inside.
+    """
+    with profiler.span("total", case_name):
+        with profiler.span("probe", case_name):
+            pass
+
+        with profiler.span("shapes", case_name, shape_bytes):
+            # Spans inside a phase are recorded but not part of the case summary
+            with profiler.span("translate", case_name):
+                pass
+
+
+def testNestedSpans():
+    profiler = LoadProfiler()
+
+    _loadCase(profiler, "rotor", 2000000)
+
+    spans = profiler.spans()
+
+    # Spans are recorded when they finish, the outermost last
+    assert [span["phase"] for span in spans] == ["probe", "translate", "shapes", "total"]
+    assert [span["depth"] for span in spans] == [1, 2, 1, 0]
+
+    total = spans[-1]
+    for span in spans[:-1]:
+        assert span["start"] >= total["start"]
+        assert span["duration"] <= total["duration"]
+
+
+def testSpanRecordedOnException():
+    profiler = LoadProfiler()
+
+    with pytest.raises(IOError):
+        with profiler.span("total", "rotor"):
+            with profiler.span("shapes", "rotor"):
+                raise IOError("damaged file")
+
+    assert [(span["phase"], span["depth"]) for span in profiler.spans()] == [("shapes", 1), ("total", 0)]
+
+    # The depth is back to the top level for the next load
+    with profiler.span("total", "stator"):
+        pass
+
+    assert profiler.spans("stator")[0]["depth"] == 0
+
+
+def testBytesSetInsideSpan():
+    profiler = LoadProfiler()
+
+    with profiler.span("tecplot", "rotor") as span:
+        span["bytes"] += 1500000
+
+    assert profiler.spans()[0]["bytes"] == 1500000
+
+
+def testCaseSummary():
+    profiler = LoadProfiler()
+
+    _loadCase(profiler, "rotor", 2000000)
+
+    summary = profiler.caseSummary("rotor")
+
+    assert summary.startswith("rotor loaded in ")
+    assert "shapes " in summary and "(2.0 MB)" in summary
+    assert "probe " in summary
+    assert "translate" not in summary
+
+    assert profiler.caseSummary("stator") == ""
+
+
+def testRepeatedLoads():
+    profiler = LoadProfiler()
+
+    _loadCase(profiler, "rotor", 1000000)
+    _loadCase(profiler, "stator")
+    _loadCase(profiler, "rotor", 3000000)
+
+    assert len(profiler.spans("rotor")) == 8
+    assert len(profiler.spans("stator")) == 4
+
+    # The summary only describes the last load of the case
+    summary = profiler.caseSummary("rotor")
+    assert summary.count("shapes ") == 1
+    assert "(3.0 MB)" in summary
+    assert "(1.0 MB)" not in summary
+
+
+def testMaxSpans(monkeypatch):
+    monkeypatch.setattr(load_profiler, "max_spans", 6)
+    profiler = LoadProfiler()
+
+    for load in range(3):
+        _loadCase(profiler, "case_%d" % load)
+
+    spans = profiler.spans()
+
+    # The oldest spans are dropped first
+    assert len(spans) == 6
+    assert [span["case"] for span in spans] == ["case_1"] * 2 + ["case_2"] * 4
+    assert profiler.spans("case_0") == []
+
+    # A case whose phases were partly dropped is still summarized from what is left
+    assert profiler.caseSummary("case_1").startswith("case_1 loaded in ")
+
+
+def testClear():
+    profiler = LoadProfiler()
+    _loadCase(profiler, "rotor")
+
+    profiler.clear()
+
+    assert profiler.spans() == []
+    assert profiler.caseSummary("rotor") == ""
+
+
+def testExports(tmp_path):
+    profiler = LoadProfiler()
+    _loadCase(profiler, "rotor", 2000000)
+
+    json_path = str(tmp_path / "spans.json")
+    trace_path = str(tmp_path / "spans.trace.json")
+
+    profiler.writeJSON(json_path)
+    profiler.writeChromeTrace(trace_path)
+
+    with open(json_path) as json_file:
+        assert json.load(json_file) == profiler.spans()
+
+    with open(trace_path) as trace_file:
+        trace_events = json.load(trace_file)["traceEvents"]
+
+    assert [event["name"] for event in trace_events] == ["probe", "translate", "shapes", "total"]
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in trace_events)
+    assert trace_events[2]["args"] == {"case": "rotor", "bytes": 2000000}
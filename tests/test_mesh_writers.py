@@ -0,0 +1,146 @@
+"""@package tests.test_mesh_writers
+
+Tests of the mesh file writers of occ_modules.mesh_writers.
+
+"""
+
+import json
+import os
+import struct
+
+from occ_modules.mesh_writers import writeSTL, writePLY, writeGLTF, writeMeshes
+
+## Unit cube made of two triangles per face
+cube_vertices = [(0., 0., 0.), (1., 0., 0.), (1., 1., 0.), (0., 1., 0.),
+                 (0., 0., 1.), (1., 0., 1.), (1., 1., 1.), (0., 1., 1.)]
+cube_triangles = [(0, 2, 1), (0, 3, 2), (4, 5, 6), (4, 6, 7), (0, 1, 5), (0, 5, 4),
+                  (1, 2, 6), (1, 6, 5), (2, 3, 7), (2, 7, 6), (3, 0, 4), (3, 4, 7)]
+
+
+def _readGLB(file_path):
+    """
+    Reads a binary glTF file.
+
+    @return [tuple] Bytes of the file, the JSON document and the binary chunk
+    """
+    with open(file_path, "rb") as glb_file:
+        glb = glb_file.read()
+
+    magic, version, length = struct.unpack_from("<4sII", glb, 0)
+    assert (magic, version, length) == (b"glTF", 2, len(glb))
+
+    json_length, json_type = struct.unpack_from("<I4s", glb, 12)
+    assert json_type == b"JSON"
+    gltf = json.loads(glb[20:20 + json_length].decode("utf-8"))
+
+    bin_length, bin_type = struct.unpack_from("<I4s", glb, 20 + json_length)
+    assert bin_type == b"BIN\x00"
+    bin_chunk = glb[28 + json_length:28 + json_length + bin_length]
+
+    return glb, gltf, bin_chunk
+
+
+def testSTLSize(tmp_path):
+    file_path = str(tmp_path / "cube.stl")
+
+    writeSTL(file_path, cube_vertices, cube_triangles)
+
+    with open(file_path, "rb") as stl_file:
+        stl = stl_file.read()
+
+    assert len(stl) == 84 + 50 * len(cube_triangles)
+    assert struct.unpack_from("<I", stl, 80)[0] == len(cube_triangles)
+
+
+def testSTLNormal(tmp_path):
+    file_path = str(tmp_path / "triangle.stl")
+
+    writeSTL(file_path, cube_vertices, [(0, 1, 2)])
+
+    with open(file_path, "rb") as stl_file:
+        stl = stl_file.read()
+
+    assert struct.unpack_from("<3f", stl, 84) == (0., 0., 1.)
+
+
+def testEmptySTL(tmp_path):
+    file_path = str(tmp_path / "empty.stl")
+
+    writeSTL(file_path, [], [])
+
+    with open(file_path, "rb") as stl_file:
+        assert len(stl_file.read()) == 84
+
+
+def testPLYHeader(tmp_path):
+    file_path = str(tmp_path / "cube.ply")
+
+    writePLY(file_path, cube_vertices, cube_triangles)
+
+    with open(file_path, "rb") as ply_file:
+        ply = ply_file.read()
+
+    header, body = ply.split(b"end_header\n", 1)
+    header_lines = header.decode("ascii").splitlines()
+
+    assert header_lines[:2] == ["ply", "format binary_little_endian 1.0"]
+    assert "element vertex %d" % len(cube_vertices) in header_lines
+    assert "element face %d" % len(cube_triangles) in header_lines
+    assert len(body) == 12 * len(cube_vertices) + 13 * len(cube_triangles)
+
+    # The first face follows the vertices
+    assert struct.unpack_from("<B3i", body, 12 * len(cube_vertices)) == (3,) + cube_triangles[0]
+
+
+def testGLBChunkAlignment(tmp_path):
+    file_path = str(tmp_path / "meshes.glb")
+
+    # A single triangle and odd names make both chunks need padding
+    writeGLTF(file_path, [["a", cube_vertices[:3], [(0, 1, 2)]], ["blade_1", cube_vertices, cube_triangles]])
+
+    glb, gltf, bin_chunk = _readGLB(file_path)
+    json_length = struct.unpack_from("<I", glb, 12)[0]
+
+    assert json_length % 4 == 0
+    assert len(bin_chunk) % 4 == 0
+    assert len(glb) % 4 == 0
+    assert gltf["buffers"][0]["byteLength"] <= len(bin_chunk)
+
+    for buffer_view in gltf["bufferViews"]:
+        assert buffer_view["byteOffset"] % 4 == 0
+        assert buffer_view["byteOffset"] + buffer_view["byteLength"] <= gltf["buffers"][0]["byteLength"]
+
+
+def testGLBAccessors(tmp_path):
+    file_path = str(tmp_path / "cube.glb")
+    vertices = [(x * 2. - 1., y * 3., z - 5.) for x, y, z in cube_vertices]
+
+    writeGLTF(file_path, [["cube", vertices, cube_triangles]])
+
+    glb, gltf, bin_chunk = _readGLB(file_path)
+    positions, indexes = gltf["accessors"]
+
+    assert positions["count"] == len(vertices)
+    assert positions["min"] == [-1., 0., -5.]
+    assert positions["max"] == [1., 3., -4.]
+    assert indexes["count"] == 3 * len(cube_triangles)
+
+    index_view = gltf["bufferViews"][indexes["bufferView"]]
+    assert struct.unpack_from("<3I", bin_chunk, index_view["byteOffset"]) == cube_triangles[0]
+
+    assert [node["name"] for node in gltf["nodes"]] == ["cube"]
+
+
+def testWriteMeshes(tmp_path):
+    meshes = [["case.surf.igs - BLADE_1", cube_vertices, cube_triangles],
+              ["case.surf.igs - HUB", cube_vertices[:3], [(0, 1, 2)]]]
+
+    merged_files = writeMeshes(meshes, str(tmp_path), "case", "STL")
+    separate_files = writeMeshes(meshes, str(tmp_path), "case", "PLY", merged=False)
+
+    assert [os.path.basename(file_path) for file_path in merged_files] == ["case.stl"]
+    assert len(separate_files) == 2
+
+    # The merged mesh has the triangles of both sub-shapes
+    with open(merged_files[0], "rb") as stl_file:
+        assert len(stl_file.read()) == 84 + 50 * (len(cube_triangles) + 1)
@@ -0,0 +1,96 @@
+"""@package tests.test_shape_bvh
+
+Tests of the bounding volume hierarchy of occ_modules.shape_bvh.
+
+"""
+
+import random
+
+from occ_modules.shape_bvh import ShapeBVH, _lineBoxEntry
+
+
+def _unitBox(x, y, z):
+    """
+    @return [tuple] Box of size 1 whose minimum corner is (x, y, z)
+    """
+    return x, y, z, x + 1., y + 1., z + 1.
+
+
+def testSlabEntry():
+    box = _unitBox(0., 0., 0.)
+
+    assert _lineBoxEntry(box, (-2., 0.5, 0.5), (1., 0., 0.)) == 2.
+    assert _lineBoxEntry(box, (-2., 0.5, 0.5), (-1., 0., 0.)) == -3.
+    assert _lineBoxEntry(box, (-2., 2., 0.5), (1., 0., 0.)) is None
+
+
+def testSlabDiagonal():
+    box = _unitBox(0., 0., 0.)
+
+    assert _lineBoxEntry(box, (-1., -1., -1.), (1., 1., 1.)) == 1.
+    assert _lineBoxEntry(box, (-1., -1., 3.), (1., 1., 1.)) is None
+
+
+def testSlabParallelRays():
+    box = _unitBox(0., 0., 0.)
+
+    # Parallel to the x and y slabs: only the origin tells whether the line is between them
+    assert _lineBoxEntry(box, (0.5, 0.5, -4.), (0., 0., 1.)) == 4.
+    assert _lineBoxEntry(box, (1.5, 0.5, -4.), (0., 0., 1.)) is None
+    assert _lineBoxEntry(box, (0.5, -0.5, -4.), (0., 0., 1.)) is None
+
+    # Lines on a face of the box touch it
+    assert _lineBoxEntry(box, (1., 0.5, -4.), (0., 0., 1.)) == 4.
+
+
+def testLineQueryFrontToBack():
+    # A row of boxes along x, given in shuffled order so they fall in different leaves
+    indexed_boxes = [(row, _unitBox(2. * row, 0., 0.)) for row in range(20)]
+    random.Random(1).shuffle(indexed_boxes)
+
+    bvh = ShapeBVH(indexed_boxes)
+
+    hits = bvh.lineQuery((-10., 0.5, 0.5), (1., 0., 0.))
+    assert [index for t_entry, index in hits] == list(range(20))
+    assert [t_entry for t_entry, index in hits] == [10. + 2. * row for row in range(20)]
+
+    # Looking the other way the order is reversed
+    hits = bvh.lineQuery((50., 0.5, 0.5), (-1., 0., 0.))
+    assert [index for t_entry, index in hits] == list(reversed(range(20)))
+
+
+def testLineQueryParallelMiss():
+    bvh = ShapeBVH([(row, _unitBox(2. * row, 0., 0.)) for row in range(20)])
+
+    assert bvh.lineQuery((-10., 2., 0.5), (1., 0., 0.)) == []
+    assert [index for t_entry, index in bvh.lineQuery((4.5, 0.5, -3.), (0., 0., 1.))] == [2]
+
+
+def testLineQueryMatchesBruteForce():
+    generator = random.Random(2)
+    boxes = [_unitBox(generator.uniform(-10., 10.), generator.uniform(-10., 10.), generator.uniform(-10., 10.))
+             for row in range(200)]
+
+    bvh = ShapeBVH(list(enumerate(boxes)))
+
+    for line in range(50):
+        origin = (generator.uniform(-20., 20.), generator.uniform(-20., 20.), -30.)
+        direction = (generator.uniform(-0.3, 0.3), generator.uniform(-0.3, 0.3), 1.)
+
+        expected = sorted((_lineBoxEntry(box, origin, direction), row) for row, box in enumerate(boxes)
+                          if _lineBoxEntry(box, origin, direction) is not None)
+
+        assert sorted(bvh.lineQuery(origin, direction)) == expected
+
+
+def testEmptyHierarchy():
+    bvh = ShapeBVH([(0, None), (1, None)])
+
+    assert bvh.box() is None
+    assert bvh.lineQuery((0., 0., 0.), (1., 0., 0.)) == []
+
+
+def testHierarchyBox():
+    bvh = ShapeBVH([(0, _unitBox(0., 0., 0.)), (1, _unitBox(3., -2., 1.)), (2, None)])
+
+    assert bvh.box() == (0., -2., 0., 4., 1., 2.)
@@ -0,0 +1,67 @@
+"""@package tests.test_subshape_names
+
+Tests of the sub-shape categories and display exceptions of occ_modules.subshape_names.
+
+"""
+
+from occ_modules.subshape_names import ExceptionMatcher, subShapeCategory
+
+
+def testCategory():
+    assert subShapeCategory("Stream_12") == "STREAM"
+    assert subShapeCategory("BLADE 1/2") == "BLADE"
+    assert subShapeCategory("42") == ""
+
+
+def testLetterEntries():
+    exception_matcher = ExceptionMatcher(["HUB", "SHROUD", "STREAM"])
+
+    assert exception_matcher.isException("HUB")
+    assert exception_matcher.isException("SHROUD_2")
+    assert exception_matcher.isException("STREAM12")
+    assert not exception_matcher.isException("BLADE_1")
+
+    # Entries are searched inside the letters, as with a plain search in the name
+    assert exception_matcher.isException("MAINHUB3")
+
+
+def testLetterEntriesIgnoreSeparators():
+    # Unlike a plain search in the name, the letters are joined across digits and separators
+    exception_matcher = ExceptionMatcher(["HUBSHROUD"])
+
+    assert exception_matcher.isException("HUB_SHROUD_1")
+    assert not exception_matcher.isException("HUB_1")
+
+
+def testCaseSensitive():
+    exception_matcher = ExceptionMatcher(["HUB"])
+
+    assert not exception_matcher.isException("Hub_1")
+
+
+def testNameEntries():
+    # Entries with digits or separators are searched in the name itself
+    exception_matcher = ExceptionMatcher(["STREAM_1", "LE-"])
+
+    assert exception_matcher.isException("STREAM_12")
+    assert not exception_matcher.isException("STREAM_2")
+    assert not exception_matcher.isException("STREAM1")
+    assert exception_matcher.isException("LE-3")
+
+
+def testEmptyEntries():
+    # Empty entries, e.g. from "HUB; ; SHROUD" or an empty preference, match nothing
+    assert not ExceptionMatcher(["", "HUB", ""]).isException("BLADE_1")
+    assert not ExceptionMatcher([""]).isException("BLADE_1")
+    assert not ExceptionMatcher([]).isException("")
+
+
+def testCachedResults():
+    exception_matcher = ExceptionMatcher(["STREAM", "_7"])
+
+    # Names of the same kind share the result of their letters, other entries are still checked for each name
+    assert exception_matcher.isException("STREAM_1")
+    assert exception_matcher.isException("STREAM_2")
+    assert not exception_matcher.isException("BLADE_1")
+    assert exception_matcher.isException("BLADE_7")
+    assert not exception_matcher.isException("BLADE_8")
@@ -0,0 +1,92 @@
+"""@package ui_compiler
+
+File that contains the function compileUi(), which compiles the layouts created in Qt Designer with pyuic4.
+
+Core, tecplot_modules.tecplot_display, bladepro_modules.inputfile_writer and settings.preferences compile their .ui
+file when they are imported, so changes made in Qt Designer are used at the next start. Running pyuic4 takes a good
+part of the start up time, so a layout is only compiled when its .ui file changed. The compiled file is up to date if
+it is newer than the .ui file. Otherwise the SHA-1 of the .ui file is compared to the one recorded at the end of the
+compiled file, so a .ui file only touched, e.g. by a checkout, is not compiled again.
+
+Setting the environment variable BLADEPY_COMPILE_UI to "always" compiles every layout at every start, as BladePy used
+to, e.g. for debug_folder.startup_benchmark.
+
+"""
+
+import hashlib
+import os
+
+## Start of the comment line that records the SHA-1 of the .ui file in the compiled file
+ui_hash_marker = "# BladePy ui hash: "
+
+
+def _uiHash(ui_file):
+    """
+    @return [str] SHA-1 of the contents of a .ui file
+    """
+    with open(ui_file, "rb") as ui:
+        return hashlib.sha1(ui.read()).hexdigest()
+
+
+def _recordedHash(py_ui_file):
+    """
+    @return [str] SHA-1 recorded at the end of a compiled file, or None if it has none
+    """
+    try:
+        with open(py_ui_file, "rb") as py_ui:
+            py_ui.seek(0, os.SEEK_END)
+            py_ui.seek(max(0, py_ui.tell() - 200))
+            tail = py_ui.read().decode("utf-8", "replace")
+    except (IOError, OSError):
+        return None
+
+    for line in reversed(tail.splitlines()):
+        if line.startswith(ui_hash_marker):
+            return line[len(ui_hash_marker):].strip()
+
+    return None
+
+
+def compileUi(ui_file, py_ui_file):
+    """
+    Compiles a .ui file to a Python module with pyuic4, if the module is not up to date.
+
+    When pyuic4 is not available or fails, the existing module is kept.
+
+    @param ui_file [str] Path of the .ui file
+    @param py_ui_file [str] Path of the compiled Python module
+    @return [bool] True if the layout was compiled
+    """
+    always_compile = os.environ.get("BLADEPY_COMPILE_UI") == "always"
+
+    try:
+        ui_mtime = os.path.getmtime(ui_file)
+    except OSError:
+        # The .ui file is not shipped, the compiled module is used as it is
+        return False
+
+    try:
+        py_ui_mtime = os.path.getmtime(py_ui_file)
+    except OSError:
+        py_ui_mtime = None
+
+    if not always_compile and py_ui_mtime is not None and py_ui_mtime >= ui_mtime:
+        return False
+
+    ui_hash = _uiHash(ui_file)
+
+    if not always_compile and py_ui_mtime is not None and _recordedHash(py_ui_file) == ui_hash:
+        # Only the modification time changed. The compiled file is touched, so the next start does not hash the .ui
+        try:
+            os.utime(py_ui_file, None)
+        except OSError:
+            pass
+        return False
+
+    if os.system('pyuic4 -x "%s" -o "%s"' % (ui_file, py_ui_file)) != 0 or not os.path.isfile(py_ui_file):
+        return False
+
+    with open(py_ui_file, "a") as py_ui:
+        py_ui.write("\n%s%s\n" % (ui_hash_marker, ui_hash))
+
+    return True